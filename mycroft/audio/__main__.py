@@ -20,7 +20,7 @@
 from mycroft.configuration import Configuration
 from mycroft.messagebus.client.ws import WebsocketClient
 from mycroft.util import reset_sigint_handler, wait_for_exit_signal, \
-    create_daemon, create_echo_function, check_for_signal
+    create_daemon, create_echo_function, check_for_signal, connect_signals
 from mycroft.util.log import LOG
 
 import mycroft.audio.speech as speech
@@ -33,6 +33,7 @@ def main():
     check_for_signal("isSpeaking")
     bus = WebsocketClient()  # Connect to the Mycroft Messagebus
     Configuration.init(bus)
+    connect_signals(bus)
     speech.init(bus)
 
     LOG.info("Starting Audio Services")
@@ -17,7 +17,7 @@ from threading import Lock
 
 from mycroft.configuration import Configuration
 from mycroft.messagebus.client.ws import WebsocketClient
-from mycroft.util import create_daemon
+from mycroft.util import create_daemon, connect_signals
 from mycroft.util.log import LOG
 
 import tornado.web
@@ -64,6 +64,7 @@ class Enclosure:
 
         # Load full config
         Configuration.init(self.bus)
+        connect_signals(self.bus)
         config = Configuration.get()
 
         self.lang = config['lang']
@@ -23,7 +23,7 @@ from mycroft.lock import Lock as PIDLock  # Create/Support PID locking file
 from mycroft.messagebus.client.ws import WebsocketClient
 from mycroft.messagebus.message import Message
 from mycroft.util import create_daemon, wait_for_exit_signal, \
-    reset_sigint_handler
+    reset_sigint_handler, connect_signals
 from mycroft.util.log import LOG
 
 bus = None  # Mycroft messagebus connection
@@ -67,6 +67,14 @@ def handle_utterance(event):
     bus.emit(Message('recognizer_loop:utterance', event, context))
 
 
+def handle_partial_utterance(event):
+    bus.emit(Message('recognizer_loop:partial_utterance', event))
+
+
+def handle_mic_level(event):
+    bus.emit(Message('mycroft.mic.level', event))
+
+
 def handle_unknown():
     bus.emit(Message('mycroft.speech.recognition.unknown'))
 
@@ -150,11 +158,13 @@ def main():
     PIDLock("voice")
     bus = WebsocketClient()  # Mycroft messagebus, see mycroft.messagebus
     Configuration.init(bus)
+    connect_signals(bus)
     config = Configuration.get()
 
     # Register handlers on internal RecognizerLoop bus
     loop = RecognizerLoop()
     loop.on('recognizer_loop:utterance', handle_utterance)
+    loop.on('recognizer_loop:partial_utterance', handle_partial_utterance)
     loop.on('recognizer_loop:speech.recognition.unknown', handle_unknown)
     loop.on('speak', handle_speak)
     loop.on('recognizer_loop:record_begin', handle_record_begin)
@@ -162,6 +172,7 @@ def main():
     loop.on('recognizer_loop:wakeword', handle_wakeword)
     loop.on('recognizer_loop:record_end', handle_record_end)
     loop.on('recognizer_loop:no_internet', handle_no_internet)
+    loop.on('recognizer_loop:mic_level', handle_mic_level)
 
     # Register handlers for events on main Mycroft messagebus
     bus.on('open', handle_open)
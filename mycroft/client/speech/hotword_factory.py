@@ -56,6 +56,15 @@ class HotWordEngine:
         self.lang = str(self.config.get("lang", lang)).lower()
 
     def found_wake_word(self, frame_data):
+        """ Check if the wake word was spoken.
+
+        Arguments:
+            frame_data (bytes-like): the most recent audio, usually a
+                                     memoryview only valid during the call
+
+        Returns:
+            bool: True if the wake word was found
+        """
         return False
 
     def update(self, chunk):
@@ -116,7 +125,7 @@ class PocketsphinxHotWord(HotWordEngine):
         return self.decoder.hyp()
 
     def found_wake_word(self, frame_data):
-        hyp = self.transcribe(frame_data)
+        hyp = self.transcribe(bytes(frame_data))
         return hyp and self.key_phrase in hyp.hypstr.lower()
 
 
@@ -261,7 +270,7 @@ class SnowboyHotWord(HotWordEngine):
         self.key_phrase = str(key_phrase).lower()
 
     def found_wake_word(self, frame_data):
-        wake_word = self.snowboy.detector.RunDetection(frame_data)
+        wake_word = self.snowboy.detector.RunDetection(bytes(frame_data))
         return wake_word == 1
 
 
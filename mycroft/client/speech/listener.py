@@ -26,21 +26,78 @@ from mycroft.client.speech.mic import MutableMicrophone, ResponsiveRecognizer
 from mycroft.configuration import Configuration
 from mycroft.metrics import MetricsAggregator, Stopwatch, report_timing
 from mycroft.session import SessionManager
-from mycroft.stt import STTFactory
+from mycroft.stt import STTFactory, StreamingSTT, StreamingAdapter
 from mycroft.util import connected
 from mycroft.util.log import LOG
 from mycroft.util import find_input_device
 from queue import Queue, Empty
 
 
+class StreamingTranscription(Thread):
+    """
+    StreamingTranscription
+    Transcribes a phrase with a streaming STT engine while it is recorded.
+    Partial hypotheses are emitted as recognizer_loop:partial_utterance,
+    the final transcription is returned by result().
+    """
+
+    def __init__(self, stt, emitter, sample_rate, sample_width):
+        super(StreamingTranscription, self).__init__()
+        self.daemon = True
+        self.stt = stt
+        self.emitter = emitter
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.chunks = Queue()
+        self.audio = None  # The complete recording, set by the producer
+        self.text = None
+        self.error = None
+
+    def feed(self, chunk):
+        self.chunks.put(chunk)
+
+    def finish(self):
+        self.chunks.put(None)
+
+    def run(self):
+        try:
+            for hypothesis in self.stt.stream(iter(self.chunks.get, None),
+                                              self.sample_rate,
+                                              self.sample_width):
+                if hypothesis.final:
+                    self.text = hypothesis.text
+                elif hypothesis.text:
+                    self.emitter.emit('recognizer_loop:partial_utterance', {
+                        'utterance': hypothesis.text,
+                        'lang': self.stt.lang,
+                        'session': SessionManager.get().session_id
+                    })
+        except Exception as e:
+            self.error = e
+
+    def result(self):
+        """
+            Wait for the final transcription, errors from the STT engine
+            are raised here.
+        """
+        self.join()
+        if self.error:
+            raise self.error
+        return self.text
+
+
 class AudioProducer(Thread):
     """
     AudioProducer
     given a mic and a recognizer implementation, continuously listens to the
     mic for potential speech chunks and pushes them onto the queue.
+
+    With a streaming STT engine each phrase is transcribed while recorded
+    and a StreamingTranscription holding the audio is queued instead.
     """
 
-    def __init__(self, state, queue, mic, recognizer, emitter):
+    def __init__(self, state, queue, mic, recognizer, emitter,
+                 stream_stt=None):
         super(AudioProducer, self).__init__()
         self.daemon = True
         self.state = state
@@ -48,14 +105,20 @@ class AudioProducer(Thread):
         self.mic = mic
         self.recognizer = recognizer
         self.emitter = emitter
+        self.stream_stt = stream_stt
 
     def run(self):
         with self.mic as source:
             self.recognizer.adjust_for_ambient_noise(source)
             while self.state.running:
                 try:
-                    audio = self.recognizer.listen(source, self.emitter)
-                    self.queue.put(audio)
+                    # While sleeping audio is only checked for the wake up
+                    # phrase locally, never streamed to the STT engine
+                    if self.stream_stt and not self.state.sleeping:
+                        self.listen_streaming(source)
+                    else:
+                        audio = self.recognizer.listen(source, self.emitter)
+                        self.queue.put(audio)
                 except IOError as e:
                     # NOTE: Audio stack on raspi is slightly different, throws
                     # IOError every other listen, almost like it can't handle
@@ -64,6 +127,14 @@ class AudioProducer(Thread):
                     # http://stackoverflow.com/questions/10733903/pyaudio-input-overflowed
                     self.emitter.emit("recognizer_loop:ioerror", e)
 
+    def listen_streaming(self, source):
+        stream = StreamingTranscription(self.stream_stt, self.emitter,
+                                        source.SAMPLE_RATE,
+                                        source.SAMPLE_WIDTH)
+        stream.audio = self.recognizer.listen(source, self.emitter, stream)
+        if stream.audio:
+            self.queue.put(stream)
+
     def stop(self):
         """
             Stop producer thread.
@@ -106,10 +177,15 @@ class AudioConsumer(Thread):
         if audio is None:
             return
 
+        if isinstance(audio, StreamingTranscription):
+            stream, audio = audio, audio.audio
+        else:
+            stream = None
+
         if self.state.sleeping:
             self.wake_up(audio)
         else:
-            self.process(audio)
+            self.process(audio, stream)
 
     # TODO: Localization
     def wake_up(self, audio):
@@ -125,7 +201,7 @@ class AudioConsumer(Thread):
             audio.sample_rate * audio.sample_width)
 
     # TODO: Localization
-    def process(self, audio):
+    def process(self, audio, stream=None):
         SessionManager.touch()
         payload = {
             'utterance': self.wakeword_recognizer.key_phrase,
@@ -138,7 +214,7 @@ class AudioConsumer(Thread):
         else:
             stopwatch = Stopwatch()
             with stopwatch:
-                transcription = self.transcribe(audio)
+                transcription = self.transcribe(audio, stream)
             if transcription:
                 ident = str(stopwatch.timestamp) + str(hash(transcription))
                 # STT succeeded, send the transcribed speech on for processing
@@ -157,10 +233,14 @@ class AudioConsumer(Thread):
                           {'transcription': transcription,
                            'stt': self.stt.__class__.__name__})
 
-    def transcribe(self, audio):
+    def transcribe(self, audio, stream=None):
         try:
-            # Invoke the STT engine on the audio clip
-            text = self.stt.execute(audio).lower().strip()
+            if stream:
+                # Wait for the streaming STT engine to finish the phrase
+                text = stream.result().lower().strip()
+            else:
+                # Invoke the STT engine on the audio clip
+                text = self.stt.execute(audio).lower().strip()
             LOG.debug("STT: " + text)
             return text
         except sr.RequestError as e:
@@ -276,11 +356,18 @@ class RecognizerLoop(EventEmitter):
         """
         self.state.running = True
         queue = Queue()
+        stt = STTFactory.create()
+        if isinstance(stt, StreamingSTT):
+            stream_stt = stt
+        elif self.config_core.get('stt', {}).get('streaming'):
+            stream_stt = StreamingAdapter(stt)
+        else:
+            stream_stt = None
         self.producer = AudioProducer(self.state, queue, self.microphone,
-                                      self.responsive_recognizer, self)
+                                      self.responsive_recognizer, self,
+                                      stream_stt)
         self.producer.start()
-        self.consumer = AudioConsumer(self.state, queue, self,
-                                      STTFactory.create(),
+        self.consumer = AudioConsumer(self.state, queue, self, stt,
                                       self.wakeup_recognizer,
                                       self.wakeword_recognizer)
         self.consumer.start()
@@ -13,7 +13,7 @@
 # limitations under the License.
 #
 import audioop
-from time import sleep, time as get_time
+from time import monotonic, sleep, time as get_time
 
 import collections
 import datetime
@@ -32,6 +32,7 @@ from speech_recognition import (
 from threading import Thread, Lock
 
 from mycroft.api import DeviceApi
+from mycroft.client.speech.vad import Endpointer, VADFactory
 from mycroft.configuration import Configuration
 from mycroft.session import SessionManager
 from mycroft.util import (
@@ -158,6 +159,64 @@ def get_silence(num_bytes):
     return b'\0' * num_bytes
 
 
+class RollingAudioBuffer:
+    """ Fixed size buffer holding the most recent audio.
+
+    Chunks are copied into a preallocated bytearray and the newest audio
+    is read back as memoryviews, avoiding a copy of the whole buffer for
+    every chunk. The storage is twice the buffer size so the audio only
+    has to be moved back to the start once per size bytes written.
+
+    Arguments:
+        size (int): maximum number of bytes to keep
+        padding (bytes): data always following the newest audio in the
+                         views returned by get_last(padded=True)
+    """
+    def __init__(self, size, padding=b''):
+        self.size = size
+        self.padding = padding
+        self.storage = bytearray(2 * size + len(padding))
+        self.view = memoryview(self.storage)
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def clear(self):
+        self.start = self.end = 0
+
+    def append(self, chunk):
+        """ Add audio, dropping the oldest audio if the buffer is full. """
+        chunk = chunk[-self.size:]
+        if self.end + len(chunk) > 2 * self.size:
+            # Move the audio that is kept to the start of the storage
+            keep = min(len(self), self.size - len(chunk))
+            self.view[:keep] = self.view[self.end - keep:self.end]
+            self.start, self.end = 0, keep
+        self.view[self.end:self.end + len(chunk)] = chunk
+        self.end += len(chunk)
+        self.start = max(self.start, self.end - self.size)
+        self.view[self.end:self.end + len(self.padding)] = self.padding
+
+    def get_last(self, size=None, padded=False):
+        """ Get a view of the most recent audio.
+
+        The view is only valid until the next call to append().
+
+        Arguments:
+            size (int): number of bytes to get, defaults to all audio
+            padded (bool): include the padding after the audio
+
+        Returns:
+            memoryview: the audio
+        """
+        start = self.start if size is None else max(self.start,
+                                                    self.end - size)
+        end = self.end + len(self.padding) if padded else self.end
+        return self.view[start:end]
+
+
 class ResponsiveRecognizer(speech_recognition.Recognizer):
     # Padding of silence when feeding to pocketsphinx
     SILENCE_SEC = 0.01
@@ -166,9 +225,9 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
     # phrase can be considered complete
     MIN_LOUD_SEC_PER_PHRASE = 0.5
 
-    # The minimum seconds of silence required at the end
+    # The default seconds without speech required at the end
     # before a phrase will be considered complete
-    MIN_SILENCE_AT_END = 0.25
+    MIN_SILENCE_AT_END = 0.4
 
     # The maximum seconds a phrase can be recorded,
     # provided there is noise the entire time
@@ -206,7 +265,26 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
                                                        False)
         self.upload_lock = Lock()
         self.filenames_to_upload = []
-        self.mic_level_file = os.path.join(get_ipc_directory(), "mic_level")
+
+        # Microphone level reports, sent as recognizer_loop:mic_level on
+        # the emitter passed to listen() and optionally written to a file
+        mic_level_config = listener_config.get('mic_level', {})
+        mic_level_rate = mic_level_config.get('rate', 5)
+        self.mic_level_interval = 1.0 / mic_level_rate \
+            if mic_level_rate else None
+        if mic_level_config.get('file', False):
+            self.mic_level_file = os.path.join(get_ipc_directory(),
+                                               "mic_level")
+        else:
+            self.mic_level_file = None
+        self._last_mic_level = 0.0
+        self._emitter = None
+
+        # Voice activity detection ending the recording of a phrase
+        self.vad_config = listener_config.get('vad', {})
+        self.vad_hangover = self.vad_config.get('hangover',
+                                                self.MIN_SILENCE_AT_END)
+        self.vad = None
         self._stop_signaled = False
 
         # The maximum audio in seconds to keep for transcribing a phrase
@@ -228,7 +306,15 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
     def calc_energy(sound_chunk, sample_width):
         return audioop.rms(sound_chunk, sample_width)
 
-    def _record_phrase(self, source, sec_per_buffer):
+    def _get_vad(self, source):
+        """ Get the voice activity detector for the source's audio. """
+        if (not self.vad or self.vad.sample_rate != source.SAMPLE_RATE or
+                self.vad.sample_width != source.SAMPLE_WIDTH):
+            self.vad = VADFactory.create(self.vad_config, source.SAMPLE_RATE,
+                                         source.SAMPLE_WIDTH)
+        return self.vad
+
+    def _record_phrase(self, source, sec_per_buffer, stream=None):
         """Record an entire spoken phrase.
 
         Essentially, this code waits for a period of silence and then returns
@@ -238,41 +324,24 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
         Args:
             source (AudioSource):  Source producing the audio chunks
             sec_per_buffer (float):  Fractional number of seconds in each chunk
+            stream:  Optional receiver of each chunk as it is recorded,
+                     called as stream.feed(chunk)
 
         Returns:
             bytearray: complete audio buffer recorded, including any
                        silence at the end of the user's utterance
         """
 
-        num_loud_chunks = 0
-        noise = 0
-
-        max_noise = 25
-        min_noise = 0
-
-        silence_duration = 0
-
-        def increase_noise(level):
-            if level < max_noise:
-                return level + 200 * sec_per_buffer
-            return level
-
-        def decrease_noise(level):
-            if level > min_noise:
-                return level - 100 * sec_per_buffer
-            return level
-
-        # Smallest number of loud chunks required to return
-        min_loud_chunks = int(self.MIN_LOUD_SEC_PER_PHRASE / sec_per_buffer)
+        vad = self._get_vad(source)
+        vad.reset()
+        endpointer = Endpointer(sec_per_buffer, self.vad_hangover,
+                                self.MIN_LOUD_SEC_PER_PHRASE,
+                                self.RECORDING_TIMEOUT_WITH_SILENCE)
 
         # Maximum number of chunks to record before timing out
         max_chunks = int(self.RECORDING_TIMEOUT / sec_per_buffer)
         num_chunks = 0
 
-        # Will return if exceeded this even if there's not enough loud chunks
-        max_chunks_of_silence = int(self.RECORDING_TIMEOUT_WITH_SILENCE /
-                                    sec_per_buffer)
-
         # bytearray to store audio in
         byte_data = get_silence(source.SAMPLE_WIDTH)
 
@@ -281,35 +350,18 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
             chunk = self.record_sound_chunk(source)
             byte_data += chunk
             num_chunks += 1
+            if stream:
+                stream.feed(chunk)
 
             energy = self.calc_energy(chunk, source.SAMPLE_WIDTH)
             test_threshold = self.energy_threshold * self.multiplier
-            is_loud = energy > test_threshold
-            if is_loud:
-                noise = increase_noise(noise)
-                num_loud_chunks += 1
-            else:
-                noise = decrease_noise(noise)
+            is_speech = vad.is_speech(chunk, energy, test_threshold)
+            if not is_speech:
                 self._adjust_threshold(energy, sec_per_buffer)
 
-            if num_chunks % 10 == 0:
-                with open(self.mic_level_file, 'w') as f:
-                    f.write("Energy:  cur=" + str(energy) + " thresh=" +
-                            str(self.energy_threshold))
-                f.close()
+            self._report_mic_level(energy)
 
-            was_loud_enough = num_loud_chunks > min_loud_chunks
-
-            quiet_enough = noise <= min_noise
-            if quiet_enough:
-                silence_duration += sec_per_buffer
-                if silence_duration < self.MIN_SILENCE_AT_END:
-                    quiet_enough = False  # gotta be silent for min of 1/4 sec
-            else:
-                silence_duration = 0
-            recorded_too_much_silence = num_chunks > max_chunks_of_silence
-            if quiet_enough and (was_loud_enough or recorded_too_much_silence):
-                phrase_complete = True
+            phrase_complete = endpointer.update(is_speech)
 
             # Pressing top-button will end recording immediately
             if check_for_signal('buttonPress'):
@@ -317,6 +369,23 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
 
         return byte_data
 
+    def _report_mic_level(self, energy):
+        """ Report the energy level, at most at the configured rate. """
+        now = monotonic()
+        if (not self.mic_level_interval or
+                now - self._last_mic_level < self.mic_level_interval):
+            return
+        self._last_mic_level = now
+
+        if self._emitter:
+            self._emitter.emit('recognizer_loop:mic_level',
+                               {'energy': energy,
+                                'threshold': self.energy_threshold})
+        if self.mic_level_file:
+            with open(self.mic_level_file, 'w') as f:
+                f.write("Energy:  cur=" + str(energy) + " thresh=" +
+                        str(self.energy_threshold))
+
     @staticmethod
     def sec_to_bytes(sec, source):
         return int(sec * source.SAMPLE_RATE) * source.SAMPLE_WIDTH
@@ -383,16 +452,17 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
 
         silence = get_silence(num_silent_bytes)
 
-        # bytearray to store audio in
-        byte_data = silence
-
         buffers_per_check = self.SEC_BETWEEN_WW_CHECKS / sec_per_buffer
         buffers_since_check = 0.0
 
-        # Max bytes for byte_data before audio is removed from the front
+        # Max bytes of audio kept, older audio is dropped from the front
         max_size = self.sec_to_bytes(self.SAVED_WW_SEC, source)
         test_size = self.sec_to_bytes(self.TEST_WW_SEC, source)
 
+        # Audio is checked for the wake word with silence appended
+        audio_buffer = RollingAudioBuffer(max_size, padding=silence)
+        audio_buffer.append(silence)
+
         said_wake_word = False
 
         # Rolling buffer to track the audio energy (loudness) heard on
@@ -402,7 +472,6 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
         idx_energy = 0
         avg_energy = 0.0
         energy_avg_samples = int(5 / sec_per_buffer)  # avg over last 5 secs
-        counter = 0
 
         while not said_wake_word and not self._stop_signaled:
             if self._skip_wake_word():
@@ -432,33 +501,21 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
 
             # Periodically output energy level stats.  This can be used to
             # visualize the microphone input, e.g. a needle on a meter.
-            if counter % 3:
-                with open(self.mic_level_file, 'w') as f:
-                    f.write("Energy:  cur=" + str(energy) + " thresh=" +
-                            str(self.energy_threshold))
-                f.close()
-            counter += 1
-
-            # At first, the buffer is empty and must fill up.  After that
-            # just drop the first chunk bytes to keep it the same size.
-            needs_to_grow = len(byte_data) < max_size
-            if needs_to_grow:
-                byte_data += chunk
-            else:  # Remove beginning of audio and add new chunk to end
-                byte_data = byte_data[len(chunk):] + chunk
+            self._report_mic_level(energy)
+
+            audio_buffer.append(chunk)
 
             buffers_since_check += 1.0
             self.wake_word_recognizer.update(chunk)
             if buffers_since_check > buffers_per_check:
                 buffers_since_check -= buffers_per_check
-                chopped = byte_data[-test_size:] \
-                    if test_size < len(byte_data) else byte_data
-                audio_data = chopped + silence
+                audio_data = audio_buffer.get_last(test_size, padded=True)
                 said_wake_word = \
                     self.wake_word_recognizer.found_wake_word(audio_data)
                 # if a wake word is success full then upload wake word
                 if said_wake_word and self.config['opt_in'] and not \
                         self.upload_disabled:
+                    byte_data = bytes(audio_buffer.get_last())
                     Thread(
                         target=self._upload_wake_word, daemon=True,
                         args=[self._create_audio_data(byte_data, source)]
@@ -472,7 +529,7 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
         """
         return AudioData(raw_data, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
 
-    def listen(self, source, emitter):
+    def listen(self, source, emitter, stream=None):
         """Listens for chunks of audio that Mycroft should perform STT on.
 
         This will listen continuously for a wake-up-word, then return the
@@ -483,11 +540,16 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
             source (AudioSource):  Source producing the audio chunks
             emitter (EventEmitter): Emitter for notifications of when recording
                                     begins and ends.
+            stream: Optional receiver of the phrase while it is recorded.
+                    stream.start() is called when recording begins,
+                    stream.feed() with every chunk and stream.finish()
+                    when recording ends.
 
         Returns:
             AudioData: audio with the user's utterance, minus the wake-up-word
         """
         assert isinstance(source, AudioSource), "Source must be an AudioSource"
+        self._emitter = emitter
 
         #        bytes_per_sec = source.SAMPLE_RATE * source.SAMPLE_WIDTH
         sec_per_buffer = float(source.CHUNK) / source.SAMPLE_RATE
@@ -517,7 +579,15 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
                 play_wav(audio_file).wait()
                 source.unmute()
 
-        frame_data = self._record_phrase(source, sec_per_buffer)
+        if stream:
+            stream.start()
+            try:
+                frame_data = self._record_phrase(source, sec_per_buffer,
+                                                 stream)
+            finally:
+                stream.finish()
+        else:
+            frame_data = self._record_phrase(source, sec_per_buffer)
         audio_data = self._create_audio_data(frame_data, source)
         emitter.emit("recognizer_loop:record_end")
         if self.save_utterances:
@@ -0,0 +1,206 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Voice activity detection used to find the end of a spoken phrase.
+
+A detector classifies each recorded chunk as speech or not, the Endpointer
+decides from these classifications when the phrase is complete.
+"""
+from mycroft.util.log import LOG
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+
+class EnergyVAD:
+    """ Chunks louder than the energy threshold are speech. """
+    def __init__(self, sample_rate, sample_width, config=None):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.config = config or {}
+
+    def reset(self):
+        """ Prepare for a new phrase. """
+        pass
+
+    def is_speech(self, chunk, energy, threshold):
+        """ Check if a chunk of audio contains speech.
+
+        Arguments:
+            chunk (bytes): raw audio
+            energy (float): RMS energy of the chunk
+            threshold (float): current energy threshold for speech
+
+        Returns:
+            bool: True if the chunk is considered speech
+        """
+        return energy > threshold
+
+
+class FeatureVAD(EnergyVAD):
+    """ Classifies short frames on energy, zero crossings and spectrum.
+
+    A frame is speech if it is louder than the energy threshold, its
+    spectrum is not flat like broadband noise and the signal crosses zero
+    often enough not to be a low hum. A chunk is speech if enough of its
+    frames are. All frames of a chunk are processed at once with numpy.
+    """
+    def __init__(self, sample_rate, sample_width, config=None):
+        super().__init__(sample_rate, sample_width, config)
+        if numpy is None:
+            raise ImportError('numpy is required for the features VAD')
+        if sample_width != 2:
+            raise ValueError('Only 16 bit audio is supported')
+        self.frame_size = int(sample_rate *
+                              self.config.get('frame_ms', 10) / 1000)
+        self.max_flatness = self.config.get('max_flatness', 0.5)
+        self.min_zero_crossings = self.config.get('min_zero_crossings', 0.02)
+        self.min_speech_frames = self.config.get('min_speech_frames', 0.5)
+        self.window = numpy.hanning(self.frame_size)
+
+    def is_speech(self, chunk, energy, threshold):
+        samples = numpy.frombuffer(chunk, dtype='<i2')
+        num_frames = len(samples) // self.frame_size
+        if num_frames == 0:
+            return energy > threshold
+        frames = samples[:num_frames * self.frame_size].reshape(
+            num_frames, self.frame_size).astype(numpy.float32)
+
+        energies = numpy.sqrt(numpy.mean(frames ** 2, axis=1))
+        crossings = numpy.mean(numpy.diff(numpy.signbit(frames), axis=1),
+                               axis=1)
+        power = numpy.abs(numpy.fft.rfft(frames * self.window)) ** 2 + 1e-10
+        flatness = (numpy.exp(numpy.mean(numpy.log(power), axis=1)) /
+                    numpy.mean(power, axis=1))
+
+        speech = ((energies > threshold) &
+                  (flatness < self.max_flatness) &
+                  (crossings > self.min_zero_crossings))
+        return numpy.mean(speech) >= self.min_speech_frames
+
+
+class WebRTCVAD(EnergyVAD):
+    """ Classifies frames with the WebRTC voice activity detector.
+
+    Audio not filling a complete frame is kept for the next chunk.
+    """
+    FRAME_MS = 30
+
+    def __init__(self, sample_rate, sample_width, config=None):
+        super().__init__(sample_rate, sample_width, config)
+        if webrtcvad is None:
+            raise ImportError('webrtcvad is required for the webrtc VAD')
+        if sample_width != 2:
+            raise ValueError('Only 16 bit audio is supported')
+        self.vad = webrtcvad.Vad(self.config.get('aggressiveness', 2))
+        self.frame_bytes = (sample_rate * self.FRAME_MS // 1000 *
+                            sample_width)
+        self.min_speech_frames = self.config.get('min_speech_frames', 0.5)
+        self.remainder = b''
+        self.last = False
+        # Raises an error for unsupported sample rates
+        self.vad.is_speech(b'\0' * self.frame_bytes, sample_rate)
+
+    def reset(self):
+        self.remainder = b''
+        self.last = False
+
+    def is_speech(self, chunk, energy, threshold):
+        data = self.remainder + chunk
+        num_frames = len(data) // self.frame_bytes
+        self.remainder = data[num_frames * self.frame_bytes:]
+        if num_frames == 0:
+            return self.last
+
+        speech = sum(self.vad.is_speech(data[i:i + self.frame_bytes],
+                                        self.sample_rate)
+                     for i in range(0, num_frames * self.frame_bytes,
+                                    self.frame_bytes))
+        self.last = speech / num_frames >= self.min_speech_frames
+        return self.last
+
+
+class Endpointer:
+    """ Decides when a phrase is complete.
+
+    The phrase is complete after hangover seconds without speech, if it
+    has contained enough speech or has been recording silence for too
+    long.
+
+    Arguments:
+        sec_per_chunk (float): seconds of audio in each chunk
+        hangover (float): seconds without speech ending the phrase
+        min_speech (float): seconds of speech making a complete phrase
+        max_silence (float): seconds after which a phrase without enough
+                             speech is ended
+    """
+    def __init__(self, sec_per_chunk, hangover, min_speech, max_silence):
+        self.hangover_chunks = max(1, int(round(hangover / sec_per_chunk)))
+        self.min_speech_chunks = int(min_speech / sec_per_chunk)
+        self.max_silent_chunks = int(max_silence / sec_per_chunk)
+        self.num_chunks = 0
+        self.speech_chunks = 0
+        self.silent_chunks = 0
+
+    def update(self, is_speech):
+        """ Add the classification of the next chunk.
+
+        Returns:
+            bool: True if the phrase is complete
+        """
+        self.num_chunks += 1
+        if is_speech:
+            self.speech_chunks += 1
+            self.silent_chunks = 0
+        else:
+            self.silent_chunks += 1
+
+        was_loud_enough = self.speech_chunks > self.min_speech_chunks
+        recorded_too_much_silence = self.num_chunks > self.max_silent_chunks
+        return (self.silent_chunks >= self.hangover_chunks and
+                (was_loud_enough or recorded_too_much_silence))
+
+
+class VADFactory:
+    CLASSES = {
+        "energy": EnergyVAD,
+        "features": FeatureVAD,
+        "webrtc": WebRTCVAD
+    }
+
+    @staticmethod
+    def create(config, sample_rate, sample_width):
+        """ Create the configured detector, falling back to EnergyVAD.
+
+        Arguments:
+            config (dict): listener "vad" config
+            sample_rate (int): samples per second of the audio
+            sample_width (int): bytes per sample
+        """
+        config = config or {}
+        module = config.get('module', 'energy')
+        try:
+            clazz = VADFactory.CLASSES[module]
+            return clazz(sample_rate, sample_width, config)
+        except Exception as e:
+            LOG.warning('Could not create {} VAD, using energy '
+                        'instead: {}'.format(module, repr(e)))
+            return EnergyVAD(sample_rate, sample_width, config)
@@ -352,6 +352,15 @@ class ScreenDrawThread(Thread):
                 time.sleep(0.01)
 
 
+def handle_mic_level(event):
+    global meter_cur
+    global meter_thresh
+
+    meter_cur = float(event.data.get('energy', -1))
+    meter_thresh = float(event.data.get('threshold', -1))
+    set_screen_dirty()
+
+
 def start_mic_monitor(filename):
     if os.path.isfile(filename):
         thread = MicMonitorThread(filename)
@@ -1200,6 +1209,7 @@ def gui_main(stdscr):
     bus.on('speak', handle_speak)
     bus.on('message', handle_message)
     bus.on('recognizer_loop:utterance', handle_utterance)
+    bus.on('mycroft.mic.level', handle_mic_level)
     bus.on('connected', handle_is_connected)
     bus.on('reconnecting', handle_reconnecting)
 
@@ -0,0 +1,331 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""asyncio based messagebus client.
+
+All handlers are run on a single event loop. Handlers can be coroutine
+functions, which are scheduled as tasks, or plain functions, which are
+called directly on the loop and should therefore return quickly.
+
+    bus = AsyncWebsocketClient()
+
+    async def handle_speak(message):
+        print(message.data['utterance'])
+
+    bus.on('speak', handle_speak)
+    bus.run_forever()
+"""
+import asyncio
+import random
+from collections import defaultdict
+from uuid import uuid4
+
+import websockets
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+from pyee import EventEmitter
+
+from mycroft.configuration import Configuration
+from mycroft.messagebus.client.ws import WebsocketClient, emit_batch
+from mycroft.messagebus.message import Message, ENCODINGS, SET_ENCODING, \
+    BATCH, SUBSCRIBE, UNSUBSCRIBE
+from mycroft.util import validate_param
+from mycroft.util.log import LOG
+
+
+class AsyncEventEmitter(EventEmitter):
+    """ Event emitter logging errors raised by plain function handlers.
+
+    pyee reports errors of coroutine handlers as "error" events but lets
+    exceptions of plain functions propagate out of emit(), which would end
+    the client's receive loop.
+    """
+    def __init__(self, loop=None):
+        super().__init__(loop=loop)
+        self.wrappers = defaultdict(list)
+
+    def _wrap(self, event, f, once=False):
+        def wrapped(*args, **kwargs):
+            if once:
+                self._forget(event, f, wrapped)
+            try:
+                return f(*args, **kwargs)
+            except Exception:
+                LOG.exception('Error in {} handler'.format(event))
+        self.wrappers[event].append((f, wrapped))
+        return wrapped
+
+    def _forget(self, event, f, wrapped):
+        try:
+            self.wrappers[event].remove((f, wrapped))
+        except ValueError:
+            pass  # Already removed
+
+    def on(self, event, f=None):
+        return super().on(event, self._wrap(event, f))
+
+    def once(self, event, f=None):
+        return super().once(event, self._wrap(event, f, once=True))
+
+    def remove_listener(self, event_name, func):
+        """ Translate from function to wrapped function. """
+        for w in self.wrappers[event_name]:
+            if w[0] == func:
+                self.wrappers[event_name].remove(w)
+                return super().remove_listener(event_name, w[1])
+        return super().remove_listener(event_name, func)
+
+    def remove_all_listeners(self, event=None):
+        if event is None:
+            self.wrappers.clear()
+        else:
+            self.wrappers.pop(event, None)
+        return super().remove_all_listeners(event)
+
+
+class AsyncWebsocketClient:
+    """Messagebus client running all handlers on an asyncio event loop.
+
+    The interface mirrors WebsocketClient, with wait_for_response()
+    being a coroutine. emit() is non-blocking and can be called from any
+    thread, messages emitted while disconnected are sent on reconnect.
+
+    Arguments:
+        loop: asyncio event loop to use, defaults to the current loop
+    """
+    def __init__(self, host=None, port=None, route=None, ssl=None,
+                 encoding=None, loop=None):
+        config = Configuration.get().get("websocket")
+        host = host or config.get("host")
+        port = port or config.get("port")
+        route = route or config.get("route")
+        ssl = ssl or config.get("ssl")
+        encoding = encoding or config.get("encoding", "json")
+        validate_param(host, "websocket.host")
+        validate_param(port, "websocket.port")
+        validate_param(route, "websocket.route")
+
+        self.url = WebsocketClient.build_url(host, port, route, ssl)
+        self.loop = loop or asyncio.get_event_loop()
+        self.emitter = AsyncEventEmitter(loop=self.loop)
+        self.emitter.on('error', self._on_handler_error)
+        self.connection = None
+        self.running = False
+        self.retry = 5
+        self.subscriptions = set()
+        self.preferred_encoding = encoding
+        self.encoding = 'json'
+        # Created on the loop when first needed
+        self._outgoing = None
+        self._connected = None
+
+    @property
+    def outgoing(self):
+        if self._outgoing is None:
+            self._outgoing = asyncio.Queue()
+        return self._outgoing
+
+    @property
+    def connected_event(self):
+        if self._connected is None:
+            self._connected = asyncio.Event()
+        return self._connected
+
+    def _on_handler_error(self, error):
+        LOG.error('Error in messagebus handler: ' + repr(error))
+
+    async def run(self):
+        """Connect and handle messages, reconnecting until closed."""
+        self.running = True
+        while self.running:
+            try:
+                connection = await websockets.connect(self.url)
+            except (OSError, InvalidHandshake) as e:
+                LOG.warning('Could not connect to messagebus: ' + repr(e))
+            else:
+                self.retry = 5
+                await self._handle_connection(connection)
+
+            if self.running:
+                # Jitter to keep clients from reconnecting in lockstep
+                delay = self.retry / 2 + random.uniform(0, self.retry / 2)
+                LOG.warning('Async WS Client will reconnect in '
+                            '{:.1f} seconds.'.format(delay))
+                await asyncio.sleep(delay)
+                self.retry = min(self.retry * 2, 60)
+                self.emitter.emit('reconnecting')
+
+    async def _handle_connection(self, connection):
+        LOG.info('Connected')
+        self.connection = connection
+        self.encoding = 'json'
+        self.connected_event.set()
+        writer = asyncio.ensure_future(self._write(connection))
+        if self.subscriptions:
+            # Restore subscriptions on the new connection
+            await self._send_control(SUBSCRIBE,
+                                     {'types': list(self.subscriptions)})
+        self.emitter.emit('open')
+        try:
+            while True:
+                self.on_message(await connection.recv())
+        except ConnectionClosed:
+            pass
+        finally:
+            self.connected_event.clear()
+            self.connection = None
+            writer.cancel()
+            self.emitter.emit('close')
+
+    async def _write(self, connection):
+        """Send queued messages over the connection."""
+        while True:
+            message = await self.outgoing.get()
+            try:
+                await connection.send(message.serialize(self.encoding))
+            except ConnectionClosed:
+                LOG.warning('Could not send {} message because connection '
+                            'has been closed'.format(message.type))
+                return
+
+    async def _send_control(self, msg_type, data):
+        try:
+            await self.connection.send(Message(msg_type, data).serialize())
+        except (ConnectionClosed, AttributeError):
+            LOG.warning('Could not send {}, connection has '
+                        'been closed'.format(msg_type))
+
+    def on_message(self, message):
+        try:
+            parsed_message = Message.deserialize(message)
+        except Exception:
+            LOG.exception('Could not decode message')
+            return
+        if parsed_message.type == 'connected':
+            self._negotiate_encoding(parsed_message.data.get('encodings', []))
+        if isinstance(message, bytes) and self.emitter.listeners('message'):
+            # Raw message listeners expect the json representation
+            message = parsed_message.serialize()
+        self.emitter.emit('message', message)
+        self.emitter.emit(parsed_message.type, parsed_message)
+        if parsed_message.type == BATCH:
+            emit_batch(self.emitter, parsed_message)
+
+    def _negotiate_encoding(self, service_encodings):
+        encoding = self.preferred_encoding
+        if (encoding != self.encoding and encoding in ENCODINGS and
+                encoding in service_encodings):
+            # The service decodes frames based on their type so outgoing
+            # messages can switch before the request has been sent
+            self.encoding = encoding
+            asyncio.ensure_future(
+                self._send_control(SET_ENCODING, {'encoding': encoding}))
+
+    def emit(self, message):
+        """Queue a message for sending, safe to call from any thread."""
+        self.loop.call_soon_threadsafe(self._enqueue, message)
+
+    def _enqueue(self, message):
+        self.outgoing.put_nowait(message)
+
+    async def wait_for_response(self, message, reply_type=None,
+                                timeout=None):
+        """Send a message and wait for a response.
+
+        Args:
+            message (Message): message to send
+            reply_type (str): the message type of the expected reply.
+                              Defaults to "<message.type>.response".
+            timeout: seconds to wait before timeout, defaults to 3
+        Returns:
+            The received message or None if the response timed out
+        """
+        reply_type = reply_type or message.type + '.response'
+        msg_id = str(uuid4())
+        # Tag a copy, the context may be shared with other messages
+        message = Message(message.type, message.data,
+                          dict(message.context, msg_id=msg_id))
+        response = self.loop.create_future()
+
+        def handler(reply):
+            """Receive response data."""
+            if (reply.context.get('msg_id', msg_id) == msg_id and
+                    not response.done()):
+                response.set_result(reply)
+
+        self.on(reply_type, handler)
+        self.emit(message)
+        try:
+            return await asyncio.wait_for(response, timeout or 3.0)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.remove(reply_type, handler)
+
+    def subscribe(self, types):
+        """Only receive the given message types from the bus.
+
+        Args:
+            types (list): message types or glob patterns, ex. "enclosure.*"
+        """
+        self.subscriptions.update(types)
+        if self.connection:
+            asyncio.ensure_future(
+                self._send_control(SUBSCRIBE, {'types': list(types)}))
+
+    def unsubscribe(self, types=None):
+        """Stop receiving message types previously subscribed to.
+
+        Args:
+            types (list): types to remove, if None all subscriptions are
+                          removed and all messages are received again.
+        """
+        if types is None:
+            self.subscriptions = set()
+        else:
+            self.subscriptions.difference_update(types)
+        if self.connection:
+            asyncio.ensure_future(
+                self._send_control(UNSUBSCRIBE, {'types': types}))
+
+    def on(self, event_name, func):
+        self.emitter.on(event_name, func)
+
+    def once(self, event_name, func):
+        self.emitter.once(event_name, func)
+
+    def remove(self, event_name, func):
+        try:
+            self.emitter.remove_listener(event_name, func)
+        except (ValueError, KeyError):
+            LOG.warning('Failed to remove event {}: {}'.format(event_name,
+                                                               str(func)))
+
+    def remove_all_listeners(self, event_name):
+        """Remove all listeners connected to event_name.
+
+        Args:
+            event_name: event from which to remove listeners
+        """
+        if event_name is None:
+            raise ValueError
+        self.emitter.remove_all_listeners(event_name)
+
+    def run_forever(self):
+        """Run the client on its event loop until closed."""
+        self.loop.run_until_complete(self.run())
+
+    async def close(self):
+        self.running = False
+        if self.connection:
+            await self.connection.close()
@@ -14,22 +14,150 @@
 #
 from pyee import EventEmitter
 from multiprocessing.pool import ThreadPool
-from collections import defaultdict
+from collections import defaultdict, deque
+from fnmatch import fnmatchcase
+from threading import Lock
+import time
+
+from mycroft.util.log import LOG
+
+
+# Queue policies
+DROP = 'drop'  # Drop new events when the handler queue is full
+COALESCE = 'coalesce'  # Only keep the latest pending event
+CONCURRENT = 'concurrent'  # Start each event without waiting for the last
+
+
+class EventStats:
+    """ Dispatch statistics for a single event type. """
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+        self.handled = 0
+        self.dropped = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self):
+        return {
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'handled': self.handled,
+            'dropped': self.dropped,
+            'avg_latency': (self.total_latency / self.handled
+                            if self.handled else 0.0),
+            'max_latency': self.max_latency
+        }
+
+
+class HandlerQueue:
+    """ Pending calls of one handler.
+
+    The calls are run one at a time on the emitter's pool, in the order the
+    events were emitted. A slow handler thus only occupies a single worker.
+    With the "concurrent" policy each call is started as soon as a worker
+    is free instead, for handlers that must serve overlapping requests.
+    """
+    def __init__(self, emitter, event, f):
+        self.emitter = emitter
+        self.event = event
+        self.f = f
+        self.policy, self.max_depth = emitter.queue_policy(event)
+        self.pending = deque()
+        self.running = False
+        self.lock = Lock()
+
+    def put(self, args, kwargs):
+        with self.lock, self.emitter.stats_lock:
+            stats = self.emitter.stats[self.event]
+            if self.policy == COALESCE and self.pending:
+                self.pending.popleft()
+                stats.depth -= 1
+                stats.dropped += 1
+            elif self.max_depth and len(self.pending) >= self.max_depth:
+                stats.dropped += 1
+                LOG.warning('Handler queue for {} is full, dropping '
+                            'event'.format(self.event))
+                return
+            self.pending.append((time.monotonic(), args, kwargs))
+            stats.depth += 1
+            stats.max_depth = max(stats.max_depth, stats.depth)
+            if self.running and self.policy != CONCURRENT:
+                return
+            self.running = True
+        self.emitter.pool.apply_async(self.run_next)
+
+    def run_next(self):
+        with self.lock, self.emitter.stats_lock:
+            stats = self.emitter.stats[self.event]
+            queued, args, kwargs = self.pending.popleft()
+            stats.depth -= 1
+            latency = time.monotonic() - queued
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+        try:
+            self.f(*args, **kwargs)
+        except Exception:
+            LOG.exception('Error in {} handler'.format(self.event))
+        with self.emitter.stats_lock:
+            stats.handled += 1
+        with self.lock:
+            if self.policy == CONCURRENT:
+                return  # Every call was scheduled by put()
+            if self.pending:
+                self.emitter.pool.apply_async(self.run_next)
+            else:
+                self.running = False
 
 
 class ThreadedEventEmitter(EventEmitter):
     """ Event Emitter using the threadpool to run event functions in
         separate threads.
+
+        Each handler gets its own queue so calls to a handler are run in
+        order, optionally limited by queue policies. Handlers of events with
+        the "concurrent" policy are called in parallel, as long as workers
+        are available.
+
+        Arguments:
+            threads (int): number of worker threads
+            max_queue_depth (int): max pending calls per handler, 0 means
+                                   unlimited
+            queue_policies (dict): event type (or glob pattern) to queue
+                                   policy, "drop", "coalesce" or
+                                   "concurrent"
     """
-    def __init__(self, threads=10):
+    def __init__(self, threads=10, max_queue_depth=0, queue_policies=None):
         super().__init__()
         self.pool = ThreadPool(threads)
         self.wrappers = defaultdict(list)
+        self.max_queue_depth = max_queue_depth
+        self.queue_policies = queue_policies or {}
+        self.stats = defaultdict(EventStats)
+        self.stats_lock = Lock()
+
+    def queue_policy(self, event):
+        """ Get the queue policy and max depth for an event type. """
+        policy = self.queue_policies.get(event)
+        if policy is None:
+            for pattern in self.queue_policies:
+                if fnmatchcase(str(event), pattern):
+                    policy = self.queue_policies[pattern]
+                    break
+        return policy or DROP, self.max_queue_depth
+
+    def get_stats(self):
+        """ Get dispatch statistics for all events emitted so far. """
+        with self.stats_lock:
+            return {str(event): stats.as_dict()
+                    for event, stats in self.stats.items()}
 
     def on(self, event, f=None):
         """ Wrap on with a threaded launcher. """
+        queue = HandlerQueue(self, event, f)
+
         def wrapped(*args, **kwargs):
-            return self.pool.apply_async(f, args, kwargs)
+            queue.put(args, kwargs)
 
         w = super().on(event, wrapped)
         # Store mapping from function to wrapped function
@@ -38,8 +166,10 @@ class ThreadedEventEmitter(EventEmitter):
 
     def once(self, event, f=None):
         """ Wrap once with a threaded launcher. """
+        queue = HandlerQueue(self, event, f)
+
         def wrapped(*args, **kwargs):
-            return self.pool.apply_async(f, args, kwargs)
+            queue.put(args, kwargs)
 
         wrapped = super().once(event, wrapped)
         self.wrappers[event].append((f, wrapped))
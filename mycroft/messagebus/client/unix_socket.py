@@ -0,0 +1,129 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Messagebus transport over a unix domain socket.
+
+Clients on the same host as the messagebus service can skip the TCP stack
+and websocket framing (including the per byte masking of client frames).
+Every message is sent as a frame made up of a one byte kind (text or
+binary), the payload length as a four byte unsigned big endian integer and
+the payload itself.
+"""
+import socket
+import struct
+from threading import Lock
+
+from websocket import ABNF, WebSocketConnectionClosedException
+
+from mycroft.util.log import LOG
+
+
+HEADER = struct.Struct('!BI')
+TEXT = 1
+BINARY = 2
+
+
+def pack_frame(message, binary=False):
+    """ Build a frame for a str (text) or bytes (binary) message. """
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    else:
+        binary = True
+    return HEADER.pack(BINARY if binary else TEXT, len(message)) + message
+
+
+def unpack_payload(kind, payload):
+    """ Get the message from a frame payload. """
+    return payload if kind == BINARY else payload.decode('utf-8')
+
+
+class UnixSocketApp:
+    """ Drop-in replacement for websocket.WebSocketApp using a unix socket.
+
+    Only the parts of the WebSocketApp interface used by WebsocketClient
+    are provided.
+
+    Arguments:
+        path (str): path of the messagebus unix socket
+    """
+    def __init__(self, path, on_open=None, on_message=None, on_error=None,
+                 on_close=None):
+        self.path = path
+        self.on_open = on_open
+        self.on_message = on_message
+        self.on_error = on_error
+        self.on_close = on_close
+        self.keep_running = False
+        self.sock = None
+        self.send_lock = Lock()
+
+    def _callback(self, callback, *args):
+        if callback:
+            try:
+                callback(*args)
+            except Exception as e:
+                LOG.error('Error from callback {}: {}'.format(callback,
+                                                              repr(e)))
+
+    def _recv_exactly(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise WebSocketConnectionClosedException(
+                    'Connection closed by the messagebus')
+            data += chunk
+        return bytes(data)
+
+    def run_forever(self):
+        self.keep_running = True
+        error = None
+        try:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(self.path)
+            self._callback(self.on_open)
+            while self.keep_running:
+                kind, length = HEADER.unpack(self._recv_exactly(HEADER.size))
+                payload = self._recv_exactly(length)
+                self._callback(self.on_message,
+                               unpack_payload(kind, payload))
+        except (OSError, WebSocketConnectionClosedException) as e:
+            # Errors caused by close() are expected
+            error = e if self.keep_running else None
+
+        # Clean up before reporting the error, on_error may reconnect
+        self.keep_running = False
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+        self._callback(self.on_close)
+        if error:
+            self._callback(self.on_error, error)
+
+    def send(self, data, opcode=ABNF.OPCODE_TEXT):
+        frame = pack_frame(data, opcode == ABNF.OPCODE_BINARY)
+        try:
+            with self.send_lock:
+                self.sock.sendall(frame)
+        except (OSError, AttributeError):
+            raise WebSocketConnectionClosedException(
+                'Connection to the messagebus is closed')
+
+    def close(self):
+        self.keep_running = False
+        if self.sock:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
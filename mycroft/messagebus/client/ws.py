@@ -12,39 +12,92 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from collections import OrderedDict
 import json
+import os
+from os.path import exists
 import time
-from threading import Event
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from threading import Event, Lock
 import traceback
+from uuid import uuid4
 
 from .threaded_event_emitter import ThreadedEventEmitter
-from websocket import (WebSocketApp, WebSocketConnectionClosedException,
-                       WebSocketException)
+from .unix_socket import UnixSocketApp
+from websocket import (ABNF, WebSocketApp,
+                       WebSocketConnectionClosedException, WebSocketException)
 
 from mycroft.configuration import Configuration
-from mycroft.messagebus.message import Message
+from mycroft.messagebus.message import (Message, ENCODINGS, SET_ENCODING,
+                                        BATCH, SUBSCRIBE, UNSUBSCRIBE,
+                                        batch_event)
 from mycroft.util import validate_param, create_echo_function
 from mycroft.util.log import LOG
 
 
+# Query for the handler queue statistics of all clients
+DISPATCH_STATS = 'mycroft.messagebus.dispatch.stats'
+
+
+def emit_batch(emitter, batch):
+    """Deliver the messages of a batch to local handlers.
+
+    Handlers registered for batch_event(<type>) get all messages of that
+    type in one call, handlers for the type itself get the messages one by
+    one. The messages are marked as batched in their context so a service
+    handling both can skip the single messages.
+
+    Args:
+        emitter: event emitter to deliver the messages on
+        batch (Message): batch envelope
+    """
+    groups = OrderedDict()
+    for message in batch.unbatch():
+        message.context['batched'] = True
+        groups.setdefault(message.type, []).append(message)
+    for msg_type, group in groups.items():
+        if emitter.listeners(batch_event(msg_type)):
+            emitter.emit(batch_event(msg_type), group)
+        for message in group:
+            emitter.emit(message.type, message)
+
+
 class WebsocketClient:
-    def __init__(self, host=None, port=None, route=None, ssl=None):
+    def __init__(self, host=None, port=None, route=None, ssl=None,
+                 encoding=None):
 
         config = Configuration.get().get("websocket")
+        explicit_host = host is not None
         host = host or config.get("host")
         port = port or config.get("port")
         route = route or config.get("route")
         ssl = ssl or config.get("ssl")
+        encoding = encoding or config.get("encoding", "json")
         validate_param(host, "websocket.host")
         validate_param(port, "websocket.port")
         validate_param(route, "websocket.route")
 
         self.url = WebsocketClient.build_url(host, port, route, ssl)
-        self.emitter = ThreadedEventEmitter()
+        # Same host clients may connect through the unix socket instead
+        self.unix_socket = None
+        if config.get("transport") == "unix" and not explicit_host:
+            self.unix_socket = config.get("unix_socket")
+            validate_param(self.unix_socket, "websocket.unix_socket")
+        dispatcher = config.get("dispatcher", {})
+        self.emitter = ThreadedEventEmitter(
+            dispatcher.get("threads", 10),
+            dispatcher.get("max_queue_depth", 0),
+            dispatcher.get("queue_policies"))
         self.client = self.create_client()
         self.retry = 5
         self.connected_event = Event()
         self.started_running = False
+        self.subscriptions = set()
+        # Encoding to request from the service, the connection falls back
+        # to json if the service or this installation doesn't support it
+        self.preferred_encoding = encoding
+        self.encoding = 'json'
+        self.on(DISPATCH_STATS, self._handle_dispatch_stats)
 
     @staticmethod
     def build_url(host, port, route, ssl):
@@ -52,13 +105,22 @@ class WebsocketClient:
         return scheme + "://" + host + ":" + str(port) + route
 
     def create_client(self):
+        if self.unix_socket and exists(self.unix_socket):
+            return UnixSocketApp(self.unix_socket,
+                                 on_open=self.on_open, on_close=self.on_close,
+                                 on_error=self.on_error,
+                                 on_message=self.on_message)
         return WebSocketApp(self.url,
                             on_open=self.on_open, on_close=self.on_close,
                             on_error=self.on_error, on_message=self.on_message)
 
     def on_open(self):
         LOG.info("Connected")
+        self.encoding = 'json'
         self.connected_event.set()
+        if self.subscriptions:
+            # Restore subscriptions on the new connection
+            self._send_subscription(SUBSCRIBE, list(self.subscriptions))
         self.emitter.emit("open")
         # Restore reconnect timer to 5 seconds on sucessful connect
         self.retry = 5
@@ -90,10 +152,34 @@ class WebsocketClient:
         except WebSocketException:
             pass
 
+    def _handle_dispatch_stats(self, message):
+        self.emit(message.response({'pid': os.getpid(),
+                                    'stats': self.emitter.get_stats()}))
+
     def on_message(self, message):
         parsed_message = Message.deserialize(message)
+        if parsed_message.type == 'connected':
+            self._negotiate_encoding(parsed_message.data.get('encodings', []))
+        if isinstance(message, bytes) and self.emitter.listeners('message'):
+            # Raw message listeners expect the json representation
+            message = parsed_message.serialize()
         self.emitter.emit('message', message)
         self.emitter.emit(parsed_message.type, parsed_message)
+        if parsed_message.type == BATCH:
+            emit_batch(self.emitter, parsed_message)
+
+    def _negotiate_encoding(self, service_encodings):
+        """Switch to the preferred encoding if both ends support it."""
+        encoding = self.preferred_encoding
+        if (encoding != self.encoding and encoding in ENCODINGS and
+                encoding in service_encodings):
+            try:
+                self.client.send(Message(SET_ENCODING,
+                                         {'encoding': encoding}).serialize())
+                self.encoding = encoding
+            except WebSocketConnectionClosedException:
+                LOG.warning('Could not select encoding, connection '
+                            'has been closed')
 
     def emit(self, message):
         if not self.connected_event.wait(10):
@@ -103,7 +189,10 @@ class WebsocketClient:
             self.connected_event.wait()
 
         try:
-            if hasattr(message, 'serialize'):
+            if hasattr(message, 'serialize') and self.encoding != 'json':
+                self.client.send(message.serialize(self.encoding),
+                                 ABNF.OPCODE_BINARY)
+            elif hasattr(message, 'serialize'):
                 self.client.send(message.serialize())
             else:
                 self.client.send(json.dumps(message.__dict__))
@@ -111,42 +200,115 @@ class WebsocketClient:
             LOG.warning('Could not send {} message because connection '
                         'has been closed'.format(message.type))
 
-    def wait_for_response(self, message, reply_type=None, timeout=None):
-        """Send a message and wait for a response.
+    def _send_subscription(self, msg_type, types):
+        try:
+            self.client.send(Message(msg_type, {'types': types}).serialize())
+        except WebSocketConnectionClosedException:
+            LOG.warning('Could not update subscriptions, connection '
+                        'has been closed')
+
+    def subscribe(self, types):
+        """Only receive the given message types from the bus.
+
+        By default a client receives all messages on the bus. After
+        subscribing only messages matching one of the subscribed types are
+        delivered. This includes replies, the reply types used with
+        wait_for_response() must be subscribed to as well. The
+        subscriptions are restored on reconnect.
+
+        Args:
+            types (list): message types or glob patterns, ex. "enclosure.*"
+        """
+        self.subscriptions.update(types)
+        if self.connected_event.is_set():
+            self._send_subscription(SUBSCRIBE, list(types))
+
+    def unsubscribe(self, types=None):
+        """Stop receiving message types previously subscribed to.
+
+        Args:
+            types (list): types to remove, if None all subscriptions are
+                          removed and all messages are received again.
+        """
+        if types is None:
+            self.subscriptions = set()
+        else:
+            self.subscriptions.difference_update(types)
+        if self.connected_event.is_set():
+            self._send_subscription(UNSUBSCRIBE, types)
+
+    def request(self, message, reply_type=None):
+        """Send a message and get a future for the response.
+
+        A copy of the message is sent, tagged with a unique "msg_id" in its
+        context. Replies carrying a different msg_id are answers to someone
+        else's request and are ignored, replies without one are accepted.
+
+        The returned concurrent.futures.Future can be waited on directly or
+        wrapped for asyncio using asyncio.wrap_future(). Cancelling it
+        stops listening for the reply.
 
         Args:
             message (Message): message to send
             reply_type (str): the message type of the expected reply.
                               Defaults to "<message.type>.response".
-            timeout: seconds to wait before timeout, defaults to 3
         Returns:
-            The received message or None if the response timed out
+            Future resolving to the received message
         """
-        response = []
-
-        def handler(message):
+        reply_type = reply_type or message.type + '.response'
+        msg_id = str(uuid4())
+        # Tag a copy, the context may be shared with other messages
+        message = Message(message.type, message.data,
+                          dict(message.context, msg_id=msg_id))
+        future = Future()
+        lock = Lock()
+
+        def handler(reply):
             """Receive response data."""
-            response.append(message)
+            if reply.context.get('msg_id', msg_id) != msg_id:
+                return
+            with lock:
+                if not future.done():
+                    future.set_result(reply)
+
+        def cleanup(_):
+            try:
+                self.remove(reply_type, handler)
+            except (ValueError, KeyError):
+                # KeyError may theoretically occur if the event occurs as
+                # the handler is removed
+                pass
 
         # Setup response handler
-        self.once(reply_type or message.type + '.response', handler)
+        self.on(reply_type, handler)
+        future.add_done_callback(cleanup)
         # Send request
-        self.emit(message)
-        # Wait for response
-        start_time = time.monotonic()
-        while len(response) == 0:
-            time.sleep(0.2)
-            if time.monotonic() - start_time > (timeout or 3.0):
-                try:
-                    self.remove(reply_type, handler)
-                except (ValueError, KeyError):
-                    # ValueError occurs on pyee 1.0.1 removing handlers
-                    # registered with once.
-                    # KeyError may theoretically occur if the event occurs as
-                    # the handler is removed
-                    pass
+        try:
+            self.emit(message)
+        except Exception:
+            future.cancel()
+            raise
+        return future
+
+    def wait_for_response(self, message, reply_type=None, timeout=None):
+        """Send a message and wait for a response.
+
+        Args:
+            message (Message): message to send
+            reply_type (str): the message type of the expected reply.
+                              Defaults to "<message.type>.response".
+            timeout: seconds to wait before timeout, defaults to 3
+        Returns:
+            The received message or None if the response timed out
+        """
+        future = self.request(message, reply_type)
+        try:
+            return future.result(timeout or 3.0)
+        except FutureTimeoutError:
+            if future.cancel():
                 return None
-        return response[0]
+            # The response arrived just as the wait timed out
+            return future.result()
 
     def on(self, event_name, func):
         self.emitter.on(event_name, func)
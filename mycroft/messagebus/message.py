@@ -16,6 +16,31 @@ import json
 import re
 from mycroft.util.parse import normalize
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Wire encodings supported by this installation, in order of preference
+ENCODINGS = ['msgpack', 'json'] if msgpack else ['json']
+# Message type used by a client to select the encoding of its connection
+SET_ENCODING = 'mycroft.messagebus.encoding'
+# Envelope carrying several messages in a single frame
+BATCH = 'mycroft.messagebus.batch'
+# Message types used by a client to select the message types it receives
+SUBSCRIBE = 'mycroft.messagebus.subscribe'
+UNSUBSCRIBE = 'mycroft.messagebus.unsubscribe'
+
+
+def batch_event(msg_type):
+    """Event receiving all batched messages of a type as a single list."""
+    return 'batch:' + msg_type
+
+
+# Leading "type" field as written by Message.serialize()
+_JSON_TYPE = re.compile(r'\{"type": "([^"\\]*)"')
+_MSGPACK_TYPE_KEY = b'\xa4type'
+
 
 class Message:
     """Holds and manipulates data sent over the websocket
@@ -40,20 +65,28 @@ class Message:
         self.data = data or {}
         self.context = context or {}
 
-    def serialize(self):
+    def serialize(self, encoding='json'):
         """This returns a string of the message info.
 
         This makes it easy to send over a websocket. This uses
         json dumps to generate the string with type, data and context
 
+        Args:
+            encoding (str): "json" (default) or "msgpack" for the compact
+                            binary encoding.
+
         Returns:
-            str: a json string representation of the message.
+            str: a json string representation of the message, or bytes
+                 if the msgpack encoding was requested.
         """
-        return json.dumps({
+        obj = {
             'type': self.type,
             'data': self.data,
             'context': self.context
-        })
+        }
+        if encoding == 'msgpack':
+            return msgpack.packb(obj, use_bin_type=True)
+        return json.dumps(obj)
 
     @staticmethod
     def deserialize(value):
@@ -61,7 +94,7 @@ class Message:
 
         This makes it easy to take strings from the websocket and create
         a message object.  This uses json loads to get the info and generate
-        the message object.
+        the message object. Binary values are decoded as msgpack.
 
         Args:
             value(str): This is the json string received from the websocket
@@ -71,11 +104,75 @@ class Message:
             int the function.
             value(str): This is the string received from the websocket
         """
-        obj = json.loads(value)
+        if isinstance(value, bytes) and not value.startswith(b'{'):
+            obj = msgpack.unpackb(value, raw=False)
+        else:
+            obj = json.loads(value)
         return Message(obj.get('type') or '',
                        obj.get('data') or {},
                        obj.get('context') or {})
 
+    @staticmethod
+    def peek_type(value):
+        """Get the message type of a serialized message without decoding it.
+
+        Only the leading "type" field written by serialize() is inspected,
+        messages laid out differently can't be peeked.
+
+        Args:
+            value(str/bytes): serialized message
+
+        Returns:
+            str: message type or None if it can't be determined cheaply
+        """
+        if isinstance(value, bytes):
+            # fixmap header followed by the fixstr "type" key
+            if len(value) < 8 or value[1:6] != _MSGPACK_TYPE_KEY or \
+                    not 0x80 <= value[0] <= 0x8f:
+                return None
+            header = value[6]
+            if 0xa0 <= header <= 0xbf:  # fixstr
+                start, length = 7, header & 0x1f
+            elif header == 0xd9:  # str 8
+                start, length = 8, value[7]
+            else:
+                return None
+            try:
+                return value[start:start + length].decode('utf-8')
+            except UnicodeDecodeError:
+                return None
+        match = _JSON_TYPE.match(value)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def batch(messages):
+        """Pack a list of messages into a single batch message.
+
+        Receiving clients unpack the batch and deliver the messages in
+        order, so handlers see them as if they were sent one by one.
+
+        Args:
+            messages (list): Message objects to send together
+
+        Returns:
+            Message: batch envelope
+        """
+        return Message(BATCH, {'messages': [
+            {'type': m.type, 'data': m.data, 'context': m.context}
+            for m in messages
+        ]})
+
+    def unbatch(self):
+        """Get the messages contained in a batch message.
+
+        Returns:
+            list: Message objects in the order they were batched
+        """
+        return [Message(m.get('type') or '',
+                        m.get('data') or {},
+                        m.get('context') or {})
+                for m in self.data.get('messages', [])]
+
     def reply(self, type, data=None, context=None):
         """Construct a reply message for a given message
 
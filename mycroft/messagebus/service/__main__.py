@@ -17,6 +17,7 @@ from tornado import autoreload, web, ioloop
 from mycroft.configuration import Configuration
 from mycroft.lock import Lock  # creates/supports PID locking file
 from mycroft.messagebus.service.ws import WebsocketEventHandler
+from mycroft.messagebus.service.unix_socket import listen_unix_socket
 from mycroft.util import validate_param, reset_sigint_handler, create_daemon, \
     wait_for_exit_signal
 
@@ -51,6 +52,9 @@ def main():
     ]
     application = web.Application(routes, **settings)
     application.listen(port, host)
+    if config.get("unix_socket"):
+        # Endpoint for clients on the same host
+        listen_unix_socket(config["unix_socket"])
     create_daemon(ioloop.IOLoop.instance().start)
 
     wait_for_exit_signal()
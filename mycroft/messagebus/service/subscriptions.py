@@ -0,0 +1,123 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Index of message types each messagebus connection is interested in.
+
+Connections that never subscribe receive every message (legacy behaviour).
+Once a connection sends a subscribe message it only receives the message
+types it has declared. Types can be given as exact names
+("recognizer_loop:utterance") or as shell style globs ("enclosure.*").
+
+Subscribing is opt-in: the mycroft services, skills included, don't
+subscribe and still receive every message. Only clients that know the
+full set of types they listen to should subscribe.
+"""
+from collections import defaultdict
+from fnmatch import fnmatchcase
+
+
+def is_pattern(msg_type):
+    """ Check if a subscribed type is a glob pattern. """
+    return any(c in msg_type for c in '*?[')
+
+
+class SubscriptionIndex:
+    """ Maps message types to the connections that should receive them. """
+    def __init__(self):
+        # Connections receiving everything
+        self.broadcast = set()
+        # Connections that have subscribed to specific types
+        self.subscriptions = {}
+        self.exact = defaultdict(set)
+        self.patterns = defaultdict(set)
+        # Pattern matches for already seen message types
+        self._pattern_cache = {}
+
+    def add(self, connection):
+        """ Register a new connection, receiving all messages. """
+        self.broadcast.add(connection)
+
+    def remove(self, connection):
+        """ Forget all about a connection. """
+        self.unsubscribe(connection)
+        self.broadcast.discard(connection)
+
+    def subscribe(self, connection, types):
+        """ Limit connection to receive the given types.
+
+        Arguments:
+            connection: connection to subscribe
+            types (list): message types or glob patterns to receive
+        """
+        if not types:
+            return  # Like the client, which doesn't resubscribe without types
+        self.broadcast.discard(connection)
+        subscribed = self.subscriptions.setdefault(connection, set())
+        for msg_type in types:
+            subscribed.add(msg_type)
+            if is_pattern(msg_type):
+                self.patterns[msg_type].add(connection)
+                self._pattern_cache = {}
+            else:
+                self.exact[msg_type].add(connection)
+
+    def unsubscribe(self, connection, types=None):
+        """ Stop sending the given types to a connection.
+
+        Arguments:
+            connection: connection to unsubscribe
+            types (list): types or patterns to remove, if None all
+                          subscriptions are removed. A connection without
+                          subscriptions returns to receiving all messages.
+        """
+        subscribed = self.subscriptions.get(connection, set())
+        remove_all = types is None
+        types = list(subscribed) if remove_all else types
+        for msg_type in types:
+            subscribed.discard(msg_type)
+            index = self.patterns if is_pattern(msg_type) else self.exact
+            if msg_type in index:
+                index[msg_type].discard(connection)
+                if not index[msg_type]:
+                    del index[msg_type]
+            if index is self.patterns:
+                self._pattern_cache = {}
+
+        if connection in self.subscriptions and not subscribed:
+            del self.subscriptions[connection]
+            self.broadcast.add(connection)
+
+    def _pattern_targets(self, msg_type):
+        if msg_type not in self._pattern_cache:
+            targets = set()
+            for pattern, connections in self.patterns.items():
+                if fnmatchcase(msg_type, pattern):
+                    targets |= connections
+            self._pattern_cache[msg_type] = targets
+        return self._pattern_cache[msg_type]
+
+    def targets(self, msg_type):
+        """ Get all connections that should receive a message type.
+
+        Arguments:
+            msg_type (str): type of the message to deliver
+
+        Returns:
+            set: connections to forward the message to
+        """
+        targets = set(self.broadcast)
+        targets |= self.exact.get(msg_type, set())
+        if self.patterns:
+            targets |= self._pattern_targets(msg_type)
+        return targets
@@ -0,0 +1,80 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Unix domain socket endpoint of the messagebus service.
+
+Connections made here are routed together with the websocket connections,
+see mycroft.messagebus.client.unix_socket for the framing.
+"""
+import os
+from os.path import dirname
+
+from tornado import gen
+from tornado.iostream import StreamClosedError
+from tornado.netutil import bind_unix_socket
+from tornado.tcpserver import TCPServer
+
+from mycroft.messagebus.client.unix_socket import (HEADER, pack_frame,
+                                                   unpack_payload)
+from mycroft.messagebus.service.ws import MessageBusConnection
+from mycroft.util.log import LOG
+
+
+class UnixSocketConnection(MessageBusConnection):
+    """ Bus connection over a tornado IOStream. """
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write_message(self, message, binary=False):
+        try:
+            self.stream.write(pack_frame(message, binary))
+        except StreamClosedError:
+            LOG.debug('Unix socket connection already closed')
+
+
+class UnixSocketServer(TCPServer):
+    """ Accepts messagebus connections on a unix domain socket. """
+    @gen.coroutine
+    def handle_stream(self, stream, address):
+        connection = UnixSocketConnection(stream)
+        connection.open()
+        try:
+            while True:
+                header = yield stream.read_bytes(HEADER.size)
+                kind, length = HEADER.unpack(header)
+                payload = yield stream.read_bytes(length)
+                try:
+                    connection.on_message(unpack_payload(kind, payload))
+                except Exception:
+                    LOG.exception('Could not handle unix socket frame')
+        except StreamClosedError:
+            pass
+        finally:
+            connection.on_close()
+            # Don't leave the peer waiting on a connection no longer routed
+            stream.close()
+
+
+def listen_unix_socket(path):
+    """ Start serving the messagebus on a unix socket.
+
+    Must be called before the tornado IOLoop is started.
+
+    Arguments:
+        path (str): file system path of the socket
+    """
+    os.makedirs(dirname(path), exist_ok=True)
+    server = UnixSocketServer()
+    server.add_socket(bind_unix_socket(path))
+    return server
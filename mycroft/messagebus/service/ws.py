@@ -15,34 +15,55 @@
 import json
 import sys
 import traceback
+from collections import Counter
 
 import tornado.websocket
 from pyee import EventEmitter
 
-from mycroft.messagebus.message import Message
+from mycroft.messagebus.message import (Message, ENCODINGS, SET_ENCODING,
+                                        BATCH, SUBSCRIBE, UNSUBSCRIBE)
+from mycroft.messagebus.service.subscriptions import SubscriptionIndex
 from mycroft.util.log import LOG
 
 
 EventBusEmitter = EventEmitter()
 
 client_connections = []
+subscriptions = SubscriptionIndex()
 
+# Query for the frame counters below
+STATS = 'mycroft.messagebus.stats'
+# Message types handled by the service itself
+SERVICE_TYPES = (SUBSCRIBE, UNSUBSCRIBE, SET_ENCODING, STATS)
+# Number of frames relayed untouched vs decoded by the service
+frame_stats = Counter(relayed=0, decoded=0)
 
-class WebsocketEventHandler(tornado.websocket.WebSocketHandler):
-    def __init__(self, application, request, **kwargs):
-        tornado.websocket.WebSocketHandler.__init__(
-            self, application, request, **kwargs)
-        self.emitter = EventBusEmitter
+
+class MessageBusConnection:
+    """ Message routing shared by all kinds of bus connections.
+
+    Subclasses provide write_message(message, binary=False) and call
+    open(), on_message() and on_close() as the connection progresses.
+    """
+    emitter = EventBusEmitter
+    # All connections start out using json, clients supporting a more
+    # compact encoding request it after receiving "connected"
+    encoding = 'json'
 
     def on(self, event_name, handler):
         self.emitter.on(event_name, handler)
 
     def on_message(self, message):
         # LOG.debug(message)
+        frame_encoding = 'msgpack' if isinstance(message, bytes) else 'json'
+        if self.relay(message, frame_encoding):
+            return
+
         try:
             deserialized_message = Message.deserialize(message)
         except:
             return
+        frame_stats['decoded'] += 1
 
         try:
             self.emitter.emit(deserialized_message.type, deserialized_message)
@@ -51,22 +72,89 @@ class WebsocketEventHandler(tornado.websocket.WebSocketHandler):
             traceback.print_exc(file=sys.stdout)
             pass
 
-        for client in client_connections:
-            client.write_message(message)
+        if deserialized_message.type == SUBSCRIBE:
+            subscriptions.subscribe(self,
+                                    deserialized_message.data.get('types', []))
+            return
+        elif deserialized_message.type == UNSUBSCRIBE:
+            subscriptions.unsubscribe(self,
+                                      deserialized_message.data.get('types'))
+            return
+        elif deserialized_message.type == SET_ENCODING:
+            self.set_encoding(deserialized_message.data.get('encoding'))
+            return
+        elif deserialized_message.type == STATS:
+            self.emit(deserialized_message.response(dict(frame_stats)))
+            return
+
+        if deserialized_message.type == BATCH:
+            # Deliver to everyone interested in any of the batched messages
+            targets = set()
+            for msg_type in set(m.get('type', '') for m in
+                                deserialized_message.data.get('messages', [])):
+                targets |= subscriptions.targets(msg_type)
+        else:
+            targets = subscriptions.targets(deserialized_message.type)
+
+        # Encode the message at most once per encoding in use
+        encoded = {frame_encoding: message}
+        for client in targets:
+            if client.encoding not in encoded:
+                encoded[client.encoding] = \
+                    deserialized_message.serialize(client.encoding)
+            client.write_message(encoded[client.encoding],
+                                 binary=client.encoding != 'json')
+
+    def relay(self, message, frame_encoding):
+        """ Forward a frame untouched if the service doesn't need to decode it.
+
+        The frame must be decoded if it's handled in this process, if it's
+        a batch routed by its content or if any receiver uses a different
+        encoding than the sender.
+
+        Returns:
+            bool: True if the frame was relayed
+        """
+        msg_type = Message.peek_type(message)
+        if (msg_type is None or msg_type in SERVICE_TYPES or
+                msg_type == BATCH or self.emitter.listeners(msg_type)):
+            return False
+
+        targets = subscriptions.targets(msg_type)
+        if any(client.encoding != frame_encoding for client in targets):
+            return False
+
+        frame_stats['relayed'] += 1
+        for client in targets:
+            client.write_message(message, binary=frame_encoding != 'json')
+        return True
+
+    def set_encoding(self, encoding):
+        if encoding in ENCODINGS:
+            self.encoding = encoding
+        else:
+            LOG.warning('Unsupported encoding requested: {}'.format(encoding))
 
     def open(self):
-        self.write_message(Message("connected").serialize())
+        self.write_message(Message("connected",
+                                   {'encodings': ENCODINGS}).serialize())
         client_connections.append(self)
+        subscriptions.add(self)
 
     def on_close(self):
         client_connections.remove(self)
+        subscriptions.remove(self)
 
     def emit(self, channel_message):
         if (hasattr(channel_message, 'serialize') and
                 callable(getattr(channel_message, 'serialize'))):
-            self.write_message(channel_message.serialize())
+            self.write_message(channel_message.serialize(self.encoding),
+                               binary=self.encoding != 'json')
         else:
             self.write_message(json.dumps(channel_message))
 
+
+class WebsocketEventHandler(MessageBusConnection,
+                            tornado.websocket.WebSocketHandler):
     def check_origin(self, origin):
         return True
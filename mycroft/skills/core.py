@@ -43,7 +43,7 @@ from mycroft.metrics import report_metric, report_timing, Stopwatch
 from mycroft.skills.settings import SkillSettings
 from mycroft.skills.skill_data import (load_vocabulary, load_regex, to_alnum,
                                        munge_regex, munge_intent_parser,
-                                       read_vocab_file)
+                                       read_vocab_file, compile_vocab_matcher)
 from mycroft.util import (camel_case_split,
                           resolve_resource_file,
                           play_audio_file)
@@ -136,14 +136,18 @@ def load_skill(skill_descriptor, bus, skill_id, BLACKLISTED_SKILLS=None):
             skill.settings.allow_overwrite = True
             skill.settings.load_skill_settings_from_file()
             skill.bind(bus)
+            # Send the intents registered while loading as a single batch
+            skill._start_registration_batch()
             try:
                 skill.load_data_files(path)
                 # Set up intent handlers
                 skill._register_decorated()
                 skill.register_resting_screen()
                 skill.initialize()
+                skill._end_registration_batch()
             except Exception as e:
                 # If an exception occurs, make sure to clean up the skill
+                skill._end_registration_batch(send=False)
                 skill.default_shutdown()
                 raise e
 
@@ -489,6 +493,8 @@ class MycroftSkill:
         self.scheduled_repeats = []
         self.skill_id = ''  # will be set from the path, so guaranteed unique
         self.voc_match_cache = {}
+        # Registration messages collected while loading, see load_skill()
+        self._pending_registrations = None
 
     @property
     def enclosure(self):
@@ -750,8 +756,9 @@ class MycroftSkill:
         way around to allow the user to say things like "yes, please" and
         still match against "Yes.voc" containing only "yes". The method first
         checks in the current skill's .voc files and secondly the "res/text"
-        folder of mycroft-core. The result is cached to avoid hitting the
-        disk each time the method is called.
+        folder of mycroft-core. The vocabulary is compiled into a single
+        regex and cached to avoid hitting the disk each time the method is
+        called.
 
         Args:
             utt (str): Utterance to be tested
@@ -762,6 +769,23 @@ class MycroftSkill:
         Returns:
             bool: True if the utterance has the given vocabulary it
         """
+        return self.voc_search(utt, voc_filename, lang) is not None
+
+    def voc_search(self, utt, voc_filename, lang=None):
+        """ Find the first vocabulary entry in the utterance.
+
+        Works like voc_match() but reports what matched. When several
+        entries match at the same position the longest one is returned.
+
+        Args:
+            utt (str): Utterance to be searched
+            voc_filename (str): Name of vocabulary file (e.g. 'yes' for
+                                'res/text/en-us/yes.voc')
+            lang (str): Language code, defaults to self.long
+
+        Returns:
+            tuple: (entry, (start, end)) of the match or None
+        """
         lang = lang or self.lang
         cache_key = lang + voc_filename
         if cache_key not in self.voc_match_cache:
@@ -776,13 +800,14 @@ class MycroftSkill:
                         'Could not find {}.voc file'.format(voc_filename))
             # load vocab and flatten into a simple list
             vocab = list(chain(*read_vocab_file(voc)))
-            self.voc_match_cache[cache_key] = vocab
-        if utt:
-            # Check for matches against complete words
-            return any([re.match(r'.*\b' + i + r'\b.*', utt)
-                        for i in self.voc_match_cache[cache_key]])
+            self.voc_match_cache[cache_key] = compile_vocab_matcher(vocab)
+
+        matcher = self.voc_match_cache[cache_key]
+        match = matcher.search(utt) if utt and matcher else None
+        if match:
+            return match.group(), match.span()
         else:
-            return False
+            return None
 
     def report_metric(self, name, data):
         """ Report a skill metric to the Mycroft servers
@@ -849,6 +874,28 @@ class MycroftSkill:
                 self._handle_collect_resting()
                 return
 
+    def _start_registration_batch(self):
+        """ Collect registration messages instead of sending them. """
+        self._pending_registrations = []
+
+    def _end_registration_batch(self, send=True):
+        """ Stop collecting and send the collected registrations.
+
+        Args:
+            send (bool): False to discard the registrations
+        """
+        messages = self._pending_registrations
+        self._pending_registrations = None
+        if send and messages:
+            self.bus.emit(Message.batch(messages))
+
+    def _emit_registration(self, message):
+        """ Send a registration message, or add it to the current batch. """
+        if self._pending_registrations is not None:
+            self._pending_registrations.append(message)
+        else:
+            self.bus.emit(message)
+
     def _register_decorated(self):
         """ Register all intent handlers that are decorated with an intent.
 
@@ -1117,7 +1164,8 @@ class MycroftSkill:
         # Default to the handler's function name if none given
         name = intent_parser.name or handler.__name__
         munge_intent_parser(intent_parser, name, self.skill_id)
-        self.bus.emit(Message("register_intent", intent_parser.__dict__))
+        self._emit_registration(Message("register_intent",
+                                        intent_parser.__dict__))
         self.registered_intents.append((name, intent_parser))
         self.add_event(intent_parser.name, handler, 'mycroft.skill.handler')
 
@@ -1160,7 +1208,7 @@ class MycroftSkill:
             "file_name": filename,
             "name": name
         }
-        self.bus.emit(Message("padatious:register_intent", data))
+        self._emit_registration(Message("padatious:register_intent", data))
         self.registered_intents.append((intent_file, data))
         self.add_event(name, handler, 'mycroft.skill.handler')
 
@@ -1191,7 +1239,7 @@ class MycroftSkill:
                 )
         name = str(self.skill_id) + ':' + entity_file
 
-        self.bus.emit(Message("padatious:register_entity", {
+        self._emit_registration(Message("padatious:register_entity", {
             "file_name": filename,
             "name": name
         }))
@@ -1228,6 +1276,10 @@ class MycroftSkill:
         if intent_name in names:
             LOG.debug('Disabling intent ' + intent_name)
             name = str(self.skill_id) + ':' + intent_name
+            # Registrations still being batched must arrive before the detach
+            if self._pending_registrations:
+                self._end_registration_batch()
+                self._start_registration_batch()
             self.bus.emit(Message("detach_intent", {"intent_name": name}))
             return True
 
@@ -1337,7 +1389,7 @@ class MycroftSkill:
                 entity:         word to register
                 entity_type:    Intent handler entity to tie the word to
         """
-        self.bus.emit(Message('register_vocab', {
+        self._emit_registration(Message('register_vocab', {
             'start': entity, 'end': to_alnum(self.skill_id) + entity_type
         }))
 
@@ -1348,7 +1400,7 @@ class MycroftSkill:
         """
         regex = munge_regex(regex_str, self.skill_id)
         re.compile(regex)  # validate regex
-        self.bus.emit(Message('register_vocab', {'regex': regex}))
+        self._emit_registration(Message('register_vocab', {'regex': regex}))
 
     def speak(self, utterance, expect_response=False, wait=False):
         """ Speak a sentence.
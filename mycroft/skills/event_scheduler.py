@@ -13,10 +13,13 @@
 # limitations under the License.
 #
 import json
+import os
 import time
-from threading import Thread, Lock
+from heapq import heappush, heappop, heapify
+from itertools import count
+from threading import Thread, Condition
 
-from os.path import isfile, join, expanduser
+from os.path import dirname, isfile, join, expanduser, splitext
 
 from mycroft.configuration import Configuration
 from mycroft.messagebus.message import Message
@@ -40,27 +43,54 @@ def repeat_time(sched_time, repeat):
     return next_time
 
 
+# Number of journal records after which the schedule file is rewritten
+COMPACT_THRESHOLD = 1000
+
+# Longest time to sleep between checks, limits how late events fire if the
+# system clock jumps forward
+MAX_WAIT = 60
+
+
 class EventScheduler(Thread):
     def __init__(self, bus, schedule_file='schedule.json'):
         """
             Create an event scheduler thread. Will send messages at a
             predetermined time to the registered targets.
 
+            Pending events are kept in a heap ordered by time, the thread
+            sleeps until the first one is due or the schedule changes.
+
+            Changes to non-repeating events are appended to a journal next
+            to the schedule file as they happen, so they survive a crash.
+            The journal is merged into the schedule file on startup,
+            shutdown and when it has grown large.
+
             Args:
                 bus:            Mycroft messagebus (mycroft.messagebus)
-                schedule_file:  File to store pending events to on shutdown
+                schedule_file:  File to store pending events to
         """
         super(EventScheduler, self).__init__()
         data_dir = expanduser(Configuration.get()['data_dir'])
 
-        self.events = {}
-        self.event_lock = Lock()
+        # Heap of [time, sequence, event, repeat, data] entries. Removed
+        # entries stay in the heap with event set to None until popped.
+        self.queue = []
+        self.removed = 0
+        # Scheduled entries per event name, in the order they were added
+        self.entries = {}
+        self.sequence = count()
+        self.event_lock = Condition()
 
         self.bus = bus
         self.isRunning = True
         self.schedule_file = join(data_dir, schedule_file)
+        self.journal_file = splitext(self.schedule_file)[0] + '.journal'
+        self.journal = None
+        self.journal_records = 0
         if self.schedule_file:
             self.load()
+            # Start over with an empty journal
+            self.store()
 
         self.bus.on('mycroft.scheduler.schedule_event',
                     self.schedule_event_handler)
@@ -72,63 +102,142 @@ class EventScheduler(Thread):
                     self.get_event_handler)
         self.start()
 
+    @property
+    def events(self):
+        """ Pending events as a dict of lists of (time, repeat, data). """
+        with self.event_lock:
+            return {event: self._event_list(event) for event in self.entries}
+
+    def _event_list(self, event):
+        return [(t, r, d) for t, _, _, r, d in self.entries.get(event, [])]
+
     def load(self):
         """
-            Load json data with active events from json file.
+            Load json data with active events from json file and apply
+            the changes recorded in the journal.
         """
+        json_data = {}
         if isfile(self.schedule_file):
-            json_data = {}
             with open(self.schedule_file) as f:
                 try:
                     json_data = json.load(f)
                 except Exception as e:
                     LOG.error(e)
-            current_time = time.time()
-            with self.event_lock:
-                for key in json_data:
-                    event_list = json_data[key]
-                    # discard non repeating events that has already happened
-                    self.events[key] = [tuple(e) for e in event_list
-                                        if e[0] > current_time or e[1]]
+        if isfile(self.journal_file):
+            with open(self.journal_file) as f:
+                for line in f:
+                    try:
+                        self._replay(json_data, json.loads(line))
+                    except Exception:
+                        # Most likely a partial record written at power loss
+                        LOG.warning('Skipping bad schedule journal record')
+        current_time = time.time()
+        with self.event_lock:
+            for key in json_data:
+                for sched_time, repeat, data in json_data[key]:
+                    # discard non repeating events that already happened
+                    if sched_time > current_time or repeat:
+                        self._push(key, sched_time, repeat, data)
+
+    @staticmethod
+    def _replay(json_data, record):
+        """ Apply a journal record to loaded schedule data. """
+        event = record['event']
+        if record['op'] == 'schedule':
+            json_data.setdefault(event, []).append(
+                [record['time'], None, record['data']])
+        elif record['op'] == 'remove':
+            json_data.pop(event, None)
+        elif record['op'] == 'update':
+            for entry in json_data.get(event, []):
+                if entry[0] == record['time']:
+                    entry[2] = record['data']
+                    break
+
+    def _record(self, op, event, **kwargs):
+        """ Append a schedule change to the journal.
+
+        event_lock must be held to keep records in order.
+        """
+        if not self.journal:
+            return
+        record = dict(op=op, event=event, **kwargs)
+        try:
+            self.journal.write(json.dumps(record) + '\n')
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+        except Exception as e:
+            LOG.error('Could not write schedule journal: ' + repr(e))
+        self.journal_records += 1
+        if self.journal_records >= COMPACT_THRESHOLD:
+            self.store()
+
+    def _push(self, event, sched_time, repeat, data):
+        """ Add an entry to the heap, event_lock must be held. """
+        entry = [sched_time, next(self.sequence), event, repeat, data]
+        heappush(self.queue, entry)
+        self.entries.setdefault(event, []).append(entry)
+        if self.queue[0] is entry:
+            # Now the first event, wake up the thread to reschedule
+            self.event_lock.notify()
+
+    def _discard(self, entry):
+        """ Mark a heap entry as removed, event_lock must be held. """
+        entry[2] = None
+        self.removed += 1
+        if self.removed > len(self.queue) // 2:
+            # Mostly removed entries, rebuild the heap without them
+            self.queue = [e for e in self.queue if e[2] is not None]
+            heapify(self.queue)
+            self.removed = 0
+
+    def _time_to_next(self):
+        """ Seconds until the first event is due, event_lock must be held. """
+        while self.queue and self.queue[0][2] is None:
+            heappop(self.queue)
+            self.removed -= 1
+        if not self.queue:
+            return MAX_WAIT
+        return min(max(self.queue[0][0] - time.time(), 0), MAX_WAIT)
 
     def run(self):
         while self.isRunning:
             self.check_state()
-            time.sleep(0.5)
+            with self.event_lock:
+                if self.isRunning:
+                    self.event_lock.wait(self._time_to_next())
 
     def check_state(self):
         """
             Check if an event should be triggered.
         """
+        pending_messages = []
         with self.event_lock:
-            # Check all events
-            pending_messages = []
-            for event in self.events:
-                current_time = time.time()
-                e = self.events[event]
-                # Get scheduled times that has passed
-                passed = [(t, r, d) for (t, r, d) in e if t <= current_time]
-                # and remaining times that we're still waiting for
-                remaining = [(t, r, d) for t, r, d in e if t > current_time]
+            current_time = time.time()
+            while self.queue and self.queue[0][0] <= current_time:
+                entry = heappop(self.queue)
+                sched_time, _, event, repeat, data = entry
+                if event is None:
+                    self.removed -= 1
+                    continue
+                event_list = self.entries[event]
+                event_list.remove(entry)
                 # Trigger registered methods
-                for sched_time, repeat, data in passed:
-                    pending_messages.append(Message(event, data))
-                    # if this is a repeated event add a new trigger time
-                    if repeat:
-                        next_time = repeat_time(sched_time, repeat)
-                        remaining.append((next_time, repeat, data))
-                # update list of events
-                self.events[event] = remaining
-
-        # Remove events have are now completed
-        self.clear_empty()
+                pending_messages.append(Message(event, data))
+                # if this is a repeated event add a new trigger time
+                if repeat:
+                    next_time = repeat_time(sched_time, repeat)
+                    self._push(event, next_time, repeat, data)
+                elif not event_list:
+                    # Remove events that are now completed
+                    del self.entries[event]
 
         # Finally, emit the queued up events that triggered
         for msg in pending_messages:
             self.bus.emit(msg)
 
     def schedule_event(self, event, sched_time, repeat=None, data=None):
-        """ Add event to pending event schedule using thread safe queue.
+        """ Add event to pending event schedule.
 
         Args:
             event (str): Handler for the event
@@ -138,17 +247,16 @@ class EventScheduler(Thread):
         """
         data = data or {}
         with self.event_lock:
-            # get current list of scheduled times for event, [] if missing
-            event_list = self.events.get(event, [])
-
             # Don't schedule if the event is repeating and already scheduled
-            if repeat and event in self.events:
+            if repeat and event in self.entries:
                 LOG.debug('Repeating event {} is already scheduled, discarding'
                           .format(event))
             else:
                 # add received event and time
-                event_list.append((sched_time, repeat, data))
-                self.events[event] = event_list
+                self._push(event, sched_time, repeat, data)
+                if not repeat:
+                    self._record('schedule', event, time=sched_time,
+                                 data=data)
 
     def schedule_event_handler(self, message):
         """
@@ -175,8 +283,10 @@ class EventScheduler(Thread):
 
     def remove_event(self, event):
         with self.event_lock:
-            if event in self.events:
-                self.events.pop(event)
+            if event in self.entries:
+                for entry in self.entries.pop(event):
+                    self._discard(entry)
+                self._record('remove', event)
 
     def remove_event_handler(self, message):
         """ Messagebus interface to the remove_event method. """
@@ -186,9 +296,12 @@ class EventScheduler(Thread):
     def update_event(self, event, data):
         with self.event_lock:
             # if there is an active event with this name
-            if len(self.events.get(event, [])) > 0:
-                time, repeat, _ = self.events[event][0]
-                self.events[event][0] = (time, repeat, data)
+            if len(self.entries.get(event, [])) > 0:
+                entry = self.entries[event][0]
+                entry[4] = data
+                # Repeating events aren't stored
+                if not entry[3]:
+                    self._record('update', event, time=entry[0], data=data)
 
     def update_event_handler(self, message):
         """ Messagebus interface to the update_event method. """
@@ -204,38 +317,65 @@ class EventScheduler(Thread):
         event_name = message.data.get("name")
         event = None
         with self.event_lock:
-            if event_name in self.events:
-                event = self.events[event_name]
+            if event_name in self.entries:
+                event = self._event_list(event_name)
         emitter_name = 'mycroft.event_status.callback.{}'.format(event_name)
         self.bus.emit(message.reply(emitter_name, data=event))
 
     def store(self):
         """
-            Write current schedule to disk.
+            Write pending non-repeating events to disk and clear the
+            journal.
         """
         with self.event_lock:
-            with open(self.schedule_file, 'w') as f:
-                json.dump(self.events, f)
+            events = {}
+            for event in self.entries:
+                event_list = [e for e in self._event_list(event) if not e[1]]
+                if event_list:
+                    events[event] = event_list
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+            try:
+                # The data dir may not have been created yet on first boot
+                os.makedirs(dirname(self.schedule_file), exist_ok=True)
+                # Replace the file atomically to never end up with a
+                # partial one
+                tmp_file = self.schedule_file + '.tmp'
+                with open(tmp_file, 'w') as f:
+                    json.dump(events, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.schedule_file)
+                self.journal = open(self.journal_file, 'w')
+            except OSError as e:
+                # Changes aren't journaled until the next successful store
+                LOG.error('Could not store schedule: ' + repr(e))
+            self.journal_records = 0
 
     def clear_repeating(self):
         """
             Remove repeating events from events dict.
         """
         with self.event_lock:
-            for e in self.events:
-                self.events[e] = [i for i in self.events[e] if i[1] is None]
+            for e in self.entries:
+                for entry in [i for i in self.entries[e] if i[3]]:
+                    self.entries[e].remove(entry)
+                    self._discard(entry)
 
     def clear_empty(self):
         """
             Remove empty event entries from events dict
         """
         with self.event_lock:
-            self.events = {k: self.events[k] for k in self.events
-                           if self.events[k] != []}
+            self.entries = {k: self.entries[k] for k in self.entries
+                            if self.entries[k] != []}
 
     def shutdown(self):
         """ Stop the running thread. """
-        self.isRunning = False
+        with self.event_lock:
+            self.isRunning = False
+            self.event_lock.notify()
         # Remove listeners
         self.bus.remove_all_listeners('mycroft.scheduler.schedule_event')
         self.bus.remove_all_listeners('mycroft.scheduler.remove_event')
@@ -247,3 +387,5 @@ class EventScheduler(Thread):
         self.clear_empty()
         # Store all pending scheduled events
         self.store()
+        self.journal.close()
+        self.journal = None
@@ -13,12 +13,16 @@
 # limitations under the License.
 #
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from threading import Condition, Lock
+from uuid import uuid4
 from adapt.context import ContextManagerFrame
 from adapt.engine import IntentDeterminationEngine
 from adapt.intent import IntentBuilder
 
 from mycroft.configuration import Configuration
-from mycroft.messagebus.message import Message
+from mycroft.messagebus.message import Message, batch_event
 from mycroft.skills.core import open_intent_envelope
 from mycroft.util.lang import set_active_lang
 from mycroft.util.log import LOG
@@ -27,6 +31,10 @@ from mycroft.metrics import report_timing, Stopwatch
 from mycroft.skills.padatious_service import PadatiousService
 
 
+# Padatious confidence overriding any Adapt match
+PADATIOUS_CERTAIN = 0.95
+
+
 class AdaptIntent(IntentBuilder):
     def __init__(self, name=''):
         super().__init__(name)
@@ -51,18 +59,60 @@ class ContextManager:
     ContextManager
     Use to track context throughout the course of a conversational session.
     How to manage a session's lifecycle is not captured here.
+
+    Frames are kept oldest first together with the time they were added,
+    expired frames are dropped from the front when context is requested.
+    Frames are also indexed by the keywords of their entities so a keyword
+    can be removed without going through all frames.
+
+    Utterances are handled concurrently so all access to the frames, the
+    keyword index and the cached context is done holding the lock.
     """
 
     def __init__(self, timeout):
-        self.frame_stack = []
         self.timeout = timeout * 60  # minutes to seconds
+        self.lock = Lock()
+        self.clear_context()
+
+    @property
+    def frame_stack(self):
+        """ List of (frame, time added) tuples, newest first. """
+        with self.lock:
+            return self._frame_stack()
+
+    def _frame_stack(self):
+        return [(f, t) for (f, t) in reversed(self.frames) if f.entities]
 
     def clear_context(self):
-        self.frame_stack = []
+        with self.lock:
+            self.frames = deque()
+            self.keyword_frames = {}
+            self.context = None  # Result of get_context() until next change
+
+    def _purge_expired(self):
+        expired = time.monotonic() - self.timeout
+        while self.frames and self.frames[0][1] <= expired:
+            frame, _ = self.frames.popleft()
+            for entity in frame.entities:
+                keyword = entity['data'][0][1]
+                frames = self.keyword_frames.get(keyword, set())
+                frames.discard(frame)
+                if not frames:
+                    self.keyword_frames.pop(keyword, None)
+            self.context = None
 
     def remove_context(self, context_id):
-        self.frame_stack = [(f, t) for (f, t) in self.frame_stack
-                            if context_id in f.entities[0].get('data', [])]
+        """ Remove all entities with the given keyword.
+
+        Args:
+            context_id (str): keyword of the entities to remove
+        """
+        with self.lock:
+            for frame in self.keyword_frames.pop(context_id, []):
+                # Frames left empty are skipped until they expire
+                frame.entities = [e for e in frame.entities
+                                  if e['data'][0][1] != context_id]
+                self.context = None
 
     def inject_context(self, entity, metadata=None):
         """
@@ -76,18 +126,24 @@ class ContextManager:
         """
         metadata = metadata or {}
         try:
-            if len(self.frame_stack) > 0:
-                top_frame = self.frame_stack[0]
+            keyword = entity['data'][0][1]
+        except (IndexError, KeyError):
+            return
+        with self.lock:
+            while self.frames and not self.frames[-1][0].entities:
+                self.frames.pop()
+            if len(self.frames) > 0:
+                top_frame = self.frames[-1][0]
             else:
                 top_frame = None
-            if top_frame and top_frame[0].metadata_matches(metadata):
-                top_frame[0].merge_context(entity, metadata)
+            if top_frame and top_frame.metadata_matches(metadata):
+                top_frame.merge_context(entity, metadata)
             else:
-                frame = ContextManagerFrame(entities=[entity],
-                                            metadata=metadata.copy())
-                self.frame_stack.insert(0, (frame, time.time()))
-        except (IndexError, KeyError):
-            pass
+                top_frame = ContextManagerFrame(entities=[entity],
+                                                metadata=metadata.copy())
+                self.frames.append((top_frame, time.monotonic()))
+            self.keyword_frames.setdefault(keyword, set()).add(top_frame)
+            self.context = None
 
     def get_context(self, max_frames=None, missing_entities=None):
         """ Constructs a list of entities from the context.
@@ -100,30 +156,36 @@ class ContextManager:
         Returns:
             list: a list of entities
         """
-        missing_entities = missing_entities or []
+        with self.lock:
+            self._purge_expired()
+            if not max_frames and not missing_entities:
+                # Adapt requests the full context for every utterance
+                if self.context is None:
+                    self.context = self._build_context()
+                return [entity.copy() for entity in self.context]
+            return self._build_context(max_frames, missing_entities)
+
+    def _build_context(self, max_frames=None, missing_entities=None):
+        missing_entities = list(missing_entities or [])
+        relevant_frames = [f for (f, t) in self._frame_stack()]
+        if max_frames:
+            relevant_frames = relevant_frames[:max_frames]
 
-        relevant_frames = [frame[0] for frame in self.frame_stack if
-                           time.time() - frame[1] < self.timeout]
-        if not max_frames or max_frames > len(relevant_frames):
-            max_frames = len(relevant_frames)
-
-        missing_entities = list(missing_entities)
         context = []
         last = ''
         depth = 0
-        for i in range(max_frames):
-            frame_entities = [entity.copy() for entity in
-                              relevant_frames[i].entities]
+        for frame in relevant_frames:
+            frame_entities = [entity.copy() for entity in frame.entities]
             for entity in frame_entities:
                 entity['confidence'] = entity.get('confidence', 1.0) \
                     / (2.0 + depth)
             context += frame_entities
 
             # Update depth
-            if entity['origin'] != last or entity['origin'] == '':
+            origin = frame_entities[-1].get('origin', '')
+            if origin != last or origin == '':
                 depth += 1
-            last = entity['origin']
-            print(depth)
+            last = origin
 
         result = []
         if len(missing_entities) > 0:
@@ -140,14 +202,13 @@ class ContextManager:
 
         # Only use the latest instance of each keyword
         stripped = []
-        processed = []
+        processed = set()
         for f in result:
             keyword = f['data'][0][1]
             if keyword not in processed:
                 stripped.append(f)
-                processed.append(keyword)
-        result = stripped
-        return result
+                processed.add(keyword)
+        return stripped
 
 
 class IntentService:
@@ -163,9 +224,15 @@ class IntentService:
         self.context_timeout = self.config.get('timeout', 2)
         self.context_greedy = self.config.get('greedy', False)
         self.context_manager = ContextManager(self.context_timeout)
+        # Workers matching an utterance with Adapt and Padatious in parallel
+        self.matcher = ThreadPoolExecutor(max_workers=4)
         self.bus = bus
         self.bus.on('register_vocab', self.handle_register_vocab)
         self.bus.on('register_intent', self.handle_register_intent)
+        self.bus.on(batch_event('register_vocab'),
+                    self.handle_register_vocab_batch)
+        self.bus.on(batch_event('register_intent'),
+                    self.handle_register_intent_batch)
         self.bus.on('recognizer_loop:utterance', self.handle_utterance)
         self.bus.on('detach_intent', self.handle_detach_intent)
         self.bus.on('detach_skill', self.handle_detach_skill)
@@ -184,9 +251,10 @@ class IntentService:
         self.bus.on('active_skill_request', add_active_skill_handler)
         self.active_skills = []  # [skill_id , timestamp]
         self.converse_timeout = 5  # minutes to prune active_skills
-        self.waiting_for_converse = False
-        self.converse_result = False
-        self.converse_skill_id = ""
+        # Results of pending converse requests by request id
+        # (None while waiting)
+        self.converse_results = {}
+        self.converse_condition = Condition()
 
     def update_skill_name_dict(self, message):
         """
@@ -211,36 +279,79 @@ class IntentService:
         lang = message.data.get('lang', "en-us")
         set_active_lang(lang)
         for skill in self.active_skills:
-            self.do_converse(None, skill[0], lang)
+            self.bus.emit(Message("skill.converse.request", {
+                "skill_id": skill[0], "utterances": None, "lang": lang}))
 
     def do_converse(self, utterances, skill_id, lang):
-        self.waiting_for_converse = True
-        self.converse_result = False
-        self.converse_skill_id = skill_id
-        self.bus.emit(Message("skill.converse.request", {
-            "skill_id": skill_id, "utterances": utterances, "lang": lang}))
-        start_time = time.time()
-        t = 0
-        while self.waiting_for_converse and t < 5:
-            t = time.time() - start_time
-            time.sleep(0.1)
-        self.waiting_for_converse = False
-        self.converse_skill_id = ""
-        return self.converse_result
+        return self.converse_skills(utterances, [skill_id], lang) is not None
+
+    def converse_skills(self, utterances, skill_ids, lang, timeout=5):
+        """ Ask skills to converse, one at a time in priority order.
+
+        converse() may act on the utterance, so a skill is only asked once
+        all skills before it have declined.
+
+        Args:
+            utterances (list): utterances to handle
+            skill_ids (list): skills to ask, highest priority first
+            lang (str): language code of the utterances
+            timeout (float): seconds to wait for each skill's response
+
+        Returns:
+            str: id of the skill that handled the utterance, None if no skill
+                 handled it
+        """
+        for skill_id in skill_ids:
+            if self._converse_skill(utterances, skill_id, lang, timeout):
+                return skill_id
+        return None
+
+    def _converse_skill(self, utterances, skill_id, lang, timeout):
+        """ Ask a single skill to converse and wait for its response.
+
+        The request is tagged with an id in the message context so a late
+        response to an earlier request isn't taken as the answer.
+
+        Returns:
+            bool: True if the skill handled the utterance, False if it
+                  declined, failed or didn't respond in time
+        """
+        converse_id = str(uuid4())
+        with self.converse_condition:
+            self.converse_results[converse_id] = None
+        try:
+            self.bus.emit(Message("skill.converse.request", {
+                "skill_id": skill_id, "utterances": utterances,
+                "lang": lang}, {"converse_id": converse_id}))
+
+            deadline = time.monotonic() + timeout
+            with self.converse_condition:
+                while self.converse_results[converse_id] is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self.converse_condition.wait(remaining)
+                return self.converse_results[converse_id]
+        finally:
+            with self.converse_condition:
+                self.converse_results.pop(converse_id)
+
+    def _set_converse_result(self, message, result):
+        converse_id = message.context.get("converse_id")
+        with self.converse_condition:
+            if self.converse_results.get(converse_id, False) is None:
+                self.converse_results[converse_id] = result
+                self.converse_condition.notify_all()
 
     def handle_converse_error(self, message):
         skill_id = message.data["skill_id"]
         if message.data["error"] == "skill id does not exist":
             self.remove_active_skill(skill_id)
-        if skill_id == self.converse_skill_id:
-            self.converse_result = False
-            self.waiting_for_converse = False
+        self._set_converse_result(message, False)
 
     def handle_converse_response(self, message):
-        skill_id = message.data["skill_id"]
-        if skill_id == self.converse_skill_id:
-            self.converse_result = message.data.get("result", False)
-            self.waiting_for_converse = False
+        self._set_converse_result(message,
+                                  bool(message.data.get("result", False)))
 
     def remove_active_skill(self, skill_id):
         for skill in self.active_skills:
@@ -337,15 +448,8 @@ class IntentService:
 
                 if not converse:
                     # No conversation, use intent system to handle utterance
-                    intent = self._adapt_intent_match(utterances,
-                                                      norm_utterances, lang)
-                    for utt in combined:
-                        _intent = PadatiousService.instance.calc_intent(utt)
-                        if _intent:
-                            best = padatious_intent.conf if padatious_intent\
-                                        else 0.0
-                            if best < _intent.conf:
-                                padatious_intent = _intent
+                    intent, padatious_intent = self._match_intent(
+                        utterances, norm_utterances, combined, lang)
                     LOG.debug("Padatious intent: {}".format(padatious_intent))
                     LOG.debug("    Adapt intent: {}".format(intent))
 
@@ -357,7 +461,8 @@ class IntentService:
                               {'intent_type': 'converse'})
                 return
             elif (intent and intent.get('confidence', 0.0) > 0.0 and
-                    not (padatious_intent and padatious_intent.conf >= 0.95)):
+                    not (padatious_intent and
+                         padatious_intent.conf >= PADATIOUS_CERTAIN)):
                 # Send the message to the Adapt intent's handler unless
                 # Padatious is REALLY sure it was directed at it instead.
                 self.update_context(intent)
@@ -402,14 +507,64 @@ class IntentService:
                                   1] <= self.converse_timeout * 60]
 
         # check if any skill wants to handle utterance
-        for skill in self.active_skills:
-            if self.do_converse(utterances, skill[0], lang):
-                # update timestamp, or there will be a timeout where
-                # intent stops conversing whether its being used or not
-                self.add_active_skill(skill[0])
-                return True
+        skill_id = self.converse_skills(
+            utterances, [skill[0] for skill in self.active_skills], lang)
+        if skill_id:
+            # update timestamp, or there will be a timeout where
+            # intent stops conversing whether its being used or not
+            self.add_active_skill(skill_id)
+            return True
         return False
 
+    def _match_intent(self, raw_utt, norm_utt, combined, lang):
+        """ Run Adapt and Padatious concurrently on the utterances.
+
+        Matching stops as soon as the outcome is known: when Padatious is
+        certain enough to override Adapt, or when Adapt finds nothing and
+        the utterance goes to the fallbacks regardless of Padatious (which
+        does its own matching as a fallback). Unfinished matches are left
+        to complete in the background.
+
+        Args:
+            raw_utt (list):  list of utterances
+            norm_utt (list): same list of utterances, normalized
+            combined (list): raw and unique normalized utterances
+            lang (string):   language code, e.g "en-us"
+
+        Returns:
+            tuple: Adapt intent (or None), best Padatious match (or None)
+        """
+        adapt = self.matcher.submit(self._adapt_intent_match,
+                                    raw_utt, norm_utt, lang)
+        padatious = {
+            self.matcher.submit(PadatiousService.instance.calc_intent, utt): i
+            for i, utt in enumerate(combined)
+        }
+        pending = set(padatious) | {adapt}
+
+        intent = None
+        padatious_matches = {}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future is adapt:
+                    intent = future.result()
+                    if not (intent and intent.get('confidence', 0.0) > 0.0):
+                        pending = set()  # Fallbacks will handle it
+                elif future.result():
+                    padatious_matches[padatious[future]] = future.result()
+            if any(m.conf >= PADATIOUS_CERTAIN
+                   for m in padatious_matches.values()):
+                break
+
+        # Best match, the first utterance wins if equally good
+        padatious_intent = None
+        for i in sorted(padatious_matches):
+            best = padatious_intent.conf if padatious_intent else 0.0
+            if best < padatious_matches[i].conf:
+                padatious_intent = padatious_matches[i]
+        return intent, padatious_intent
+
     def _adapt_intent_match(self, raw_utt, norm_utt, lang):
         """ Run the Adapt engine to search for an matching intent
 
@@ -454,6 +609,11 @@ class IntentService:
         return best_intent
 
     def handle_register_vocab(self, message):
+        if message.context.get('batched'):
+            return  # Registered by handle_register_vocab_batch
+        self._register_vocab(message)
+
+    def _register_vocab(self, message):
         start_concept = message.data.get('start')
         end_concept = message.data.get('end')
         regex_str = message.data.get('regex')
@@ -465,9 +625,24 @@ class IntentService:
                 start_concept, end_concept, alias_of=alias_of)
 
     def handle_register_intent(self, message):
+        if message.context.get('batched'):
+            return  # Registered by handle_register_intent_batch
+        self._register_intent(message)
+
+    def _register_intent(self, message):
         intent = open_intent_envelope(message)
         self.engine.register_intent_parser(intent)
 
+    def handle_register_vocab_batch(self, messages):
+        """ Register a batch of vocabulary in one go. """
+        for message in messages:
+            self._register_vocab(message)
+
+    def handle_register_intent_batch(self, messages):
+        """ Register a batch of intent parsers in one go. """
+        for message in messages:
+            self._register_intent(message)
+
     def handle_detach_intent(self, message):
         intent_name = message.data.get('intent_name')
         new_parsers = [
@@ -12,16 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from functools import lru_cache
+import hashlib
+from collections import OrderedDict
+from copy import copy
 from subprocess import call
-from threading import Event
-from time import time as get_time, sleep
+from threading import Condition, Event, Lock, Thread
+from time import time as get_time
 
 from os.path import expanduser, isfile
 from pkg_resources import get_distribution
 
 from mycroft.configuration import Configuration
-from mycroft.messagebus.message import Message
+from mycroft.messagebus.message import Message, batch_event
 from mycroft.skills.core import FallbackSkill
 from mycroft.util.log import LOG
 
@@ -52,14 +54,21 @@ class PadatiousService(FallbackSkill):
                 pass
             return
 
+        self.container_class = IntentContainer
+        self.intent_cache = intent_cache
+        # Container used for matching, replaced when training completes
         self.container = IntentContainer(intent_cache)
 
         self._bus = bus
         self.bus.on('padatious:register_intent', self.register_intent)
         self.bus.on('padatious:register_entity', self.register_entity)
+        self.bus.on(batch_event('padatious:register_intent'),
+                    self.register_intent_batch)
+        self.bus.on(batch_event('padatious:register_entity'),
+                    self.register_entity_batch)
         self.bus.on('detach_intent', self.handle_detach_intent)
         self.bus.on('detach_skill', self.handle_detach_skill)
-        self.bus.on('mycroft.skills.initialized', self.train)
+        self.bus.on('mycroft.skills.initialized', self.handle_initialized)
 
         # Call Padatious an an early fallback, looking for a high match intent
         self.register_fallback(self.handle_fallback,
@@ -75,50 +84,146 @@ class PadatiousService(FallbackSkill):
         self.train_delay = self.padatious_config['train_delay']
         self.train_time = get_time() + self.train_delay
 
-        self.registered_intents = []
-
-    def train(self, message=None):
-        if message is None:
-            single_thread = False
-        else:
+        # Lines of the registered intents and entities by name
+        self.intent_lines = {}
+        self.entity_lines = {}
+        self.definitions_lock = Lock()
+        # Content hashes of the definitions in self.container
+        self.trained_hashes = None
+
+        # Match results by (utterance, generation of self.container)
+        self.match_cache = OrderedDict()
+        self.match_cache_size = self.padatious_config.get(
+            'match_cache_size', 256)
+        self.match_cache_lock = Lock()
+        self.generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Training is done by a background thread, train_time is pushed
+        # forward on every change to handle a burst of changes at once
+        self.train_condition = Condition()
+        self.train_requested = False
+        self.initialized = False
+        self.single_thread = False
+        self.train_lock = Lock()
+        self.trainer = Thread(target=self._train_loop, daemon=True)
+        self.trainer.start()
+
+    def handle_initialized(self, message):
+        """ Do the initial training once all skills are loaded. """
+        with self.train_condition:
+            self.single_thread = message.data.get('single_thread', False)
+            self.train_time = get_time()
+            self.train_requested = True
+            self.initialized = True
+            self.train_condition.notify()
+
+    def request_training(self):
+        """ Retrain after train_delay unless more changes arrive. """
+        with self.train_condition:
+            self.train_time = get_time() + self.train_delay
+            self.train_requested = True
+            self.train_condition.notify()
+
+    def _train_loop(self):
+        while True:
+            with self.train_condition:
+                # Nothing is trained before all skills have been loaded
+                while True:
+                    if self.train_requested and self.initialized:
+                        remaining = self.train_time - get_time()
+                        if remaining <= 0:
+                            break
+                        self.train_condition.wait(remaining)
+                    else:
+                        self.train_condition.wait()
+                self.train_requested = False
+            try:
+                self.train(single_thread=self.single_thread)
+            except Exception:
+                LOG.exception('Padatious training failed')
+
+    @staticmethod
+    def _hash_lines(lines):
+        return hashlib.md5('\n'.join(lines).encode('utf-8')).hexdigest()
+
+    def train(self, message=None, single_thread=False):
+        """ Train a new container and replace the current one with it.
+
+        Only intents and entities that changed since they were last trained
+        are retrained, the rest are loaded from the intent cache. Matching
+        continues using the current container while training.
+        """
+        if message is not None:
             single_thread = message.data.get('single_thread', False)
-        self.finished_training_event.clear()
 
-        LOG.info('Training... (single_thread={})'.format(single_thread))
-        self.container.train(single_thread=single_thread)
-        LOG.info('Training complete.')
+        with self.train_lock:
+            with self.definitions_lock:
+                intents = dict(self.intent_lines)
+                entities = dict(self.entity_lines)
+            hashes = {
+                'intents': {n: self._hash_lines(l)
+                            for n, l in intents.items()},
+                'entities': {n: self._hash_lines(l)
+                             for n, l in entities.items()}
+            }
+            if hashes != self.trained_hashes:
+                trained = self.trained_hashes or {'intents': {},
+                                                  'entities': {}}
+                changed = [n for n, h in hashes['intents'].items()
+                           if trained['intents'].get(n) != h]
+                self.bus.emit(Message('padatious:training_started', {
+                    'intents': len(intents),
+                    'changed': changed
+                }))
+                LOG.info('Training... (single_thread={}, {} of {} intents '
+                         'changed)'.format(single_thread, len(changed),
+                                           len(intents)))
+                start = get_time()
+                container = self.container_class(self.intent_cache)
+                for name, lines in entities.items():
+                    container.add_entity(name, lines)
+                for name, lines in intents.items():
+                    container.add_intent(name, lines)
+                container.train(single_thread=single_thread)
+                with self.match_cache_lock:
+                    self.container = container
+                    self.generation += 1
+                    self.match_cache.clear()
+                self.trained_hashes = hashes
+                LOG.info('Training complete.')
+                self.bus.emit(Message('padatious:training_complete', {
+                    'intents': len(intents),
+                    'changed': changed,
+                    'duration': get_time() - start
+                }))
 
-        self.finished_training_event.set()
         if not self.finished_initial_train:
             LOG.info("Mycroft is all loaded and ready to roll!")
             self.bus.emit(Message('mycroft.ready'))
             self.finished_initial_train = True
-
-    def wait_and_train(self):
-        if not self.finished_initial_train:
-            return
-        sleep(self.train_delay)
-        if self.train_time < 0.0:
-            return
-
-        if self.train_time <= get_time() + 0.01:
-            self.train_time = -1.0
-            self.train()
+        # Set last, waiters may rely on mycroft.ready having been sent
+        self.finished_training_event.set()
 
     def __detach_intent(self, intent_name):
-        self.registered_intents.remove(intent_name)
-        self.container.remove_intent(intent_name)
+        with self.definitions_lock:
+            self.intent_lines.pop(intent_name, None)
 
     def handle_detach_intent(self, message):
         self.__detach_intent(message.data.get('intent_name'))
+        self.request_training()
 
     def handle_detach_skill(self, message):
         skill_id = message.data['skill_id']
-        remove_list = [i for i in self.registered_intents if skill_id in i]
+        with self.definitions_lock:
+            remove_list = [i for i in self.intent_lines if skill_id in i]
         for i in remove_list:
             self.__detach_intent(i)
+        if remove_list:
+            self.request_training()
 
-    def _register_object(self, message, object_name, register_func):
+    def _load_object(self, message, object_name, definitions):
         file_name = message.data['file_name']
         name = message.data['name']
 
@@ -126,18 +231,40 @@ class PadatiousService(FallbackSkill):
 
         if not isfile(file_name):
             LOG.warning('Could not find file ' + file_name)
-            return
+            return False
 
-        register_func(name, file_name)
-        self.train_time = get_time() + self.train_delay
-        self.wait_and_train()
+        with open(file_name) as f:
+            lines = f.read().split('\n')
+        with self.definitions_lock:
+            if definitions.get(name) == lines:
+                return False  # Already registered
+            definitions[name] = lines
+        return True
+
+    def _register_object(self, message, object_name, definitions):
+        if message.context.get('batched'):
+            return  # Loaded by _register_batch
+        if self._load_object(message, object_name, definitions):
+            self.request_training()
+
+    def _register_batch(self, messages, object_name, definitions):
+        """ Load a batch of objects, retraining at most once. """
+        loaded = [self._load_object(m, object_name, definitions)
+                  for m in messages]
+        if any(loaded):
+            self.request_training()
 
     def register_intent(self, message):
-        self.registered_intents.append(message.data['name'])
-        self._register_object(message, 'intent', self.container.load_intent)
+        self._register_object(message, 'intent', self.intent_lines)
 
     def register_entity(self, message):
-        self._register_object(message, 'entity', self.container.load_entity)
+        self._register_object(message, 'entity', self.entity_lines)
+
+    def register_intent_batch(self, messages):
+        self._register_batch(messages, 'intent', self.intent_lines)
+
+    def register_entity_batch(self, messages):
+        self._register_batch(messages, 'entity', self.entity_lines)
 
     def handle_fallback(self, message, threshold=0.8):
         if not self.finished_training_event.is_set():
@@ -166,8 +293,40 @@ class PadatiousService(FallbackSkill):
     def handle_fallback_last_chance(self, message):
         return self.handle_fallback(message, 0.5)
 
-    # NOTE: This cache will keep a reference to this calss (PadatiousService),
-    # but we can live with that since it is used as a singleton.
-    @lru_cache(maxsize=2)   # 2 catches both raw and normalized utts in cache
     def calc_intent(self, utt):
-        return self.container.calc_intent(utt)
+        """ Match an utterance, reusing earlier results of the same model.
+
+        Returns:
+            MatchData: best match, a copy that can be modified freely
+        """
+        with self.match_cache_lock:
+            container = self.container
+            key = (utt, self.generation)
+            if key in self.match_cache:
+                self.match_cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._copy_match(self.match_cache[key])
+            self.cache_misses += 1
+
+        intent = container.calc_intent(utt)
+        with self.match_cache_lock:
+            # Skip caching if a new model was swapped in while matching
+            if key[1] == self.generation:
+                self.match_cache[key] = intent
+                if len(self.match_cache) > self.match_cache_size:
+                    self.match_cache.popitem(last=False)
+        return self._copy_match(intent)
+
+    @staticmethod
+    def _copy_match(intent):
+        if intent is None:
+            return None
+        intent = copy(intent)
+        intent.matches = dict(intent.matches)
+        return intent
+
+    def get_cache_stats(self):
+        """ Get hit and miss counts of the match cache. """
+        with self.match_cache_lock:
+            return {'hits': self.cache_hits, 'misses': self.cache_misses,
+                    'size': len(self.match_cache)}
@@ -47,76 +47,139 @@ def read_vocab_file(path):
     return vocab
 
 
-def load_vocab_from_file(path, vocab_type, bus):
-    """Load Mycroft vocabulary from file
-    The vocab is sent to the intent handler using the message bus
+def compile_vocab_matcher(vocab):
+    """ Compile a regex matching any of the vocabulary entries.
+
+        Entries only match complete words, i.e. not preceded or followed by
+        a word character, so entries like "c++" or "a.m." match as well.
+        Longer entries are tried first so the match covers as much of the
+        utterance as possible.
+
+        Arguments:
+            vocab (list): vocabulary entries (strings)
+
+        Returns:
+            compiled regex or None if there are no entries
+    """
+    entries = sorted(set(e for e in vocab if e), key=len, reverse=True)
+    if not entries:
+        return None
+    return re.compile(r'(?<!\w)(?:' +
+                      '|'.join(re.escape(e) for e in entries) + r')(?!\w)')
+
+
+def read_vocab_messages(path, vocab_type):
+    """Read the register_vocab messages for a vocabulary file.
 
     Args:
         path:           path to vocabulary file (*.voc)
         vocab_type:     keyword name
-        bus:            Mycroft messagebus connection
-        skill_id(str):  skill id
+
+    Returns:
+        list of Messages
     """
+    messages = []
     if path.endswith('.voc'):
         for parts in read_vocab_file(path):
             entity = parts[0]
-            bus.emit(Message("register_vocab", {
+            messages.append(Message("register_vocab", {
                 'start': entity, 'end': vocab_type
             }))
             for alias in parts[1:]:
-                bus.emit(Message("register_vocab", {
+                messages.append(Message("register_vocab", {
                     'start': alias, 'end': vocab_type, 'alias_of': entity
                 }))
+    return messages
 
 
-def load_regex_from_file(path, bus, skill_id):
-    """Load regex from file
-    The regex is sent to the intent handler using the message bus
+def read_regex_messages(path, skill_id):
+    """Read the register_vocab messages for a regex file.
 
     Args:
-        path:       path to vocabulary file (*.voc)
-        bus:        Mycroft messagebus connection
+        path:       path to regex file (*.rx)
+        skill_id:   skill identifier
+
+    Returns:
+        list of Messages
     """
+    messages = []
     if path.endswith('.rx'):
         with open(path, 'r', encoding='utf8') as reg_file:
             for line in reg_file.readlines():
                 if line.startswith("#"):
                     continue
                 re.compile(munge_regex(line.strip(), skill_id))
-                bus.emit(
+                messages.append(
                     Message("register_vocab",
                             {'regex': munge_regex(line.strip(), skill_id)}))
+    return messages
+
+
+def load_vocab_from_file(path, vocab_type, bus):
+    """Load Mycroft vocabulary from file
+    The vocab is sent to the intent handler using the message bus
+
+    Args:
+        path:           path to vocabulary file (*.voc)
+        vocab_type:     keyword name
+        bus:            Mycroft messagebus connection
+        skill_id(str):  skill id
+    """
+    for message in read_vocab_messages(path, vocab_type):
+        bus.emit(message)
+
+
+def load_regex_from_file(path, bus, skill_id):
+    """Load regex from file
+    The regex is sent to the intent handler using the message bus
+
+    Args:
+        path:       path to vocabulary file (*.voc)
+        bus:        Mycroft messagebus connection
+    """
+    for message in read_regex_messages(path, skill_id):
+        bus.emit(message)
 
 
 def load_vocabulary(basedir, bus, skill_id):
     """Load vocabulary from all files in the specified directory.
 
+    The vocabulary is sent to the intent service as a single batch message.
+
     Args:
         basedir (str): path of directory to load from (will recurse)
         bus (messagebus emitter): messagebus instance used to send the vocab to
                                   the intent service
         skill_id: skill the data belongs to
     """
+    messages = []
     for path, _, files in walk(basedir):
         for f in files:
             if f.endswith(".voc"):
                 vocab_type = to_alnum(skill_id) + splitext(f)[0]
-                load_vocab_from_file(join(path, f), vocab_type, bus)
+                messages += read_vocab_messages(join(path, f), vocab_type)
+    if messages:
+        bus.emit(Message.batch(messages))
 
 
 def load_regex(basedir, bus, skill_id):
     """Load regex from all files in the specified directory.
 
+    The regexes are sent to the intent service as a single batch message.
+
     Args:
         basedir (str): path of directory to load from
         bus (messagebus emitter): messagebus instance used to send the vocab to
                                   the intent service
         skill_id (str): skill identifier
     """
+    messages = []
     for path, _, files in walk(basedir):
         for f in files:
             if f.endswith(".rx"):
-                load_regex_from_file(join(path, f), bus, skill_id)
+                messages += read_regex_messages(join(path, f), skill_id)
+    if messages:
+        bus.emit(Message.batch(messages))
 
 
 def to_alnum(skill_id):
@@ -16,6 +16,7 @@ import gc
 import json
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 from itertools import chain
 
@@ -24,6 +25,10 @@ from os.path import exists, join, basename, dirname, expanduser, isfile
 from threading import Thread, Event, Lock
 
 from msm import MycroftSkillsManager, SkillRepo, MsmException
+try:
+    from inotify_simple import INotify, flags
+except (ImportError, OSError):
+    INotify = None
 from mycroft import dialog
 from mycroft.enclosure.api import EnclosureAPI
 from mycroft.configuration import Configuration
@@ -39,11 +44,16 @@ DEBUG = Configuration.get().get("debug", False)
 skills_config = Configuration.get().get("skills")
 BLACKLISTED_SKILLS = skills_config.get("blacklisted_skills", [])
 PRIORITY_SKILLS = skills_config.get("priority_skills", [])
+# Number of skills loaded concurrently
+LOADER_THREADS = skills_config.get("loader_threads", 4)
 
 installer_config = Configuration.get().get("SkillInstallerSkill")
 
 MINUTES = 60  # number of seconds in a minute (syntatic sugar)
 
+# Longest time to wait for a burst of file changes to end
+MAX_DEBOUNCE = 5
+
 
 def ignored_file(f):
     """ Checks if the file is valid file to require a reload. """
@@ -53,6 +63,11 @@ def ignored_file(f):
             f.endswith('.qmlc'))
 
 
+def ignored_dir(d):
+    """ Checks if changes in the directory can be ignored. """
+    return d.startswith('.') or d == '__pycache__'
+
+
 def _get_last_modified_date(path):
     """
         Get last modified date excluding compiled python files, hidden
@@ -74,6 +89,97 @@ def _get_last_modified_date(path):
     return max(os.path.getmtime(f) for f in all_files)
 
 
+class SkillWatcher:
+    """ Tracks which skill directories have changed using inotify.
+
+    Arguments:
+        skills_dir (str): directory containing the skills
+        debounce (float): seconds without changes before a burst of changes
+                          (ex. from a git pull) is considered complete
+    """
+    def __init__(self, skills_dir, debounce=0.5):
+        self.skills_dir = skills_dir.rstrip('/')
+        self.debounce = debounce
+        self.inotify = INotify()
+        self.mask = (flags.CREATE | flags.DELETE | flags.CLOSE_WRITE |
+                     flags.ATTRIB | flags.MOVED_FROM | flags.MOVED_TO)
+        self.watches = {}
+        self._watch_tree(self.skills_dir)
+
+    def _watch_tree(self, path):
+        for root_dir, dirs, _ in os.walk(path):
+            dirs[:] = [d for d in dirs if not ignored_dir(d)]
+            wd = self.inotify.add_watch(root_dir, self.mask)
+            self.watches[wd] = root_dir
+
+    def _skill_path(self, path):
+        """ Get the skill directory containing path. """
+        relative = path[len(self.skills_dir) + 1:]
+        if relative:
+            return join(self.skills_dir, relative.split('/')[0])
+        return None
+
+    def wait_for_changes(self, timeout):
+        """ Wait for files in the skills directory to change.
+
+        Arguments:
+            timeout (float): seconds to wait for the first change
+
+        Returns:
+            set: paths of changed skills, None if changes were missed and
+                 all skills need to be checked
+        """
+        changed = set()
+        missed = False
+        deadline = time.monotonic() + timeout + MAX_DEBOUNCE
+        events = self.inotify.read(timeout=int(timeout * 1000))
+        while events:
+            for event in events:
+                if event.mask & flags.Q_OVERFLOW:
+                    missed = True
+                if event.mask & flags.IGNORED:
+                    self.watches.pop(event.wd, None)
+                directory = self.watches.get(event.wd)
+                if directory is None or ignored_file(event.name):
+                    continue
+                path = join(directory, event.name)
+                if (event.mask & flags.ISDIR and
+                        event.mask & (flags.CREATE | flags.MOVED_TO) and
+                        not ignored_dir(event.name)):
+                    try:
+                        self._watch_tree(path)
+                    except OSError as e:
+                        LOG.warning('Could not watch {}: {}'.format(path,
+                                                                    repr(e)))
+                        missed = True
+                skill_path = self._skill_path(path)
+                if skill_path:
+                    changed.add(skill_path)
+            if time.monotonic() > deadline:
+                break
+            # Collect changes until the burst has ended
+            events = self.inotify.read(timeout=int(self.debounce * 1000))
+        return None if missed else changed
+
+    def close(self):
+        self.inotify.close()
+
+
+def create_skill_watcher(skills_dir):
+    """ Create a SkillWatcher or None if inotify can't be used. """
+    if not skills_config.get("watch_skills", True):
+        return None
+    if INotify is None:
+        LOG.info('inotify_simple not available, polling for skill changes')
+        return None
+    try:
+        return SkillWatcher(skills_dir)
+    except OSError as e:
+        LOG.warning('Could not watch skills, polling for skill changes '
+                    '({})'.format(repr(e)))
+        return None
+
+
 MSM_LOCK = None
 
 
@@ -90,6 +196,8 @@ class SkillManager(Thread):
         self._connected_event = Event()
 
         self.loaded_skills = {}
+        self.priority_paths = None
+        self.loader = ThreadPoolExecutor(max_workers=LOADER_THREADS)
         self.bus = bus
         self.enclosure = EnclosureAPI(bus)
 
@@ -339,17 +447,22 @@ class SkillManager(Thread):
 
         skill["loaded"] = True
         desc = create_skill_descriptor(skill_path)
+        start = time.monotonic()
         skill["instance"] = load_skill(desc,
                                        self.bus, skill["id"],
                                        BLACKLISTED_SKILLS)
+        skill["load_time"] = time.monotonic() - start
 
         skill["last_modified"] = modified
         if skill['instance'] is not None:
+            LOG.info('Loaded {} in {:.3f} seconds'.format(skill['id'],
+                                                          skill['load_time']))
             self.bus.emit(Message('mycroft.skills.loaded',
                                   {'path': skill_path,
                                    'id': skill['id'],
                                    'name': skill['instance'].name,
-                                   'modified': modified}))
+                                   'modified': modified,
+                                   'load_time': skill['load_time']}))
             return True
         else:
             self.bus.emit(Message('mycroft.skills.loading_failure',
@@ -357,8 +470,59 @@ class SkillManager(Thread):
                                    'id': skill['id']}))
         return False
 
+    def _try_load_or_reload_skill(self, skill_path):
+        try:
+            return self._load_or_reload_skill(skill_path)
+        except Exception as e:
+            LOG.error('(Re)loading of {} failed ({})'.format(
+                skill_path, repr(e)))
+            return False
+
+    def _load_skills(self, skill_paths):
+        """ Load or reload skills concurrently on the loader pool.
+
+        Priority skills are loaded before the rest.
+
+        Arguments:
+            skill_paths: list of skill directories
+
+        Returns:
+            bool: True if any skill was loaded or reloaded
+        """
+        priority_paths = self._get_priority_paths()
+        priority = [p for p in skill_paths
+                    if p.rstrip('/') in priority_paths]
+        others = [p for p in skill_paths if p not in priority]
+        loaded = False
+        for group in (priority, others):
+            results = self.loader.map(self._try_load_or_reload_skill, group)
+            loaded = any(list(results)) or loaded
+        return loaded
+
+    def _get_priority_paths(self):
+        """ Get the folders of the priority skills.
+
+        Priority skills are configured by their msm name (mycroft-pairing)
+        while the skill folders include the author (mycroft-pairing.mycroftai)
+        so the folders are looked up through msm. The result is cached.
+
+        Returns:
+            set: skill folders without trailing slash
+        """
+        if self.priority_paths is None:
+            try:
+                skills = {skill.name: skill for skill in self.msm.list()}
+            except Exception:
+                LOG.exception('Failed to look up the priority skills')
+                return set()
+            self.priority_paths = {skills[name].path.rstrip('/')
+                                   for name in PRIORITY_SKILLS
+                                   if name in skills}
+        return self.priority_paths
+
     def load_priority(self):
         skills = {skill.name: skill for skill in self.msm.list()}
+        paths = []
         for skill_name in PRIORITY_SKILLS:
             skill = skills.get(skill_name)
             if skill:
@@ -370,9 +534,10 @@ class SkillManager(Thread):
                                       '{} failed'.format(skill.name))
                         if not skill.is_local:
                             continue
-                self._load_or_reload_skill(skill.path)
+                paths.append(skill.path)
             else:
                 LOG.error('Priority skill {} can\'t be found')
+        list(self.loader.map(self._load_or_reload_skill, paths))
 
     def remove_git_locks(self):
         """If git gets killed from an abrupt shutdown it leaves lock files"""
@@ -392,6 +557,9 @@ class SkillManager(Thread):
 
         # Scan the file folder that contains Skills.  If a Skill is updated,
         # unload the existing version from memory and reload from the disk.
+        # Without a watcher all skills are checked for changes every pass.
+        watcher = create_skill_watcher(self.msm.skills_dir)
+        changed = None
         while not self._stop_event.is_set():
             # Update skills once an hour if update is enabled
             if time.time() >= self.next_download and update:
@@ -400,24 +568,33 @@ class SkillManager(Thread):
             # Look for recently changed skill(s) needing a reload
             # checking skills dir and getting all skills there
             skill_paths = glob(join(self.msm.skills_dir, '*/'))
-            still_loading = False
-            for skill_path in skill_paths:
-                try:
-                    still_loading = (
-                            self._load_or_reload_skill(skill_path) or
-                            still_loading
-                    )
-                except Exception as e:
-                    LOG.error('(Re)loading of {} failed ({})'.format(
-                        skill_path, repr(e)))
-            if not has_loaded and not still_loading and len(skill_paths) > 0:
+            if changed is not None:
+                # Only check changed skills and skills waiting to be loaded
+                skill_paths_to_load = [
+                    p for p in skill_paths if p.rstrip('/') in changed or
+                    not self.loaded_skills.get(p.rstrip('/'), {}).get('loaded')
+                ]
+            else:
+                skill_paths_to_load = skill_paths
+            start = time.monotonic()
+            self._load_skills(skill_paths_to_load)
+            if not has_loaded and len(skill_paths) > 0:
                 has_loaded = True
-                LOG.info("Skills all loaded!")
+                LOG.info("Skills all loaded in {:.3f} seconds!".format(
+                    time.monotonic() - start))
                 self.bus.emit(Message('mycroft.skills.initialized'))
 
             self._unload_removed(skill_paths)
-            # Pause briefly before beginning next scan
-            time.sleep(2)
+            if watcher:
+                # Wait for changes, or briefly to handle other requests
+                changed = watcher.wait_for_changes(2)
+            else:
+                # Pause briefly before beginning next scan
+                time.sleep(2)
+
+        if watcher:
+            watcher.close()
+        self.loader.shutdown(wait=False)
 
     def send_skill_list(self, message=None):
         """
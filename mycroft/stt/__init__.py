@@ -15,8 +15,9 @@
 import re
 import json
 from abc import ABCMeta, abstractmethod
+from collections import namedtuple
 from requests import post, put, exceptions
-from speech_recognition import Recognizer
+from speech_recognition import AudioData, Recognizer
 
 from mycroft.api import STTApi
 from mycroft.configuration import Configuration
@@ -81,6 +82,64 @@ class KeySTT(STT):
         self.key = str(self.credential.get("client_key"))
 
 
+# Transcription of the audio streamed so far, final is True for the
+# transcription of the complete phrase
+Hypothesis = namedtuple('Hypothesis', ['text', 'final'])
+
+
+class StreamingSTT(STT):
+    """ STT engine transcribing audio while it is being recorded. """
+
+    @abstractmethod
+    def stream(self, chunks, sample_rate, sample_width, language=None):
+        """ Transcribe a phrase as it is recorded.
+
+        Args:
+            chunks (iterable): raw audio chunks (bytes), the iteration ends
+                               when the phrase is complete
+            sample_rate (int): samples per second
+            sample_width (int): bytes per sample
+            language (str): language code, defaults to self.lang
+
+        Returns:
+            iterable of Hypothesis: partial hypotheses, ending with the
+                                    final one
+        """
+        pass
+
+    def execute(self, audio, language=None):
+        text = None
+        for hypothesis in self.stream([audio.frame_data], audio.sample_rate,
+                                      audio.sample_width, language):
+            if hypothesis.final:
+                text = hypothesis.text
+        return text
+
+
+class StreamingAdapter(StreamingSTT):
+    """ Streaming interface for an engine transcribing complete phrases.
+
+    The chunks are collected and the complete phrase is transcribed by the
+    wrapped engine, no partial hypotheses are produced.
+
+    Args:
+        stt (STT): engine to wrap
+    """
+    def __init__(self, stt):
+        self.stt = stt
+
+    @property
+    def lang(self):
+        return self.stt.lang
+
+    def stream(self, chunks, sample_rate, sample_width, language=None):
+        audio = AudioData(b''.join(chunks), sample_rate, sample_width)
+        yield Hypothesis(self.stt.execute(audio, language), True)
+
+    def execute(self, audio, language=None):
+        return self.stt.execute(audio, language)
+
+
 class GoogleSTT(TokenSTT):
     def __init__(self):
         super(GoogleSTT, self).__init__()
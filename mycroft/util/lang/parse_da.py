@@ -896,23 +896,20 @@ def isOrdinal_da(input_str):
     return False
 
 
-def normalize_da(text, remove_articles):
-    """ German string normalization """
-
-    words = text.split()  # this also removed extra spaces
-    normalized = ""
-    for word in words:
-        if remove_articles and word in ["den", "det"]:
-            continue
+_NORMALIZE_ARTICLES_DA = {"den", "det"}
 
-        # Convert numbers into digits, e.g. "two" -> "2"
+# Replacement of each word changed by normalize_da(), e.g. "to" -> "2"
+_NORMALIZE_TOKENS_DA = {word: str(value) for word, value in
+                        da_numbers.items()}
 
-        if word in da_numbers:
-            word = str(da_numbers[word])
 
-        normalized += " " + word
+def normalize_da(text, remove_articles):
+    """ German string normalization """
 
-    return normalized[1:]  # strip the initial space
+    words = text.split()  # this also removed extra spaces
+    if remove_articles:
+        words = [w for w in words if w not in _NORMALIZE_ARTICLES_DA]
+    return " ".join([_NORMALIZE_TOKENS_DA.get(w, w) for w in words])
 
 
 def extract_numbers_da(text, short_scale=True, ordinals=False):
@@ -907,30 +907,22 @@ def isOrdinal_de(input_str):
     return False
 
 
-def normalize_de(text, remove_articles):
-    """ German string normalization """
-
-    words = text.split()  # this also removed extra spaces
-    normalized = ""
-    for word in words:
-        if remove_articles and word in ["der", "die", "das", "des", "den",
-                                        "dem"]:
-            continue
+_NORMALIZE_ARTICLES_DE = {"der", "die", "das", "des", "den", "dem"}
 
-        # Expand common contractions, e.g. "isn't" -> "is not"
-        contraction = ["net", "nett"]
-        if word in contraction:
-            expansion = ["nicht", "nicht"]
-            word = expansion[contraction.index(word)]
+# Replacement of each word changed by normalize_de(), e.g. "zwei" -> "2"
+# and contractions like "net" -> "nicht"
+_NORMALIZE_TOKENS_DE = {word: str(value) for word, value in
+                        de_numbers.items()}
+_NORMALIZE_TOKENS_DE.update({"net": "nicht", "nett": "nicht"})
 
-        # Convert numbers into digits, e.g. "two" -> "2"
 
-        if word in de_numbers:
-            word = str(de_numbers[word])
-
-        normalized += " " + word
+def normalize_de(text, remove_articles):
+    """ German string normalization """
 
-    return normalized[1:]  # strip the initial space
+    words = text.split()  # this also removed extra spaces
+    if remove_articles:
+        words = [w for w in words if w not in _NORMALIZE_ARTICLES_DE]
+    return " ".join([_NORMALIZE_TOKENS_DE.get(w, w) for w in words])
 
 
 def extract_numbers_de(text, short_scale=True, ordinals=False):
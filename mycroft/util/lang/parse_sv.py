@@ -757,22 +757,16 @@ def is_fractional_sv(input_str):
     return False
 
 
+# Replacement of each word changed by normalize_sv(), e.g. "två" -> "2"
+_NORMALIZE_TOKENS_SV = {word: str(i) for i, word in enumerate(
+    ["noll", "ett", "två", "tre", "fyra", "fem", "sex", "sju", "åtta",
+     "nio", "tio", "elva", "tolv", "tretton", "fjorton", "femton",
+     "sexton", "sjutton", "arton", "nitton", "tjugo"])}
+_NORMALIZE_TOKENS_SV['en'] = _NORMALIZE_TOKENS_SV['ett']
+
+
 def normalize_sv(text, remove_articles):
     """ English string normalization """
 
     words = text.split()  # this also removed extra spaces
-    normalized = ''
-    for word in words:
-        # Convert numbers into digits, e.g. "two" -> "2"
-        if word == 'en':
-            word = 'ett'
-        textNumbers = ["noll", "ett", "två", "tre", "fyra", "fem", "sex",
-                       "sju", "åtta", "nio", "tio", "elva", "tolv",
-                       "tretton", "fjorton", "femton", "sexton",
-                       "sjutton", "arton", "nitton", "tjugo"]
-        if word in textNumbers:
-            word = str(textNumbers.index(word))
-
-        normalized += " " + word
-
-    return normalized[1:]  # strip the initial space
+    return ' '.join([_NORMALIZE_TOKENS_SV.get(w, w) for w in words])
@@ -15,6 +15,7 @@
 # limitations under the License.
 #
 from difflib import SequenceMatcher
+from functools import lru_cache
 from mycroft.util.time import now_local
 from mycroft.util.lang import get_primary_lang_code
 
@@ -40,6 +41,11 @@ from mycroft.util.lang.parse_da import normalize_da
 from .log import LOG
 
 
+# Number of normalize() results kept, the same utterance is commonly
+# normalized by the intent service and again by the skill handling it.
+NORMALIZE_CACHE_SIZE = 1024
+
+
 def _log_unsupported_language(language, supported_languages):
     """
     Log a warning when a language is unsupported
@@ -284,6 +290,8 @@ def normalize(text, lang=None, remove_articles=True):
     This function prepares the given text for parsing by making
     numbers consistent, getting rid of contractions, etc.
 
+    The most recent results are cached, see normalize_cache_info().
+
     Args:
         text (str): the string to normalize
         lang (str): the BCP-47 code for the language to use, None uses default
@@ -293,9 +301,11 @@ def normalize(text, lang=None, remove_articles=True):
     Returns:
         (str): The normalized string.
     """
+    return _normalize(text, get_primary_lang_code(lang), remove_articles)
 
-    lang_code = get_primary_lang_code(lang)
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize(text, lang_code, remove_articles):
     if lang_code == "en":
         return normalize_en(text, remove_articles)
     elif lang_code == "es":
@@ -318,6 +328,15 @@ def normalize(text, lang=None, remove_articles=True):
     return text
 
 
+def normalize_cache_info():
+    """ Get hit and miss statistics of the normalize() cache.
+
+    Returns:
+        namedtuple: hits, misses, maxsize and currsize
+    """
+    return _normalize.cache_info()
+
+
 def get_gender(word, context="", lang=None):
     """ Guess the gender of a word
 
@@ -14,6 +14,8 @@
 #
 import tempfile
 import time
+from threading import Lock
+from uuid import uuid4
 
 import os
 import os.path
@@ -87,6 +89,131 @@ def create_file(filename):
         f.write('')
 
 
+class _SignalRegistry:
+    """ In-memory copy of the signals, kept in sync over the messagebus.
+
+    Every process connected with connect_signals() announces the signals
+    it creates and consumes, so checking a signal is a dict lookup instead
+    of resolving the IPC directory and stat-ing a file.
+
+    Creation and removal share a single message type, and thus a single
+    handler queue, so the updates are applied in the order they were sent.
+    """
+    MESSAGE = 'mycroft.signal'
+
+    def __init__(self):
+        self.bus = None
+        self.id = str(uuid4())
+        self.signals = {}  # signal name: creation time
+        self.lock = Lock()
+
+    def connect(self, bus):
+        self.bus = bus
+        self.load_files()
+        bus.on(self.MESSAGE, self.handle_update)
+
+    def disconnect(self):
+        if self.bus:
+            self.bus.remove(self.MESSAGE, self.handle_update)
+        self.bus = None
+        with self.lock:
+            self.signals.clear()
+
+    def load_files(self):
+        """ Pick up signals created before connecting. """
+        directory = os.path.join(get_ipc_directory(), "signal")
+        if not os.path.isdir(directory):
+            return
+        with self.lock:
+            for name in os.listdir(directory):
+                try:
+                    ctime = os.path.getctime(os.path.join(directory, name))
+                    self.signals.setdefault(name, ctime)
+                except OSError:
+                    pass
+
+    def emit(self, op, signal_name, ctime=None):
+        """ Announce a change, unless the bus is down.
+
+        The bus client would block until reconnected, stalling callers like
+        the listener checking signals for every audio chunk. The signal
+        files are kept up to date either way.
+        """
+        connected = getattr(self.bus, 'connected_event', None)
+        if connected is not None and not connected.is_set():
+            LOG.debug('Messagebus not connected, not sharing signal ' +
+                      signal_name)
+            return
+        # Imported here, mycroft.messagebus depends on mycroft.util
+        from mycroft.messagebus.message import Message
+        self.bus.emit(Message(self.MESSAGE, {'op': op,
+                                             'name': signal_name,
+                                             'time': ctime,
+                                             'origin': self.id}))
+
+    def handle_update(self, message):
+        if message.data.get('origin') == self.id:
+            return
+        with self.lock:
+            if message.data.get('op') == 'create':
+                self.signals[message.data['name']] = message.data['time']
+            else:
+                self.signals.pop(message.data['name'], None)
+
+    def create(self, signal_name):
+        ctime = time.time()
+        with self.lock:
+            self.signals[signal_name] = ctime
+        self.emit('create', signal_name, ctime)
+
+    def check(self, signal_name, sec_lifetime):
+        with self.lock:
+            ctime = self.signals.get(signal_name)
+            if ctime is None:
+                return False
+            if sec_lifetime == -1:
+                return True
+            expired = (sec_lifetime != 0 and
+                       int(ctime + sec_lifetime) < int(time.time()))
+            if sec_lifetime != 0 and not expired:
+                return True
+            # consume this single-use signal or remove once expired
+            del self.signals[signal_name]
+
+        self.emit('remove', signal_name)
+        _remove_signal_file(signal_name)
+        return not expired
+
+
+_registry = _SignalRegistry()
+
+
+def connect_signals(bus):
+    """ Keep signals in memory, shared over the messagebus.
+
+    Signals are still written to the IPC directory so processes using
+    the file API keep working, but in the connected process checking a
+    signal no longer touches the filesystem. Signals created through the
+    file API alone are only seen if they exist when connecting.
+
+    Args:
+        bus: Mycroft messagebus connection
+    """
+    _registry.connect(bus)
+
+
+def disconnect_signals():
+    """ Go back to checking signals in the IPC directory. """
+    _registry.disconnect()
+
+
+def _remove_signal_file(signal_name):
+    try:
+        os.remove(os.path.join(get_ipc_directory(), "signal", signal_name))
+    except OSError:
+        pass
+
+
 def create_signal(signal_name):
     """Create a named signal
 
@@ -94,6 +221,8 @@ def create_signal(signal_name):
         signal_name (str): The signal's name.  Must only contain characters
             valid in filenames.
     """
+    if _registry.bus:
+        _registry.create(signal_name)
     try:
         path = os.path.join(get_ipc_directory(), "signal", signal_name)
         create_file(path)
@@ -115,6 +244,9 @@ def check_for_signal(signal_name, sec_lifetime=0):
     Returns:
         bool: True if the signal is defined, False otherwise
     """
+    if _registry.bus:
+        return _registry.check(signal_name, sec_lifetime)
+
     path = os.path.join(get_ipc_directory(), "signal", signal_name)
     if os.path.isfile(path):
         if sec_lifetime == 0:
@@ -56,6 +56,8 @@ setup(
     author_email='devs@mycroft.ai',
     url='https://github.com/MycroftAI/mycroft-core',
     description='Mycroft Core',
+    # asyncio client (async/await) and websockets require Python 3.5
+    python_requires='>=3.5',
     install_requires=required('requirements.txt'),
     packages=find_packages(include=['mycroft*']),
     include_package_data=True,
@@ -0,0 +1,77 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmark of mycroft.util.parse.normalize for all supported languages.
+
+Compares normalizing every utterance from scratch with the cached
+normalize(), where each utterance is seen a number of times as when
+normalized by the intent service and again by the skill.
+
+    python -m test.benchmarks.normalize [repeats]
+"""
+import sys
+from timeit import timeit
+
+from mycroft.util.parse import normalize, _normalize
+
+UTTERANCES = {
+    'en': ["what's the weather like in two days",
+           "set a timer for twenty five minutes",
+           "it's three o'clock and I'm hungry",
+           "turn the volume up to eleven"],
+    'es': ["cuál es el tiempo en dos días",
+           "pon un temporizador de veinticinco minutos",
+           "son las tres y tengo hambre"],
+    'pt': ["qual é o tempo daqui a dois dias",
+           "define um temporizador de vinte e cinco minutos",
+           "são três horas e tenho fome"],
+    'it': ["che tempo fa tra due giorni",
+           "imposta un timer di venticinque minuti",
+           "sono le tre e ho fame"],
+    'fr': ["quel temps fera-t-il dans deux jours",
+           "mets un minuteur de vingt-cinq minutes",
+           "il est trois heures et j'ai faim"],
+    'sv': ["hur blir vädret om två dagar",
+           "sätt en timer på tjugo minuter",
+           "klockan är tre och jag är hungrig"],
+    'de': ["wie wird das wetter in zwei tagen",
+           "stelle einen timer auf fünfundzwanzig minuten",
+           "es ist drei uhr und ich hab net gegessen"],
+    'da': ["hvordan bliver vejret om to dage",
+           "sæt en timer på femogtyve minutter",
+           "klokken er tre og jeg er sulten"]
+}
+
+
+def run(repeats=1000):
+    print('{:<6}{:>14}{:>14}'.format('lang', 'uncached µs', 'cached µs'))
+    uncached = _normalize.__wrapped__
+    for lang, utterances in UTTERANCES.items():
+        calls = repeats * len(utterances)
+
+        def from_scratch():
+            for utt in utterances:
+                uncached(utt, lang, True)
+
+        def cached():
+            for utt in utterances:
+                normalize(utt, lang)
+
+        slow = timeit(from_scratch, number=repeats) / calls * 1e6
+        fast = timeit(cached, number=repeats) / calls * 1e6
+        print('{:<6}{:>14.2f}{:>14.2f}'.format(lang, slow, fast))
+
+
+if __name__ == '__main__':
+    run(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,95 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmark of the voice activity detectors on recorded phrases.
+
+Each WAV file is fed chunk by chunk through every available detector
+and the Endpointer, as done by ResponsiveRecognizer._record_phrase().
+Reported are the processing time per chunk, the position of the last
+speech detected and where the recording would have been ended.
+
+    python -m test.benchmarks.vad [wav files]
+"""
+import audioop
+import sys
+import wave
+from glob import glob
+from os.path import basename, dirname, join
+from time import monotonic
+
+from mycroft.client.speech.mic import ResponsiveRecognizer
+from mycroft.client.speech.vad import VADFactory, Endpointer
+
+CHUNK = 1024
+FIXTURES = join(dirname(dirname(__file__)), 'unittests', 'client', 'data')
+
+
+def read_chunks(path):
+    with wave.open(path) as wav:
+        rate, width = wav.getframerate(), wav.getsampwidth()
+        data = wav.readframes(wav.getnframes())
+    size = CHUNK * width
+    return rate, width, [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def noise_threshold(chunks, width):
+    """ Threshold above the quietest tenth of the recording. """
+    energies = sorted(audioop.rms(c, width) for c in chunks)
+    return 1.5 * energies[len(energies) // 10] + 1
+
+
+def run_vad(module, rate, width, chunks):
+    vad = VADFactory.create({'module': module}, rate, width)
+    if module != 'energy' and type(vad) is VADFactory.CLASSES['energy']:
+        return None
+    sec_per_chunk = CHUNK / rate
+    recognizer = ResponsiveRecognizer
+    endpointer = Endpointer(sec_per_chunk, recognizer.MIN_SILENCE_AT_END,
+                            recognizer.MIN_LOUD_SEC_PER_PHRASE,
+                            recognizer.RECORDING_TIMEOUT_WITH_SILENCE)
+    threshold = noise_threshold(chunks, width)
+    last_speech = end = None
+    elapsed = 0.0
+    for i, chunk in enumerate(chunks):
+        energy = audioop.rms(chunk, width)
+        start = monotonic()
+        speech = vad.is_speech(chunk, energy, threshold)
+        elapsed += monotonic() - start
+        if speech:
+            last_speech = (i + 1) * sec_per_chunk
+        if endpointer.update(speech) and end is None:
+            end = (i + 1) * sec_per_chunk
+    return elapsed / len(chunks) * 1e6, last_speech, end
+
+
+def main(paths):
+    print('{:<22}{:<10}{:>10}{:>14}{:>10}'.format(
+        'file', 'vad', 'µs/chunk', 'last speech', 'end'))
+    for path in paths:
+        rate, width, chunks = read_chunks(path)
+        for module in sorted(VADFactory.CLASSES):
+            result = run_vad(module, rate, width, chunks)
+            if result is None:
+                print('{:<22}{:<10}{:>10}'.format(basename(path), module,
+                                                  'n/a'))
+                continue
+            per_chunk, last_speech, end = result
+            print('{:<22}{:<10}{:>10.1f}{:>14}{:>10}'.format(
+                basename(path), module, per_chunk,
+                '-' if last_speech is None else '{:.2f}'.format(last_speech),
+                '-' if end is None else '{:.2f}'.format(end)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or sorted(glob(join(FIXTURES, '*.wav'))))
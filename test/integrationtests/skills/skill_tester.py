@@ -40,7 +40,8 @@ import ast
 from os.path import join, isdir, basename
 from pyee import EventEmitter
 from numbers import Number
-from mycroft.messagebus.message import Message
+from mycroft.messagebus.client.ws import emit_batch
+from mycroft.messagebus.message import Message, BATCH
 from mycroft.skills.core import create_skill_descriptor, load_skill, \
     MycroftSkill, FallbackSkill
 from mycroft.skills.settings import SkillSettings
@@ -204,6 +205,8 @@ class InterceptEmitter(object):
         if self.q:
             self.q.put(event)
         self.emitter.emit(event_name, event, *args, **kwargs)
+        if event_name == BATCH:
+            emit_batch(self.emitter, event)
 
     def once(self, event, f):
         self.emitter.once(event, f)
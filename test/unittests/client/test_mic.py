@@ -0,0 +1,72 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import unittest
+
+import mock
+
+from mycroft.client.speech.mic import ResponsiveRecognizer, RollingAudioBuffer
+
+
+class TestRollingAudioBuffer(unittest.TestCase):
+    def test_fill(self):
+        buf = RollingAudioBuffer(8)
+        buf.append(b'abc')
+        buf.append(b'def')
+        self.assertEqual(len(buf), 6)
+        self.assertEqual(bytes(buf.get_last()), b'abcdef')
+        self.assertEqual(bytes(buf.get_last(2)), b'ef')
+        self.assertEqual(bytes(buf.get_last(20)), b'abcdef')
+
+    def test_roll(self):
+        buf = RollingAudioBuffer(8)
+        data = bytes(range(99))
+        for i in range(3, len(data) + 1, 3):
+            buf.append(data[i - 3:i])
+            self.assertEqual(bytes(buf.get_last()), data[max(0, i - 8):i])
+        buf.append(bytes(range(20)))
+        self.assertEqual(bytes(buf.get_last()), bytes(range(12, 20)))
+
+    def test_padding(self):
+        buf = RollingAudioBuffer(4, padding=b'\0\0')
+        for chunk in [b'ab', b'cd', b'ef', b'gh', b'ij']:
+            buf.append(chunk)
+            self.assertEqual(bytes(buf.get_last(3, padded=True))[-2:],
+                             b'\0\0')
+        self.assertEqual(bytes(buf.get_last(3, padded=True)), b'hij\0\0')
+        self.assertEqual(bytes(buf.get_last()), b'ghij')
+
+
+class TestMicLevel(unittest.TestCase):
+    def create_recognizer(self, interval):
+        recognizer = mock.Mock(mic_level_interval=interval,
+                               mic_level_file=None, energy_threshold=100,
+                               _last_mic_level=0.0)
+        recognizer._emitter = mock.Mock()
+        return recognizer
+
+    @mock.patch('mycroft.client.speech.mic.monotonic')
+    def test_throttle(self, mock_monotonic):
+        recognizer = self.create_recognizer(0.5)
+        for i in range(10):
+            mock_monotonic.return_value = 10 + i * 0.25
+            ResponsiveRecognizer._report_mic_level(recognizer, i)
+        levels = [c[0][1]['energy']
+                  for c in recognizer._emitter.emit.call_args_list]
+        self.assertEqual(levels, [0, 2, 4, 6, 8])
+
+    def test_disabled(self):
+        recognizer = self.create_recognizer(None)
+        ResponsiveRecognizer._report_mic_level(recognizer, 50)
+        recognizer._emitter.emit.assert_not_called()
@@ -0,0 +1,129 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import unittest
+from queue import Queue
+
+import mock
+from speech_recognition import AudioData
+
+from mycroft.client.speech.listener import (AudioConsumer, AudioProducer,
+                                            RecognizerLoopState,
+                                            StreamingTranscription)
+from mycroft.stt import Hypothesis, StreamingAdapter, StreamingSTT
+
+
+class LocalStreamingSTT(StreamingSTT):
+    """ Stand-in engine "recognizing" each chunk as a word. """
+    def __init__(self):
+        self.lang = 'en-us'
+
+    def stream(self, chunks, sample_rate, sample_width, language=None):
+        words = []
+        for chunk in chunks:
+            words.append(chunk.decode())
+            yield Hypothesis(' '.join(words), False)
+        yield Hypothesis(' '.join(words), True)
+
+
+def stream_phrase(stt, emitter, chunks):
+    stream = StreamingTranscription(stt, emitter, 16000, 2)
+    stream.start()
+    for chunk in chunks:
+        stream.feed(chunk)
+    stream.finish()
+    return stream
+
+
+class TestStreamingTranscription(unittest.TestCase):
+    def test_partial_and_final(self):
+        emitter = mock.Mock()
+        stream = stream_phrase(LocalStreamingSTT(), emitter,
+                               [b'turn', b'on', b'lights'])
+        self.assertEqual(stream.result(), 'turn on lights')
+        partials = [c[0][1]['utterance'] for c in emitter.emit.call_args_list
+                    if c[0][0] == 'recognizer_loop:partial_utterance']
+        self.assertEqual(partials, ['turn', 'turn on', 'turn on lights'])
+
+    def test_error(self):
+        stt = LocalStreamingSTT()
+        stt.stream = mock.Mock(side_effect=ConnectionError)
+        stream = stream_phrase(stt, mock.Mock(), [b'hello'])
+        with self.assertRaises(ConnectionError):
+            stream.result()
+
+    def test_adapter(self):
+        stt = mock.Mock(lang='en-us')
+        stt.execute.return_value = 'hello world'
+        emitter = mock.Mock()
+        stream = stream_phrase(StreamingAdapter(stt), emitter,
+                               [b'\x00\x01', b'\x02\x03'])
+        self.assertEqual(stream.result(), 'hello world')
+        audio = stt.execute.call_args[0][0]
+        self.assertEqual(audio.frame_data, b'\x00\x01\x02\x03')
+        self.assertEqual(audio.sample_rate, 16000)
+        emitter.emit.assert_not_called()
+
+    def test_execute(self):
+        audio = AudioData(b'hello', 16000, 2)
+        self.assertEqual(LocalStreamingSTT().execute(audio), 'hello')
+
+
+class TestStreamingConsumer(unittest.TestCase):
+    def test_process_stream(self):
+        emitter = mock.Mock()
+        stt = mock.Mock(lang='en-us')
+        queue = Queue()
+        consumer = AudioConsumer(RecognizerLoopState(), queue, emitter, stt,
+                                 mock.Mock(), mock.Mock(key_phrase='hey'))
+        stream = stream_phrase(LocalStreamingSTT(), emitter,
+                               [b'What', b'time'])
+        stream.audio = AudioData(b'\0' * 32000, 16000, 2)
+        queue.put(stream)
+        consumer.read()
+
+        stt.execute.assert_not_called()
+        utterances = [c[0][1]['utterances']
+                      for c in emitter.emit.call_args_list
+                      if c[0][0] == 'recognizer_loop:utterance']
+        self.assertEqual(utterances, [['what time']])
+
+
+class TestStreamingProducer(unittest.TestCase):
+    def run_producer(self, sleeping):
+        state = RecognizerLoopState()
+        state.running = True
+        state.sleeping = sleeping
+        queue = Queue()
+        recognizer = mock.Mock()
+
+        def listen(source, emitter, stream=None):
+            state.running = False
+            return AudioData(b'\0' * 32000, 16000, 2)
+
+        recognizer.listen.side_effect = listen
+        producer = AudioProducer(state, queue, mock.MagicMock(), recognizer,
+                                 mock.Mock(), LocalStreamingSTT())
+        producer.run()
+        return recognizer.listen.call_args[0], queue.get_nowait()
+
+    def test_streaming(self):
+        args, queued = self.run_producer(sleeping=False)
+        self.assertIsInstance(args[2], StreamingTranscription)
+        self.assertIsInstance(queued, StreamingTranscription)
+
+    def test_no_streaming_while_sleeping(self):
+        args, queued = self.run_producer(sleeping=True)
+        self.assertEqual(len(args), 2)
+        self.assertIsInstance(queued, AudioData)
@@ -0,0 +1,92 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import audioop
+import math
+import random
+import unittest
+from array import array
+
+from mycroft.client.speech import vad
+from mycroft.client.speech.vad import (Endpointer, EnergyVAD, FeatureVAD,
+                                       VADFactory)
+
+
+def tone(freq, amplitude, num_samples=1024, rate=16000):
+    step = 2 * math.pi * freq / rate
+    return array('h', [int(amplitude * math.sin(step * i))
+                       for i in range(num_samples)]).tobytes()
+
+
+def noise(amplitude, num_samples=1024):
+    rand = random.Random(1234)
+    return array('h', [rand.randint(-amplitude, amplitude)
+                       for _ in range(num_samples)]).tobytes()
+
+
+class TestEndpointer(unittest.TestCase):
+    def test_hangover(self):
+        endpointer = Endpointer(0.1, hangover=0.3, min_speech=0.5,
+                                max_silence=3.0)
+        results = [endpointer.update(s) for s in [True] * 6 + [False] * 3]
+        self.assertEqual(results, [False] * 8 + [True])
+
+    def test_speech_resets_hangover(self):
+        endpointer = Endpointer(0.1, hangover=0.3, min_speech=0.5,
+                                max_silence=3.0)
+        pattern = [True] * 6 + [False, False, True] + [False] * 3
+        results = [endpointer.update(s) for s in pattern]
+        self.assertEqual(results, [False] * 11 + [True])
+
+    def test_too_much_silence(self):
+        endpointer = Endpointer(0.1, hangover=0.3, min_speech=0.5,
+                                max_silence=1.0)
+        results = [endpointer.update(False) for _ in range(11)]
+        self.assertEqual(results, [False] * 10 + [True])
+
+
+class TestVADFactory(unittest.TestCase):
+    def test_default(self):
+        self.assertIsInstance(VADFactory.create(None, 16000, 2), EnergyVAD)
+
+    def test_fallback(self):
+        detector = VADFactory.create({'module': 'features'}, 16000, 1)
+        self.assertIs(type(detector), EnergyVAD)
+
+    def test_energy(self):
+        detector = EnergyVAD(16000, 2)
+        self.assertTrue(detector.is_speech(b'', 200, 100))
+        self.assertFalse(detector.is_speech(b'', 50, 100))
+
+
+@unittest.skipIf(vad.numpy is None, 'numpy is not installed')
+class TestFeatureVAD(unittest.TestCase):
+    def setUp(self):
+        self.detector = FeatureVAD(16000, 2)
+
+    def is_speech(self, chunk, threshold=1000):
+        return self.detector.is_speech(chunk, audioop.rms(chunk, 2),
+                                       threshold)
+
+    def test_voice_band_tone(self):
+        self.assertTrue(self.is_speech(tone(300, 10000)))
+
+    def test_quiet(self):
+        self.assertFalse(self.is_speech(tone(300, 100)))
+
+    def test_broadband_noise(self):
+        self.assertFalse(self.is_speech(noise(10000)))
+
+    def test_hum(self):
+        self.assertFalse(self.is_speech(tone(5, 10000)))
@@ -0,0 +1,155 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import unittest
+
+import mock
+from websockets.exceptions import ConnectionClosed
+
+from mycroft.messagebus.client.async_ws import AsyncWebsocketClient
+from mycroft.messagebus.message import Message
+
+
+WS_CONF = {
+    'websocket': {
+        'host': 'testhost',
+        'port': 1337,
+        'route': '/core',
+        'ssl': False
+    }
+}
+
+
+class MockConnection:
+    """Connection answering every received message with a response."""
+    def __init__(self, client):
+        self.client = client
+        self.incoming = asyncio.Queue()
+        self.sent = []
+
+    async def recv(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise ConnectionClosed(None, None)
+        return message
+
+    async def send(self, serialized):
+        message = Message.deserialize(serialized)
+        self.sent.append(message)
+        if message.type == 'question':
+            reply = message.response({'answer': 42})
+            self.incoming.put_nowait(reply.serialize())
+
+    async def close(self):
+        self.incoming.put_nowait(None)
+
+
+class TestAsyncWebsocketClient(unittest.TestCase):
+    @mock.patch('mycroft.messagebus.client.async_ws.Configuration')
+    def setUp(self, mock_config):
+        mock_config.get.return_value = WS_CONF
+        self.loop = asyncio.new_event_loop()
+        self.bus = AsyncWebsocketClient(loop=self.loop)
+        self.connection = None
+
+        async def connect(url):
+            self.connection = MockConnection(self.bus)
+            return self.connection
+
+        patcher = mock.patch('mycroft.messagebus.client.async_ws.'
+                             'websockets.connect', connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.loop.close)
+
+    def run_client(self, test_coroutine):
+        async def run_test():
+            client = asyncio.ensure_future(self.bus.run())
+            while not self.bus.connection:
+                await asyncio.sleep(0.01)
+            try:
+                return await test_coroutine()
+            finally:
+                await self.bus.close()
+                await client
+        return self.loop.run_until_complete(run_test())
+
+    def test_wait_for_response(self):
+        async def test():
+            return await self.bus.wait_for_response(Message('question'))
+
+        response = self.run_client(test)
+        self.assertEqual(response.data['answer'], 42)
+
+    def test_coroutine_handler(self):
+        received = []
+
+        async def handler(message):
+            received.append(message)
+
+        self.bus.on('question.response', handler)
+
+        async def test():
+            self.bus.emit(Message('question'))
+            while not received:
+                await asyncio.sleep(0.01)
+
+        self.run_client(test)
+        self.assertEqual(received[0].data['answer'], 42)
+
+    def test_resubscribe(self):
+        self.bus.subscribe(['speak'])
+
+        async def test():
+            await asyncio.sleep(0.01)
+            return self.connection.sent
+
+        sent = self.run_client(test)
+        self.assertEqual(sent[0].type, 'mycroft.messagebus.subscribe')
+        self.assertEqual(sent[0].data['types'], ['speak'])
+
+    def test_handler_error(self):
+        received = []
+
+        def failing_handler(message):
+            raise ValueError('handler failed')
+
+        self.bus.on('question.response', failing_handler)
+        self.bus.on('question.response', received.append)
+
+        async def wait_for_messages():
+            while len(received) < 2:
+                await asyncio.sleep(0.01)
+
+        async def test():
+            self.connection.incoming.put_nowait(b'not a message')
+            self.bus.emit(Message('question'))
+            self.bus.emit(Message('question'))
+            await asyncio.wait_for(wait_for_messages(), 2)
+
+        self.run_client(test)
+        self.assertEqual([m.data['answer'] for m in received], [42, 42])
+
+    def test_once(self):
+        received = []
+        self.bus.once('question.response', received.append)
+
+        async def test():
+            await self.bus.wait_for_response(Message('question'))
+            await self.bus.wait_for_response(Message('question'))
+
+        self.run_client(test)
+        self.assertEqual(len(received), 1)
+        self.assertEqual(self.bus.emitter.wrappers['question.response'], [])
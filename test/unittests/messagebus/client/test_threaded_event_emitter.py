@@ -56,3 +56,85 @@ class TestThreadedEventEmitter:
         self.emitter.emit(self.msg.type)
         sleep(0.1)
         assert self.count == 0
+
+    def test_ordered_delivery(self):
+        received = []
+
+        def handler(message):
+            sleep(0.001)
+            received.append(message.data['n'])
+
+        self.emitter.on(self.msg.type, handler)
+        for n in range(20):
+            self.emitter.emit(self.msg.type, Message('testing', {'n': n}))
+        sleep(0.2)
+        assert received == list(range(20))
+
+    def test_handler_exception(self):
+        def failing_handler(message):
+            raise Exception('Failing handler')
+
+        self.emitter.on(self.msg.type, failing_handler)
+        self.emitter.on(self.msg.type, self.example_event)
+        self.emitter.emit(self.msg.type, self.msg)
+        self.emitter.emit(self.msg.type, self.msg)
+        sleep(0.1)
+        assert self.count == 2
+
+    def test_coalesce(self):
+        emitter = ThreadedEventEmitter(
+            queue_policies={'enclosure.mouth.*': 'coalesce'})
+        received = []
+
+        def handler(message):
+            sleep(0.05)
+            received.append(message.data['n'])
+
+        emitter.on('enclosure.mouth.viseme', handler)
+        for n in range(5):
+            emitter.emit('enclosure.mouth.viseme',
+                         Message('enclosure.mouth.viseme', {'n': n}))
+            sleep(0.01)  # Make sure the first message is being handled
+        sleep(0.3)
+        # The first message is handled, of the rest only the latest is kept
+        assert received == [0, 4]
+        stats = emitter.get_stats()['enclosure.mouth.viseme']
+        assert stats['dropped'] == 3
+        assert stats['handled'] == 2
+        assert stats['depth'] == 0
+
+    def test_max_queue_depth(self):
+        emitter = ThreadedEventEmitter(max_queue_depth=2)
+        received = []
+
+        def handler(message):
+            sleep(0.05)
+            received.append(message.data['n'])
+
+        emitter.on(self.msg.type, handler)
+        for n in range(5):
+            emitter.emit(self.msg.type, Message('testing', {'n': n}))
+            sleep(0.01)  # Make sure the first message is being handled
+        sleep(0.3)
+        assert received == [0, 1, 2]
+        assert emitter.get_stats()['testing']['dropped'] == 2
+
+    def test_concurrent(self):
+        emitter = ThreadedEventEmitter(
+            queue_policies={'skill.converse.request': 'concurrent'})
+        received = []
+
+        def handler(message):
+            sleep(0.1)
+            received.append(message.data['n'])
+
+        emitter.on('skill.converse.request', handler)
+        for n in range(3):
+            emitter.emit('skill.converse.request',
+                         Message('skill.converse.request', {'n': n}))
+        # Run in parallel, serially all three would take 0.3 seconds
+        sleep(0.2)
+        assert sorted(received) == [0, 1, 2]
+        stats = emitter.get_stats()['skill.converse.request']
+        assert stats['handled'] == 3
+        assert stats['depth'] == 0
@@ -0,0 +1,100 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import socket
+import unittest
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event, Thread
+
+from websocket import ABNF
+
+from mycroft.messagebus.client.unix_socket import (HEADER, BINARY, TEXT,
+                                                   pack_frame, unpack_payload,
+                                                   UnixSocketApp)
+
+
+def recv_frame(conn):
+    kind, length = HEADER.unpack(conn.recv(HEADER.size))
+    return unpack_payload(kind, conn.recv(length))
+
+
+class TestFraming(unittest.TestCase):
+    def test_text(self):
+        frame = pack_frame('{"type": "speak"}')
+        self.assertEqual(HEADER.unpack(frame[:HEADER.size]), (TEXT, 17))
+        self.assertEqual(unpack_payload(TEXT, frame[HEADER.size:]),
+                         '{"type": "speak"}')
+
+    def test_binary(self):
+        frame = pack_frame(b'\x81\xa4type')
+        self.assertEqual(HEADER.unpack(frame[:HEADER.size]), (BINARY, 6))
+        self.assertEqual(unpack_payload(BINARY, frame[HEADER.size:]),
+                         b'\x81\xa4type')
+
+
+class TestUnixSocketApp(unittest.TestCase):
+    def setUp(self):
+        self.tmp = mkdtemp()
+        self.path = join(self.tmp, 'bus.sock')
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.path)
+        self.server.listen(1)
+
+    def tearDown(self):
+        self.server.close()
+        rmtree(self.tmp)
+
+    def test_send_and_receive(self):
+        received = []
+        opened = Event()
+        closed = Event()
+        app = UnixSocketApp(self.path, on_open=opened.set,
+                            on_message=received.append,
+                            on_close=closed.set)
+        Thread(target=app.run_forever, daemon=True).start()
+        conn, _ = self.server.accept()
+        self.assertTrue(opened.wait(1))
+
+        app.send('{"type": "speak"}')
+        app.send(b'\x81\xa4type', ABNF.OPCODE_BINARY)
+        self.assertEqual(recv_frame(conn), '{"type": "speak"}')
+        self.assertEqual(recv_frame(conn), b'\x81\xa4type')
+
+        conn.sendall(pack_frame('{"type": "connected"}'))
+        conn.close()
+        self.assertTrue(closed.wait(1))
+        self.assertEqual(received, ['{"type": "connected"}'])
+
+    def test_error_on_close_by_service(self):
+        errors = []
+        app = UnixSocketApp(self.path, on_error=errors.append)
+        thread = Thread(target=app.run_forever, daemon=True)
+        thread.start()
+        conn, _ = self.server.accept()
+        conn.close()
+        thread.join(1)
+        self.assertEqual(len(errors), 1)
+
+    def test_no_error_on_close(self):
+        errors = []
+        app = UnixSocketApp(self.path, on_error=errors.append)
+        thread = Thread(target=app.run_forever, daemon=True)
+        thread.start()
+        conn, _ = self.server.accept()
+        app.close()
+        thread.join(1)
+        conn.close()
+        self.assertEqual(errors, [])
@@ -0,0 +1,112 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import time
+import unittest
+
+import mock
+
+from mycroft.messagebus.client.ws import WebsocketClient
+from mycroft.messagebus.message import Message
+
+
+WS_CONF = {
+    'websocket': {
+        'host': 'testhost',
+        'port': 1337,
+        'route': '/core',
+        'ssl': False
+    }
+}
+
+
+class TestWebsocketClient(unittest.TestCase):
+    @mock.patch('mycroft.messagebus.client.ws.Configuration')
+    def setUp(self, mock_config):
+        mock_config.get.return_value = WS_CONF
+        self.ws = WebsocketClient()
+        self.ws.client = mock.MagicMock()
+        self.ws.connected_event.set()
+
+    def answer(self, reply_context=None):
+        """Make the mocked connection answer every sent message."""
+        def send(serialized, *args):
+            msg = Message.deserialize(serialized)
+            context = (reply_context if reply_context is not None
+                       else msg.context)
+            reply = Message(msg.type + '.response', {'answer': 42}, context)
+            self.ws.on_message(reply.serialize())
+        self.ws.client.send.side_effect = send
+
+    def test_wait_for_response(self):
+        self.answer()
+        start = time.monotonic()
+        response = self.ws.wait_for_response(Message('question'))
+        self.assertEqual(response.data['answer'], 42)
+        # The reply should be delivered without polling delay
+        self.assertLess(time.monotonic() - start, 0.2)
+
+    def test_wait_for_response_legacy_reply(self):
+        self.answer({})
+        response = self.ws.wait_for_response(Message('question'))
+        self.assertEqual(response.data['answer'], 42)
+
+    def test_wait_for_response_ignores_other_requests(self):
+        self.answer({'msg_id': 'someone else'})
+        response = self.ws.wait_for_response(Message('question'),
+                                             timeout=0.1)
+        self.assertIsNone(response)
+
+    def test_wait_for_response_context_untouched(self):
+        self.answer()
+        message = Message('question', context={'source': 'skills'})
+        reply = message.reply('question.followup')  # Shares the context
+        self.ws.wait_for_response(message)
+        self.assertEqual(message.context, {'source': 'skills'})
+        self.assertNotIn('msg_id', reply.context)
+
+    def test_wait_for_response_timeout(self):
+        response = self.ws.wait_for_response(Message('question'),
+                                             timeout=0.1)
+        self.assertIsNone(response)
+        self.assertEqual(self.ws.emitter.listeners('question.response'), [])
+
+    def test_batch(self):
+        singles = []
+        batches = []
+        self.ws.on('register_vocab', singles.append)
+        self.ws.on('batch:padatious:register_intent', batches.append)
+        batch = Message.batch([Message('register_vocab', {'start': 'a'}),
+                               Message('padatious:register_intent'),
+                               Message('register_vocab', {'start': 'b'}),
+                               Message('padatious:register_intent')])
+        self.ws.on_message(batch.serialize())
+        time.sleep(0.1)
+        self.assertEqual([m.data['start'] for m in singles], ['a', 'b'])
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 2)
+
+    def test_batch_and_single_listeners(self):
+        singles = []
+        batches = []
+        self.ws.on('register_intent', singles.append)
+        self.ws.on('batch:register_intent', batches.append)
+        batch = Message.batch([Message('register_intent', {'name': 'a'}),
+                               Message('register_intent', {'name': 'b'})])
+        self.ws.on_message(batch.serialize())
+        time.sleep(0.1)
+        self.assertEqual([m.data['name'] for m in singles], ['a', 'b'])
+        self.assertTrue(all(m.context['batched'] for m in singles))
+        self.assertEqual([[m.data['name'] for m in b] for b in batches],
+                         [['a', 'b']])
@@ -0,0 +1,71 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import unittest
+
+from mycroft.messagebus.service.subscriptions import SubscriptionIndex
+
+
+class TestSubscriptionIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SubscriptionIndex()
+        self.index.add('legacy')
+        self.index.add('skills')
+        self.index.add('gui')
+
+    def test_broadcast(self):
+        self.assertEqual(self.index.targets('speak'),
+                         {'legacy', 'skills', 'gui'})
+
+    def test_exact(self):
+        self.index.subscribe('skills', ['recognizer_loop:utterance'])
+        self.assertEqual(self.index.targets('speak'), {'legacy', 'gui'})
+        self.assertEqual(self.index.targets('recognizer_loop:utterance'),
+                         {'legacy', 'skills', 'gui'})
+
+    def test_pattern(self):
+        self.index.subscribe('gui', ['gui.*', 'enclosure.*'])
+        self.assertEqual(self.index.targets('gui.value.set'),
+                         {'legacy', 'skills', 'gui'})
+        self.assertEqual(self.index.targets('enclosure.mouth.viseme'),
+                         {'legacy', 'skills', 'gui'})
+        self.assertEqual(self.index.targets('speak'), {'legacy', 'skills'})
+
+    def test_unsubscribe(self):
+        self.index.subscribe('gui', ['gui.*', 'speak'])
+        self.index.unsubscribe('gui', ['gui.*'])
+        self.assertEqual(self.index.targets('gui.value.set'),
+                         {'legacy', 'skills'})
+        self.assertEqual(self.index.targets('speak'),
+                         {'legacy', 'skills', 'gui'})
+
+    def test_unsubscribe_all(self):
+        self.index.subscribe('gui', ['gui.*'])
+        self.index.unsubscribe('gui')
+        self.assertEqual(self.index.targets('speak'),
+                         {'legacy', 'skills', 'gui'})
+
+    def test_unsubscribe_every_type(self):
+        self.index.subscribe('gui', ['gui.*', 'speak'])
+        self.index.unsubscribe('gui', ['gui.*', 'speak'])
+        self.assertNotIn('gui', self.index.subscriptions)
+        self.assertEqual(self.index.targets('speak'),
+                         {'legacy', 'skills', 'gui'})
+
+    def test_remove(self):
+        self.index.subscribe('gui', ['gui.*', 'speak'])
+        self.index.remove('gui')
+        self.index.remove('legacy')
+        self.assertEqual(self.index.targets('gui.value.set'), {'skills'})
+        self.assertEqual(self.index.targets('speak'), {'skills'})
@@ -0,0 +1,68 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import unittest
+
+from tornado import gen
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError
+
+from mycroft.messagebus.client.unix_socket import pack_frame, HEADER, BINARY
+from mycroft.messagebus.message import Message
+from mycroft.messagebus.service.unix_socket import UnixSocketServer
+from mycroft.messagebus.service.ws import client_connections
+
+
+class MockStream:
+    """ Stream reading the given data, then reporting a closed stream. """
+    def __init__(self, data):
+        self.data = data
+        self.written = []
+        self.closed = False
+
+    @gen.coroutine
+    def read_bytes(self, num_bytes):
+        if len(self.data) < num_bytes:
+            raise StreamClosedError()
+        chunk, self.data = self.data[:num_bytes], self.data[num_bytes:]
+        return chunk
+
+    def write(self, data):
+        self.written.append(data)
+
+    def close(self):
+        self.closed = True
+
+
+class TestUnixSocketServer(unittest.TestCase):
+    def handle(self, data):
+        stream = MockStream(data)
+        IOLoop.current().run_sync(
+            lambda: UnixSocketServer().handle_stream(stream, None))
+        return stream
+
+    def test_invalid_frame(self):
+        invalid = HEADER.pack(1, 2) + b'\xff\xfe'
+        valid = pack_frame(Message('speak').serialize())
+        stream = self.handle(invalid + valid)
+        # The frame after the invalid one is still routed
+        self.assertEqual(len(stream.written), 2)
+        self.assertIn(b'"speak"', stream.written[1])
+        self.assertTrue(stream.closed)
+        self.assertEqual(client_connections, [])
+
+    def test_truncated_frame(self):
+        stream = self.handle(HEADER.pack(BINARY, 100) + b'\x80')
+        self.assertTrue(stream.closed)
+        self.assertEqual(client_connections, [])
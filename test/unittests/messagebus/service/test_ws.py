@@ -0,0 +1,103 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import unittest
+
+import mock
+
+from mycroft.messagebus.message import Message
+from mycroft.messagebus.service.ws import (MessageBusConnection, STATS,
+                                           frame_stats, subscriptions)
+
+
+class MockConnection(MessageBusConnection):
+    """ Connection recording the frames written to it. """
+    def __init__(self, encoding='json'):
+        self.encoding = encoding
+        self.written = []
+        self.open()
+        self.written = []  # Drop the "connected" message
+
+    def write_message(self, message, binary=False):
+        self.written.append(message)
+
+
+@mock.patch.dict(frame_stats, {'relayed': 0, 'decoded': 0})
+class TestMessageBusConnection(unittest.TestCase):
+    def setUp(self):
+        self.connections = []
+
+    def tearDown(self):
+        for connection in self.connections:
+            connection.on_close()
+
+    def connect(self, encoding='json'):
+        connection = MockConnection(encoding)
+        self.connections.append(connection)
+        return connection
+
+    def test_relay_unchanged(self):
+        sender = self.connect()
+        receivers = [self.connect(), self.connect()]
+        frame = Message('speak', {'utterance': 'hi'}).serialize()
+        sender.on_message(frame)
+        for connection in [sender] + receivers:
+            self.assertEqual(len(connection.written), 1)
+            self.assertIs(connection.written[0], frame)
+        self.assertEqual(frame_stats['relayed'], 1)
+        self.assertEqual(frame_stats['decoded'], 0)
+
+    def test_reencode_per_encoding(self):
+        sender = self.connect()
+        json_receiver = self.connect()
+        msgpack_receivers = [self.connect('msgpack'),
+                             self.connect('msgpack')]
+        frame = Message('speak', {'utterance': 'hi'}).serialize()
+        with mock.patch.object(Message, 'serialize', autospec=True,
+                               side_effect=Message.serialize) as serialize:
+            sender.on_message(frame)
+        # Encoded to msgpack once, json receivers get the original frame
+        self.assertEqual(serialize.call_count, 1)
+        self.assertIs(json_receiver.written[0], frame)
+        packed = msgpack_receivers[0].written[0]
+        self.assertIs(msgpack_receivers[1].written[0], packed)
+        self.assertEqual(Message.deserialize(packed).data['utterance'], 'hi')
+        self.assertEqual(frame_stats['relayed'], 0)
+        self.assertEqual(frame_stats['decoded'], 1)
+
+    def test_batch(self):
+        sender = self.connect()
+        interested = self.connect()
+        subscriptions.subscribe(interested, ['register_vocab'])
+        other = self.connect()
+        subscriptions.subscribe(other, ['speak'])
+        broadcast = self.connect()
+        frame = Message.batch([Message('register_vocab'),
+                               Message('register_intent')]).serialize()
+        sender.on_message(frame)
+        # Batches are routed by the types of the messages they contain
+        self.assertEqual(interested.written, [frame])
+        self.assertEqual(broadcast.written, [frame])
+        self.assertEqual(other.written, [])
+        self.assertEqual(frame_stats['relayed'], 0)
+        self.assertEqual(frame_stats['decoded'], 1)
+
+    def test_stats(self):
+        sender = self.connect()
+        sender.on_message(Message('speak').serialize())
+        sender.on_message(Message('speak').serialize('msgpack'))
+        sender.written = []
+        sender.on_message(Message(STATS).serialize())
+        response = Message.deserialize(sender.written[0])
+        self.assertEqual(response.data, {'relayed': 1, 'decoded': 2})
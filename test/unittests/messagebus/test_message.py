@@ -0,0 +1,63 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import unittest
+
+from mycroft.messagebus.message import Message, ENCODINGS
+
+
+class TestMessage(unittest.TestCase):
+    def setUp(self):
+        self.msg = Message('speak', {'utterance': 'hello'},
+                           {'source': 'test'})
+
+    def check_message(self, msg):
+        self.assertEqual(msg.type, 'speak')
+        self.assertEqual(msg.data, {'utterance': 'hello'})
+        self.assertEqual(msg.context, {'source': 'test'})
+
+    def test_json(self):
+        serialized = self.msg.serialize()
+        self.assertIsInstance(serialized, str)
+        self.check_message(Message.deserialize(serialized))
+        self.check_message(Message.deserialize(serialized.encode('utf-8')))
+
+    @unittest.skipUnless('msgpack' in ENCODINGS, 'msgpack not installed')
+    def test_msgpack(self):
+        serialized = self.msg.serialize('msgpack')
+        self.assertIsInstance(serialized, bytes)
+        self.check_message(Message.deserialize(serialized))
+
+    def test_peek_type(self):
+        self.assertEqual(Message.peek_type(self.msg.serialize()), 'speak')
+        self.assertIsNone(Message.peek_type('{"data": {"type": "x"}}'))
+        self.assertIsNone(Message.peek_type('{"type": "esc\\"aped"}'))
+
+    @unittest.skipUnless('msgpack' in ENCODINGS, 'msgpack not installed')
+    def test_peek_type_msgpack(self):
+        self.assertEqual(Message.peek_type(self.msg.serialize('msgpack')),
+                         'speak')
+        long_type = 'padatious:register_intent.' * 2
+        msg = Message(long_type)
+        self.assertEqual(Message.peek_type(msg.serialize('msgpack')),
+                         long_type)
+
+    def test_batch(self):
+        messages = [self.msg, Message('speak', {'utterance': 'world'})]
+        batch = Message.deserialize(Message.batch(messages).serialize())
+        self.assertEqual(batch.type, 'mycroft.messagebus.batch')
+        unpacked = batch.unbatch()
+        self.assertEqual(len(unpacked), 2)
+        self.check_message(unpacked[0])
+        self.assertEqual(unpacked[1].data['utterance'], 'world')
@@ -23,9 +23,9 @@ from re import error
 from datetime import datetime
 
 from mycroft.configuration import Configuration
-from mycroft.messagebus.message import Message
+from mycroft.messagebus.message import Message, BATCH
 from mycroft.skills.skill_data import load_regex_from_file, load_regex, \
-    load_vocab_from_file, load_vocabulary
+    load_vocab_from_file, load_vocabulary, compile_vocab_matcher
 from mycroft.skills.core import MycroftSkill, load_skill, \
     create_skill_descriptor, open_intent_envelope
 
@@ -39,6 +39,10 @@ class MockEmitter(object):
         self.reset()
 
     def emit(self, message):
+        if message.type == BATCH:
+            for m in message.unbatch():
+                self.emit(m)
+            return
         self.types.append(message.type)
         self.results.append(message.data)
 
@@ -323,6 +327,31 @@ class MycroftSkillTest(unittest.TestCase):
 
         self.check_register_object_file(expected_types, expected_results)
 
+    def test_registration_batch(self):
+        s = SimpleSkill4()
+        s.root_dir = abspath(join(dirname(__file__), 'intent_file'))
+        bus = mock.Mock()
+        s.bind(bus)
+        s._start_registration_batch()
+        s.initialize()
+        bus.emit.assert_not_called()
+
+        # Batched registrations are sent before a detach
+        s.disable_intent('test.intent')
+        self.assertEqual([c[0][0].type for c in bus.emit.call_args_list],
+                         [BATCH, 'detach_intent'])
+        batch = bus.emit.call_args_list[0][0][0]
+        self.assertEqual([m.type for m in batch.unbatch()],
+                         ['padatious:register_intent',
+                          'padatious:register_entity'])
+
+        bus.reset_mock()
+        s.register_vocabulary('hi', 'Greeting')
+        s._end_registration_batch()
+        self.assertEqual(len(bus.emit.call_args_list), 1)
+        self.assertEqual(bus.emit.call_args[0][0].unbatch()[0].type,
+                         'register_vocab')
+
     def check_register_decorators(self, result_list):
         self.assertEquals(sorted(self.emitter.get_results(),
                                  key=lambda d: sorted(d.items())),
@@ -506,6 +535,25 @@ class MycroftSkillTest(unittest.TestCase):
         self.assertFalse(s.voc_match("My hovercraft is full of eels",
                                      "turn_off_test"))
 
+    def test_voc_search(self):
+        s = SimpleSkill1()
+        s.root_dir = abspath(dirname(__file__))
+
+        self.assertEqual(s.voc_search("please switch off the lights",
+                                      "turn_off_test"),
+                         ("switch off", (7, 17)))
+        self.assertIsNone(s.voc_search("return office", "turn_off_test"))
+        self.assertIsNone(s.voc_search("", "turn_off_test"))
+
+        # The longest entry at the first matching position wins
+        matcher = compile_vocab_matcher(['turn', 'turn off', 'c++'])
+        self.assertEqual(matcher.search('turn off now').group(), 'turn off')
+        # Entries are literal text, not regexes
+        self.assertEqual(matcher.search('in c++ you turn').span(), (3, 6))
+        self.assertEqual(matcher.search('abc++ to turn').group(), 'turn')
+        self.assertIsNone(matcher.search('cc turned'))
+        self.assertIsNone(compile_vocab_matcher([]))
+
 
 class _TestSkill(MycroftSkill):
     def __init__(self):
@@ -2,9 +2,13 @@
     Test cases regarding the event scheduler.
 """
 
+import json
 import unittest
 import mock
 import time
+from os.path import getsize, join
+from shutil import rmtree
+from tempfile import mkdtemp
 
 from mycroft.skills.event_scheduler import EventScheduler
 
@@ -13,8 +17,10 @@ class TestEventScheduler(unittest.TestCase):
     @mock.patch('threading.Thread')
     @mock.patch('json.load')
     @mock.patch('json.dump')
+    @mock.patch('mycroft.skills.event_scheduler.os')
     @mock.patch('mycroft.skills.event_scheduler.open')
-    def test_create(self, mock_open, mock_json_dump, mock_load, mock_thread):
+    def test_create(self, mock_open, mock_os, mock_json_dump, mock_load,
+                    mock_thread):
         """
             Test creating and shutting down event_scheduler.
         """
@@ -28,8 +34,9 @@ class TestEventScheduler(unittest.TestCase):
     @mock.patch('threading.Thread')
     @mock.patch('json.load')
     @mock.patch('json.dump')
+    @mock.patch('mycroft.skills.event_scheduler.os')
     @mock.patch('mycroft.skills.event_scheduler.open')
-    def test_add_remove(self, mock_open, mock_json_dump,
+    def test_add_remove(self, mock_open, mock_os, mock_json_dump,
                         mock_load, mock_thread):
         """
             Test add an event and then remove it.
@@ -57,8 +64,10 @@ class TestEventScheduler(unittest.TestCase):
     @mock.patch('threading.Thread')
     @mock.patch('json.load')
     @mock.patch('json.dump')
+    @mock.patch('mycroft.skills.event_scheduler.os')
     @mock.patch('mycroft.skills.event_scheduler.open')
-    def test_save(self, mock_open, mock_dump, mock_load, mock_thread):
+    def test_save(self, mock_open, mock_os, mock_dump, mock_load,
+                  mock_thread):
         """
             Test save functionality.
         """
@@ -81,8 +90,10 @@ class TestEventScheduler(unittest.TestCase):
     @mock.patch('threading.Thread')
     @mock.patch('json.load')
     @mock.patch('json.dump')
+    @mock.patch('mycroft.skills.event_scheduler.os')
     @mock.patch('mycroft.skills.event_scheduler.open')
-    def test_send_event(self, mock_open, mock_dump, mock_load, mock_thread):
+    def test_send_event(self, mock_open, mock_os, mock_dump, mock_load,
+                        mock_thread):
         """
             Test save functionality.
         """
@@ -98,3 +109,108 @@ class TestEventScheduler(unittest.TestCase):
         self.assertEquals(emitter.emit.call_args[0][0].type, 'test')
         self.assertEquals(emitter.emit.call_args[0][0].data, {})
         es.shutdown()
+
+    @mock.patch('json.load')
+    @mock.patch('json.dump')
+    @mock.patch('mycroft.skills.event_scheduler.os')
+    @mock.patch('mycroft.skills.event_scheduler.open')
+    def test_wake_on_schedule(self, mock_open, mock_os, mock_dump, mock_load):
+        """
+            Test that the thread wakes up for a newly scheduled event.
+        """
+        mock_load.return_value = ''
+        mock_open.return_value = mock.MagicMock()
+        emitter = mock.MagicMock()
+        es = EventScheduler(emitter)
+
+        es.schedule_event('test-later', time.time() + 3600, None)
+        time.sleep(0.05)  # Let the thread start waiting for test-later
+        sched_time = time.time() + 0.1
+        es.schedule_event('test', sched_time, None)
+        time.sleep(0.2)
+        self.assertEqual(emitter.emit.call_args[0][0].type, 'test')
+        self.assertEqual(emitter.emit.call_count, 1)
+        self.assertTrue('test' not in es.events)
+        self.assertTrue('test-later' in es.events)
+        es.shutdown()
+
+    @mock.patch('json.load')
+    @mock.patch('json.dump')
+    @mock.patch('mycroft.skills.event_scheduler.os')
+    @mock.patch('mycroft.skills.event_scheduler.open')
+    def test_order(self, mock_open, mock_os, mock_dump, mock_load):
+        """
+            Test that events are sent in order of their scheduled time.
+        """
+        mock_load.return_value = ''
+        mock_open.return_value = mock.MagicMock()
+        emitter = mock.MagicMock()
+        es = EventScheduler(emitter)
+        es.shutdown()  # Trigger the events manually using check_state()
+
+        now = time.time()
+        es.schedule_event('third', now - 1, None)
+        es.schedule_event('first', now - 3, None)
+        es.schedule_event('removed', now - 2, None)
+        es.schedule_event('second', now - 2, None)
+        es.remove_event('removed')
+        es.check_state()
+        self.assertEqual([c[0][0].type for c in emitter.emit.call_args_list],
+                         ['first', 'second', 'third'])
+        self.assertEqual(es.events, {})
+
+
+class TestScheduleJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = mkdtemp()
+        self.schedule_file = join(self.tmp, 'schedule.json')
+
+    def tearDown(self):
+        rmtree(self.tmp)
+
+    def test_recover(self):
+        """
+            Test that changes are recovered without a clean shutdown.
+        """
+        later = time.time() + 3600
+        es = EventScheduler(mock.MagicMock(), self.schedule_file)
+        es.schedule_event('one-shot', later, None, {'a': 1})
+        es.schedule_event('removed', later, None)
+        es.schedule_event('repeating', later, 60)
+        es.update_event('one-shot', {'a': 2})
+        es.remove_event('removed')
+        # Simulate a crash by stopping the thread without storing
+        es.isRunning = False
+        with es.event_lock:
+            es.event_lock.notify()
+        es.join()
+
+        es = EventScheduler(mock.MagicMock(), self.schedule_file)
+        self.assertEqual(es.events, {'one-shot': [(later, None, {'a': 2})]})
+        es.shutdown()
+
+    def test_missing_data_dir(self):
+        """
+            Test creating the scheduler before the data dir exists.
+        """
+        schedule_file = join(self.tmp, 'missing', 'schedule.json')
+        later = time.time() + 3600
+        es = EventScheduler(mock.MagicMock(), schedule_file)
+        es.schedule_event('one-shot', later, None)
+        es.shutdown()
+        with open(schedule_file) as f:
+            self.assertEqual(json.load(f), {'one-shot': [[later, None, {}]]})
+
+    @mock.patch('mycroft.skills.event_scheduler.COMPACT_THRESHOLD', 2)
+    def test_compact(self):
+        """
+            Test that the journal is merged into the schedule file.
+        """
+        later = time.time() + 3600
+        es = EventScheduler(mock.MagicMock(), self.schedule_file)
+        es.schedule_event('first', later, None)
+        es.schedule_event('second', later, None)
+        with open(self.schedule_file) as f:
+            self.assertEqual(set(json.load(f)), {'first', 'second'})
+        self.assertEqual(getsize(es.journal_file), 0)
+        es.shutdown()
@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import time
 import unittest
+from threading import Event, Thread, Timer
 
-from mycroft.skills.intent_service import ContextManager
+import mock
+
+from mycroft.messagebus.message import Message
+from mycroft.skills.intent_service import ContextManager, IntentService
 
 
 class MockEmitter(object):
@@ -67,6 +72,183 @@ class ContextManagerTest(unittest.TestCase):
         self.context_manager.remove_context('TestContext')
         self.assertEqual(len(self.context_manager.frame_stack), 0)
 
+    def inject(self, word, context, origin=''):
+        self.context_manager.inject_context({'confidence': 1.0,
+                                             'data': [(word, context)],
+                                             'match': word,
+                                             'key': word,
+                                             'origin': origin})
+
+    def test_remove_keeps_other_context(self):
+        self.inject('Word1', 'Context1')
+        self.inject('Word2', 'Context2')
+        self.context_manager.remove_context('Context1')
+        self.assertEqual(len(self.context_manager.frame_stack), 1)
+        self.assertEqual([e['key'] for e in
+                          self.context_manager.get_context()], ['Word2'])
+
+    def test_get_context(self):
+        self.inject('Old', 'Context1', 'skill')
+        self.inject('Other', 'Context2', 'skill')
+        self.inject('New', 'Context1')
+        context = self.context_manager.get_context()
+        # Only the latest instance of a keyword is used
+        self.assertEqual([e['key'] for e in context], ['New', 'Other'])
+        self.assertEqual([e['confidence'] for e in context], [0.5, 1 / 3])
+
+        # Modifying the result doesn't affect later lookups
+        context[0]['confidence'] = 1.0
+        self.assertEqual(self.context_manager.get_context()[0]['confidence'],
+                         0.5)
+        self.assertEqual([e['key'] for e in self.context_manager.get_context(
+            missing_entities=[[('Other', 'Context2')]])], ['Other'])
+
+    @mock.patch('mycroft.skills.intent_service.time')
+    def test_expiry(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        self.inject('Old', 'Context1')
+        mock_time.monotonic.return_value = 120
+        self.inject('New', 'Context2')
+        self.assertEqual(len(self.context_manager.get_context()), 2)
+
+        mock_time.monotonic.return_value = 180
+        self.assertEqual([e['key'] for e in
+                          self.context_manager.get_context()], ['New'])
+        self.assertEqual(len(self.context_manager.frames), 1)
+        self.assertNotIn('Context1', self.context_manager.keyword_frames)
+
+    def test_locked(self):
+        """ Context isn't touched while another thread holds the lock. """
+        done = Event()
+
+        def update():
+            self.inject('Word', 'Context1')
+            self.context_manager.get_context()
+            self.context_manager.remove_context('Context1')
+            done.set()
+
+        with self.context_manager.lock:
+            Thread(target=update, daemon=True).start()
+            self.assertFalse(done.wait(0.2))
+            self.assertEqual(len(self.context_manager.frames), 0)
+        self.assertTrue(done.wait(2))
+
+
+class MatchData:
+    def __init__(self, name, conf):
+        self.name = name
+        self.conf = conf
+
+
+class MatchIntentTest(unittest.TestCase):
+    def setUp(self):
+        self.service = IntentService(mock.MagicMock())
+        self.release = Event()
+        self.padatious = mock.patch(
+            'mycroft.skills.intent_service.PadatiousService')
+        self.padatious.start().instance.calc_intent.side_effect = \
+            self.calc_intent
+        self.padatious_results = {}
+
+    def tearDown(self):
+        self.release.set()
+        self.padatious.stop()
+        self.service.matcher.shutdown()
+
+    def calc_intent(self, utt):
+        if utt == 'slow':
+            self.release.wait(2)
+        return self.padatious_results.get(utt)
+
+    def blocked_adapt(self, *args):
+        self.release.wait(2)
+        return {'intent_type': 'skill:adapt', 'confidence': 1.0}
+
+    def test_padatious_certain(self):
+        self.padatious_results['hello'] = MatchData('skill:hello', 1.0)
+        self.service._adapt_intent_match = self.blocked_adapt
+        intent, padatious_intent = self.service._match_intent(
+            ['hello'], ['hello'], ['hello', 'slow'], 'en-us')
+        self.assertFalse(self.release.is_set())
+        self.assertIsNone(intent)
+        self.assertEqual(padatious_intent.name, 'skill:hello')
+
+    def test_no_adapt_match(self):
+        self.service._adapt_intent_match = mock.Mock(return_value=None)
+        intent, padatious_intent = self.service._match_intent(
+            ['slow'], ['slow'], ['slow'], 'en-us')
+        self.assertFalse(self.release.is_set())
+        self.assertIsNone(intent)
+
+    def test_best_padatious_match(self):
+        self.padatious_results['a'] = MatchData('skill:a', 0.6)
+        self.padatious_results['b'] = MatchData('skill:b', 0.8)
+        adapt_intent = {'intent_type': 'skill:adapt', 'confidence': 1.0}
+        self.service._adapt_intent_match = mock.Mock(
+            return_value=adapt_intent)
+        intent, padatious_intent = self.service._match_intent(
+            ['a'], ['b'], ['a', 'b'], 'en-us')
+        self.assertEqual(intent, adapt_intent)
+        self.assertEqual(padatious_intent.name, 'skill:b')
+
+
+class ConverseTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = mock.MagicMock()
+        self.bus.emit.side_effect = self.respond
+        self.service = IntentService(self.bus)
+        # skill_id: (delay, result), skills not listed don't respond
+        self.responses = {}
+
+    def tearDown(self):
+        self.service.matcher.shutdown()
+
+    def respond(self, message):
+        skill_id = message.data['skill_id']
+        if skill_id in self.responses:
+            delay, result = self.responses[skill_id]
+            response = message.reply('skill.converse.response',
+                                     {'skill_id': skill_id, 'result': result})
+            Timer(delay, self.service.handle_converse_response,
+                  [response]).start()
+
+    def test_early_exit(self):
+        self.responses = {'a': (0, True)}
+        start = time.monotonic()
+        self.assertEqual(self.service.converse_skills(['hi'], ['a', 'b'],
+                                                      'en-us'), 'a')
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_priority(self):
+        self.responses = {'a': (0.1, False), 'b': (0, True), 'c': (0, True)}
+        self.assertEqual(self.service.converse_skills(['hi'],
+                                                      ['a', 'b', 'c'],
+                                                      'en-us'), 'b')
+        # Skills after the one handling the utterance aren't asked
+        asked = [call[0][0].data['skill_id']
+                 for call in self.bus.emit.call_args_list]
+        self.assertEqual(asked, ['a', 'b'])
+
+    def test_none_handled(self):
+        self.responses = {'a': (0, False), 'b': (0, False)}
+        self.assertIsNone(self.service.converse_skills(['hi'], ['a', 'b'],
+                                                       'en-us'))
+
+    def test_timeout(self):
+        self.responses = {'b': (0, True)}
+        self.assertEqual(self.service.converse_skills(['hi'], ['a', 'b'],
+                                                      'en-us', timeout=0.2),
+                         'b')
+
+    def test_late_response(self):
+        """ A response to an earlier request isn't taken as the answer. """
+        self.responses = {'a': (0.3, True)}
+        self.assertIsNone(self.service.converse_skills(['hi'], ['a'],
+                                                       'en-us', timeout=0.1))
+        self.responses = {'a': (0.5, False)}
+        self.assertIsNone(self.service.converse_skills(['hi'], ['a'],
+                                                       'en-us'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,140 @@
+# Copyright 2019 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import time
+import unittest
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import mock
+from padatious.match_data import MatchData
+
+from mycroft.messagebus.message import Message
+from mycroft.skills.padatious_service import PadatiousService
+
+
+class MockContainer:
+    def __init__(self, cache_dir):
+        self.intents = {}
+        self.entities = {}
+        self.trained = False
+        self.calls = 0
+
+    def add_intent(self, name, lines):
+        self.intents[name] = lines
+
+    def add_entity(self, name, lines):
+        self.entities[name] = lines
+
+    def train(self, single_thread=False):
+        self.trained = True
+
+    def calc_intent(self, utt):
+        self.calls += 1
+        return MatchData('skill:hello', utt, {}, 1.0)
+
+
+def wait_for(condition, timeout=1.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestPadatiousService(unittest.TestCase):
+    @mock.patch('padatious.IntentContainer', MockContainer)
+    def setUp(self):
+        self.tmp = mkdtemp()
+        self.bus = mock.MagicMock()
+        self.service = PadatiousService(self.bus, mock.MagicMock())
+        self.service.train_delay = 0
+
+    def tearDown(self):
+        rmtree(self.tmp)
+        PadatiousService.instance = None
+
+    def intent_message(self, name, lines):
+        file_name = join(self.tmp, name + '.intent')
+        with open(file_name, 'w') as f:
+            f.write('\n'.join(lines))
+        return Message('padatious:register_intent',
+                       {'name': 'skill:' + name, 'file_name': file_name})
+
+    def emitted_types(self):
+        return [c[0][0].type for c in self.bus.emit.call_args_list]
+
+    def test_initial_training(self):
+        self.service.register_intent(self.intent_message('hello', ['hi']))
+        time.sleep(0.05)
+        self.assertFalse(self.service.container.intents)
+
+        self.service.handle_initialized(Message('mycroft.skills.initialized'))
+        self.assertTrue(self.service.finished_training_event.wait(1))
+        self.assertEqual(self.service.container.intents,
+                         {'skill:hello': ['hi']})
+        self.assertTrue(self.service.container.trained)
+        self.assertIn('mycroft.ready', self.emitted_types())
+
+    def test_retrain_on_change(self):
+        self.service.register_intent(self.intent_message('hello', ['hi']))
+        self.service.train()
+        first = self.service.container
+
+        self.service.handle_initialized(Message('mycroft.skills.initialized'))
+        self.service.register_intent(self.intent_message('bye', ['bye']))
+        self.assertTrue(wait_for(lambda: self.service.container != first))
+        self.assertEqual(set(self.service.container.intents),
+                         {'skill:hello', 'skill:bye'})
+        started = [c[0][0] for c in self.bus.emit.call_args_list
+                   if c[0][0].type == 'padatious:training_started'][-1]
+        self.assertEqual(started.data['changed'], ['skill:bye'])
+
+    def test_no_retrain_without_change(self):
+        message = self.intent_message('hello', ['hi'])
+        self.service.register_intent(message)
+        self.service.train()
+        first = self.service.container
+
+        # A reloaded skill detaches and registers the same intents again
+        self.service.handle_detach_skill(Message('detach_skill',
+                                                 {'skill_id': 'skill'}))
+        self.service.register_intent(message)
+        self.service.train()
+        self.assertIs(self.service.container, first)
+
+    def test_match_cache(self):
+        container = self.service.container
+        intent = self.service.calc_intent('hi')
+        intent.matches['utterance'] = 'hi'
+        intent = self.service.calc_intent('hi')
+        self.assertEqual(intent.matches, {})
+        self.assertEqual(container.calls, 1)
+        self.assertEqual(self.service.get_cache_stats(),
+                         {'hits': 1, 'misses': 1, 'size': 1})
+
+        # A new model invalidates the cache
+        self.service.register_intent(self.intent_message('hello', ['hi']))
+        self.service.train()
+        self.service.calc_intent('hi')
+        self.assertEqual(self.service.container.calls, 1)
+        self.assertEqual(self.service.get_cache_stats(),
+                         {'hits': 1, 'misses': 2, 'size': 1})
+
+    def test_match_cache_size(self):
+        self.service.match_cache_size = 2
+        for utt in ['a', 'b', 'a', 'c', 'b']:
+            self.service.calc_intent(utt)
+        # "b" was the least recently used when "c" was added
+        self.assertEqual(self.service.container.calls, 4)
@@ -1,12 +1,15 @@
 import unittest
 import mock
+import os
 import tempfile
 from os.path import exists, join
 from shutil import rmtree
 from test.util import base_config
 
+from msm import SkillEntry
+
 from mycroft.configuration import Configuration
-from mycroft.skills.skill_manager import SkillManager
+from mycroft.skills.skill_manager import SkillManager, SkillWatcher, INotify
 
 BASE_CONF = base_config()
 BASE_CONF['data_dir'] = tempfile.mkdtemp()
@@ -64,6 +67,73 @@ class MycroftSkillTest(unittest.TestCase):
         SkillManager(self.emitter)
         self.assertTrue(exists(join(BASE_CONF['data_dir'], 'skills')))
 
+    @mock.patch.dict(Configuration._Configuration__config, BASE_CONF)
+    @mock.patch('mycroft.skills.skill_manager.PRIORITY_SKILLS',
+                ['mycroft-pairing'])
+    @mock.patch.object(SkillManager, 'create_msm')
+    def test_load_priority_first(self, mock_create_msm):
+        """ Verify that priority skills are loaded before other skills. """
+        skills_dir = '/opt/mycroft/skills'
+        msm = mock_create_msm.return_value
+        msm.skills_dir = skills_dir
+        names = ['mycroft-weather', 'mycroft-pairing', 'mycroft-timer']
+        msm.list.return_value = [
+            SkillEntry(name, join(skills_dir, name + '.mycroftai'))
+            for name in names
+        ]
+        manager = SkillManager(self.emitter)
+        loaded = []
+
+        def load(skill_path):
+            loaded.append(skill_path)
+            return True
+
+        manager._load_or_reload_skill = load
+        paths = [join(skills_dir, 'mycroft-weather.mycroftai/'),
+                 join(skills_dir, 'mycroft-timer.mycroftai/'),
+                 join(skills_dir, 'mycroft-pairing.mycroftai/')]
+        self.assertTrue(manager._load_skills(paths))
+        self.assertEqual(loaded[0],
+                         join(skills_dir, 'mycroft-pairing.mycroftai/'))
+        self.assertEqual(set(loaded), set(paths))
+
     @classmethod
     def tearDownClass(cls):
         rmtree(BASE_CONF['data_dir'])
+
+
+@unittest.skipIf(INotify is None, 'inotify_simple is not installed')
+class SkillWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.skills_dir = tempfile.mkdtemp()
+        os.makedirs(join(self.skills_dir, 'skill-a', 'vocab'))
+        os.makedirs(join(self.skills_dir, 'skill-b', '.git'))
+        self.watcher = SkillWatcher(self.skills_dir, debounce=0.1)
+
+    def tearDown(self):
+        self.watcher.close()
+        rmtree(self.skills_dir)
+
+    def test_no_changes(self):
+        self.assertEqual(self.watcher.wait_for_changes(0.01), set())
+
+    def test_changed_skills(self):
+        with open(join(self.skills_dir, 'skill-a', 'vocab', 'a.voc'), 'w'):
+            pass
+        os.makedirs(join(self.skills_dir, 'skill-c', 'vocab'))
+        self.assertEqual(self.watcher.wait_for_changes(1),
+                         {join(self.skills_dir, 'skill-a'),
+                          join(self.skills_dir, 'skill-c')})
+
+        # New skill directories are watched as well
+        with open(join(self.skills_dir, 'skill-c', 'vocab', 'c.voc'), 'w'):
+            pass
+        self.assertEqual(self.watcher.wait_for_changes(1),
+                         {join(self.skills_dir, 'skill-c')})
+
+    def test_ignored_files(self):
+        with open(join(self.skills_dir, 'skill-b', 'settings.json'), 'w'):
+            pass
+        with open(join(self.skills_dir, 'skill-b', '.git', 'index'), 'w'):
+            pass
+        self.assertEqual(self.watcher.wait_for_changes(0.2), set())
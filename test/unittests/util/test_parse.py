@@ -23,7 +23,7 @@ from mycroft.util.parse import extract_number, extract_numbers
 from mycroft.util.parse import fuzzy_match
 from mycroft.util.parse import get_gender
 from mycroft.util.parse import match_one
-from mycroft.util.parse import normalize
+from mycroft.util.parse import normalize, normalize_cache_info
 
 
 class TestFuzzyMatch(unittest.TestCase):
@@ -558,6 +558,24 @@ class TestNormalize(unittest.TestCase):
         self.assertEqual(normalize("that's one and a half and five six"),
                          "that is 1 and half and 5 6")
 
+    def test_normalize_cache(self):
+        normalize("cache this test", lang="en-us")
+        before = normalize_cache_info()
+        self.assertEqual(normalize("cache this test", lang="en-us"),
+                         "cache this test")
+        self.assertEqual(normalize("cache this test", lang="en-gb"),
+                         "cache this test")
+        after = normalize_cache_info()
+        self.assertEqual(after.hits - before.hits, 2)
+        self.assertEqual(after.misses, before.misses)
+
+        # Flags are part of the key
+        self.assertEqual(normalize("cache the test", lang="en-us",
+                                   remove_articles=False),
+                         "cache the test")
+        self.assertEqual(normalize("cache the test", lang="en-us"),
+                         "cache test")
+
     def test_multiple_numbers(self):
         self.assertEqual(extract_numbers("this is a one two three  test"),
                          [1.0, 2.0, 3.0])
@@ -15,9 +15,12 @@
 import unittest
 from shutil import rmtree
 
+import mock
 from os.path import exists, isfile
 
-from mycroft.util import create_signal, check_for_signal
+from mycroft.messagebus.message import Message
+from mycroft.util import (create_signal, check_for_signal, connect_signals,
+                          disconnect_signals)
 
 
 class TestSignals(unittest.TestCase):
@@ -42,5 +45,74 @@ class TestSignals(unittest.TestCase):
         self.assertFalse(isfile('/tmp/mycroft/ipc/signal/test_signal'))
 
 
+class TestBusSignals(unittest.TestCase):
+    def setUp(self):
+        if exists('/tmp/mycroft'):
+            rmtree('/tmp/mycroft')
+        self.bus = mock.Mock()
+        connect_signals(self.bus)
+        self.handlers = {c[0][0]: c[0][1] for c in self.bus.on.call_args_list}
+
+    def tearDown(self):
+        disconnect_signals()
+
+    def emitted(self):
+        return [(c[0][0].data['op'], c[0][0].data['name'])
+                for c in self.bus.emit.call_args_list]
+
+    def test_create_and_consume(self):
+        create_signal('test_signal')
+        self.assertTrue(isfile('/tmp/mycroft/ipc/signal/test_signal'))
+        with mock.patch('os.path.isfile') as mock_isfile:
+            self.assertTrue(check_for_signal('test_signal'))
+            self.assertFalse(check_for_signal('test_signal'))
+            mock_isfile.assert_not_called()
+        self.assertFalse(isfile('/tmp/mycroft/ipc/signal/test_signal'))
+        self.assertEqual(self.emitted(), [('create', 'test_signal'),
+                                          ('remove', 'test_signal')])
+
+    def test_remote_signals(self):
+        handle_update = self.handlers['mycroft.signal']
+        handle_update(Message('mycroft.signal',
+                              {'op': 'create', 'name': 'test_signal',
+                               'time': 0, 'origin': 'other'}))
+        self.assertTrue(check_for_signal('test_signal', -1))
+        handle_update(Message('mycroft.signal',
+                              {'op': 'remove', 'name': 'test_signal',
+                               'origin': 'other'}))
+        self.assertFalse(check_for_signal('test_signal', -1))
+
+    def test_bus_down(self):
+        self.bus.connected_event.is_set.return_value = False
+        create_signal('test_signal')
+        self.assertTrue(check_for_signal('test_signal'))
+        self.bus.emit.assert_not_called()
+        self.assertFalse(isfile('/tmp/mycroft/ipc/signal/test_signal'))
+
+    def test_own_messages_ignored(self):
+        create_signal('test_signal')
+        self.assertTrue(check_for_signal('test_signal'))
+        # The messagebus echoes the creation after it was consumed
+        message = self.bus.emit.call_args_list[0][0][0]
+        self.handlers['mycroft.signal'](message)
+        self.assertFalse(check_for_signal('test_signal'))
+
+    @mock.patch('mycroft.util.signal.time')
+    def test_lifetime(self, mock_time):
+        mock_time.time.return_value = 100
+        create_signal('test_signal')
+        mock_time.time.return_value = 101
+        self.assertTrue(check_for_signal('test_signal', 2))
+        mock_time.time.return_value = 103
+        self.assertFalse(check_for_signal('test_signal', 2))
+
+    def test_existing_files(self):
+        disconnect_signals()
+        create_signal('test_signal')
+        connect_signals(self.bus)
+        self.assertTrue(check_for_signal('test_signal'))
+        self.assertFalse(isfile('/tmp/mycroft/ipc/signal/test_signal'))
+
+
 if __name__ == "__main__":
     unittest.main()